@@ -0,0 +1,544 @@
+import os
+import sys
+import copy
+import math
+import time
+import tracemalloc
+import random
+
+# Run headless so the benchmarks work without a window or sound card
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from game.constants import *
+from game.entities import EntityStore, Position, Chase, Collectable, Portal, Renderable
+
+def time_it(func, repeat=100):
+    """Return the average time of func() in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+def make_world(**kwargs):
+    """Create a world with the chunks around the origin generated."""
+    from game.infinite_world_updated import InfiniteWorld
+    random.seed(1)
+    world = InfiniteWorld(None, **kwargs)
+    world.update_active_chunks((SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+    world.scheduler.run(math.inf)
+    world.update_active_chunks((SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+    return world
+
+def bench_echo_propagation():
+    """Echo ray marching for different numbers of rays."""
+    from game.echo_propagation import EchoPropagator
+    world = make_world()
+    origin = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+    for rays in (90, 360, 720, 1440):
+        echo = EchoPropagator(world.chunks, world.chunk_size, num_rays=rays)
+        ms = time_it(lambda: echo.emit(origin), 50)
+        print(f"  {rays:5d} rays: {ms:6.2f} ms per emission, {len(echo.last_result.revealed)} cells revealed")
+
+def bench_flow_field():
+    """Flow field rebuilds and direction lookups for many chasers."""
+    world = make_world()
+    field = world.flow_field
+    target = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+
+    def rebuild():
+        field.target_cell = None
+        field.update(target)
+    print(f"  rebuild: {time_it(rebuild, 50):6.2f} ms")
+    print(f"  cached update: {time_it(lambda: field.update(target), 1000) * 1000:6.2f} us")
+
+    for count in (100, 500, 1000):
+        chasers = [(random.uniform(-600, 1400), random.uniform(-600, 1200)) for _ in range(count)]
+        lookup = lambda: [field.get_direction(x, y) for x, y in chasers]
+        print(f"  {count:5d} chasers: {time_it(lookup, 50):6.2f} ms per tick of lookups")
+
+def bench_sound_propagation():
+    """Sound field computation per emission and loudness lookups per enemy."""
+    world = make_world()
+    origin = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+    for kind in ("footstep", "pickup", "echo"):
+        ms = time_it(lambda: world.sounds.emit(kind, origin), 50)
+        world.sounds.end_tick()
+        print(f"  {kind:>8}: {ms:6.2f} ms per emission")
+
+    world.sounds.emit("echo", origin)
+    listeners = [(random.uniform(-600, 1400), random.uniform(-600, 1200)) for _ in range(1000)]
+    lookup = lambda: [world.sounds.hear(x, y) for x, y in listeners]
+    print(f"   1000 listeners: {time_it(lookup, 50):6.2f} ms per tick of lookups")
+
+def bench_sleeping_enemies():
+    """Enemy updates with idle enemies asleep, as the player moves around."""
+    from game.infinite_world_updated import Chunk
+    world = make_world()
+
+    # Enemies only start moving after the 3 second grace period
+    world.sim_clock.advance(3000)
+
+    # Crowd every chunk with about 30 more enemies
+    for chunk in world.loaded_chunks:
+        crowd = Chunk(chunk.x, chunk.y, world.chunk_size, world.entities)
+        crowd.generate_content(30.0)
+        chunk.enemies.extend(crowd.enemies)
+
+    player = [SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2]
+    def tick():
+        player[0] += 2
+        world.update_enemies(tuple(player))
+    tick()
+    print(f"  awake/asleep after first tick: {world.enemy_counts()}")
+    print(f"  update_enemies: {time_it(tick, 200):6.2f} ms per tick")
+    print(f"  awake/asleep: {world.enemy_counts()}")
+
+    world.sounds.emit("echo", tuple(player))
+    tick()
+    print(f"  awake/asleep after an echo: {world.enemy_counts()}")
+
+def bench_patrols():
+    """Enemy updates with many patrollers near the player but out of range."""
+    world = make_world()
+    world.sim_clock.advance(3000)
+
+    # Patrollers between 300 and 700 pixels from the player, so none of them
+    # notices the player and none of them falls asleep
+    player = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+    chunk = world.active_chunks[0]
+    for _ in range(2000):
+        angle = random.uniform(0, 2 * math.pi)
+        distance = random.uniform(300, 700)
+        x = player[0] + math.cos(angle) * distance
+        y = player[1] + math.sin(angle) * distance
+        chunk.create_enemy(random.choice([PHANTOM, CRAWLER]), x, y)
+
+    world.update_enemies(player)
+    print(f"  update_enemies: {time_it(lambda: world.update_enemies(player), 200):6.2f} ms per tick")
+    print(f"  collision check: {time_it(lambda: world.check_enemy_collision(pygame.Rect(player, (32, 32))), 200):6.2f} ms")
+
+def bench_timers():
+    """Per-frame countdowns against the timer wheel for many cooldowns."""
+    from game.timer_wheel import TimerWheel
+    count = 10000
+    delays = [random.randint(1, 600) for _ in range(count)]
+
+    countdowns = list(delays)
+    def poll():
+        for i in range(count):
+            if countdowns[i] > 0:
+                countdowns[i] -= 1
+            else:
+                countdowns[i] = delays[i]
+    print(f"  {count} countdowns polled: {time_it(poll, 200):6.2f} ms per tick")
+
+    wheel = TimerWheel()
+    def restart(i):
+        wheel.schedule(delays[i], restart, i)
+    for i in range(count):
+        restart(i)
+    print(f"  {count} timers on the wheel: {time_it(wheel.advance, 200):6.2f} ms per tick")
+
+def as_dicts(chunk):
+    """The chunk's entities in the dict layout chunks used before entity records."""
+    entities = chunk.entities
+    collectables = []
+    for _, item, renderable in entities.query(chunk.collectables, Collectable, Renderable):
+        collectables.append({"type": ENTITY_NAMES[item.kind], "rect": pygame.Rect(item.rect),
+                             "collected": item.collected, "glow": item.glow, "glow_dir": item.glow_dir,
+                             "variant": renderable.variant})
+    enemies = []
+    for _, position, renderable in entities.query(chunk.enemies, Position, Renderable):
+        enemies.append({"type": ENTITY_NAMES[renderable.kind], "x": position.x, "y": position.y,
+                        "patrol_radius": 100, "start_x": position.x, "start_y": position.y,
+                        "variant": renderable.variant, "prev_x": position.x, "prev_y": position.y,
+                        "fire_cooldown": 120, "cooldown_timer": 0})
+    portals = []
+    for _, portal in entities.query(chunk.portals, Portal):
+        portals.append({"rect": pygame.Rect(portal.rect), "destination": portal.destination,
+                        "active": portal.active, "is_exit": portal.is_exit})
+    return collectables, enemies, portals
+
+def as_records(chunk, store):
+    """Add fresh copies of the chunk's entity records to a store."""
+    for entity in chunk.collectables + chunk.enemies + chunk.portals:
+        components = []
+        for table in chunk.entities.tables.values():
+            if entity in table:
+                component = copy.copy(table[entity])
+                if hasattr(component, "rect"):
+                    component.rect = pygame.Rect(component.rect)
+                components.append(component)
+        store.create(*components)
+
+def traced_bytes(build):
+    """Return build()'s result and the bytes it allocated (and kept)."""
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    result = build()
+    allocated = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return result, allocated
+
+def bench_chunk_memory():
+    """Bytes per chunk with entity records against the old dict layout."""
+    from game.infinite_world_updated import Chunk
+    count = 200
+    for difficulty in (1.0, 2.0, 3.0):
+        random.seed(1)
+        store = EntityStore()
+        def generate():
+            chunks = [Chunk(x, 0, 1000, store) for x in range(count)]
+            for chunk in chunks:
+                chunk.generate_content(difficulty)
+            return chunks
+        chunks, chunk_bytes = traced_bytes(generate)
+        copies = EntityStore()
+        _, record_bytes = traced_bytes(lambda: [as_records(chunk, copies) for chunk in chunks])
+        _, dict_bytes = traced_bytes(lambda: [as_dicts(chunk) for chunk in chunks])
+
+        per_chunk = chunk_bytes / count
+        print(f"  difficulty {difficulty}: {per_chunk:7.0f} bytes per chunk with records, "
+              f"{per_chunk + (dict_bytes - record_bytes) / count:7.0f} with dicts "
+              f"(entities {record_bytes / count:5.0f} vs {dict_bytes / count:5.0f})")
+
+def bench_record_access():
+    """AI-loop style attribute access on dicts against __slots__ records."""
+    count = 10000
+    dicts = [{"type": "warden", "x": 1.0, "y": 2.0, "target_x": 5.0, "target_y": 6.0, "speed": 1.5}
+             for _ in range(count)]
+    records = [(Chase(WARDEN, 200, 1.5), Position(1.0, 2.0)) for _ in range(count)]
+    for chase, _ in records:
+        chase.target_x, chase.target_y = 5.0, 6.0
+
+    def dict_loop():
+        for enemy in dicts:
+            if enemy["type"] == "warden":
+                tx = enemy["target_x"] - enemy["x"]
+                ty = enemy["target_y"] - enemy["y"]
+                enemy["x"] += tx * 0.001 * enemy["speed"]
+                enemy["y"] += ty * 0.001 * enemy["speed"]
+
+    def record_loop():
+        for chase, position in records:
+            if chase.kind == WARDEN:
+                tx = chase.target_x - position.x
+                ty = chase.target_y - position.y
+                position.x += tx * 0.001 * chase.speed
+                position.y += ty * 0.001 * chase.speed
+
+    print(f"  dicts:   {time_it(dict_loop, 100):6.2f} ms per {count} enemies")
+    print(f"  records: {time_it(record_loop, 100):6.2f} ms per {count} enemies")
+
+def bench_render():
+    """World rendering with crowded chunks around an ordinary one on screen."""
+    from game.infinite_world_updated import Chunk
+    from game.lightmap import LightMap
+    world = make_world()
+    screen = pygame.display.get_surface()
+    light_map = LightMap()
+
+    # Crowd every chunk but the one in view with extra items, portals and enemies
+    for chunk in world.loaded_chunks:
+        if (chunk.x, chunk.y) == (0, 0):
+            continue
+        crowd = Chunk(chunk.x, chunk.y, world.chunk_size, world.entities)
+        crowd.generate_content(30.0)
+        chunk.collectables.extend(crowd.collectables)
+        chunk.enemies.extend(crowd.enemies)
+        chunk.portals.extend(crowd.portals)
+    enemies = sum(len(chunk.enemies) for chunk in world.loaded_chunks)
+
+    def frame():
+        light_map.clear()
+        light_map.add_light(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, PLAYER_LIGHT_RADIUS)
+        world.render(screen, (100, 100), light_map)
+    print(f"  {len(world.visible_chunks)} of {len(world.loaded_chunks)} chunks, {enemies} enemies: "
+          f"{time_it(frame, 100):6.2f} ms per frame")
+
+def bench_world_radii():
+    """Frame time for different generation, simulation and render radii."""
+    from game.infinite_world_updated import Chunk
+    from game.lightmap import LightMap
+    screen = pygame.display.get_surface()
+    light_map = LightMap()
+
+    for generation, simulation, render in ((2, 1, None), (2, 2, None), (2, 2, 2), (3, 1, None), (3, 3, 3)):
+        start = time.perf_counter()
+        world = make_world(generation_distance=generation, simulation_distance=simulation)
+        generating = (time.perf_counter() - start) * 1000
+        if render is not None:
+            world.render_distance = render
+        world.sim_clock.advance(3000)
+
+        # Crowd every loaded chunk so each radius has plenty to do
+        for chunk in world.loaded_chunks:
+            crowd = Chunk(chunk.x, chunk.y, world.chunk_size, world.entities)
+            crowd.generate_content(10.0)
+            chunk.collectables.extend(crowd.collectables)
+            chunk.enemies.extend(crowd.enemies)
+
+        # Time each stage on its own so the radius it depends on shows
+        player = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+        camera = (0, 0)
+        def draw():
+            light_map.clear()
+            light_map.add_light(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, PLAYER_LIGHT_RADIUS)
+            world.render(screen, camera, light_map)
+        chunks = time_it(lambda: world.update_active_chunks(player), 100)
+        enemies = time_it(lambda: world.update_enemies(player), 100)
+        drawing = time_it(draw, 100)
+        print(f"  generate {world.generation_distance}, simulate {world.simulation_distance}, "
+              f"render {world.render_distance}: chunks {chunks:5.2f} + enemies {enemies:5.2f} + "
+              f"render {drawing:5.2f} = {chunks + enemies + drawing:5.2f} ms per frame, "
+              f"{generating:.0f} ms to generate")
+
+def bench_work_scheduler():
+    """Worst frame of chunk upkeep while teleporting, and what happens to deferred work, per work budget."""
+    for budget in (math.inf, FRAME_WORK_BUDGET, 0.25, 0):
+        world = make_world()
+        player = [SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2]
+        worst = 0.0
+        for frame in range(300):
+            # Jump five chunks every 20 frames, run in between
+            player[0] += 5000 if frame % 20 == 0 else 40
+            start = time.perf_counter()
+            world.update_active_chunks(tuple(player))
+            world.scheduler.run(budget)
+            worst = max(worst, (time.perf_counter() - start) * 1000)
+        report = world.scheduler.report()
+        print(f"  budget {budget} ms: worst frame {worst:6.2f} ms, {report['jobs_run']} deferred and "
+              f"{report['jobs_preempted']} preempted and {report['jobs_cancelled']} cancelled jobs, waited {report['mean_wait']:.1f} ms on average "
+              f"({report['max_wait']:.1f} ms at most), {report['backlog']} left")
+
+def bench_teleport():
+    """First frame after a teleport, with the destination prefetched and without."""
+    from game.infinite_world_updated import InfiniteWorld
+    from game.lightmap import LightMap
+    screen = pygame.display.get_surface()
+    light_map = LightMap()
+
+    def first_frames(prefetch):
+        random.seed(1)
+        world = InfiniteWorld(None)
+        if not prefetch:
+            world._prefetch_portal_destinations = lambda: None
+        world.update_active_chunks((SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+        world.scheduler.run(math.inf)
+        world.sim_clock.advance(3000)
+
+        # Stand on each portal in turn, giving the scheduler time to get its
+        # destination ready (if prefetching) before stepping through
+        portals = [portal for chunk in world.loaded_chunks
+                   for _, portal in world.entities.query(chunk.portals, Portal) if portal.destination]
+        chunks = enemies = drawing = 0.0
+        for portal in portals:
+            world.update_active_chunks(portal.rect.topleft)
+            world.update_enemies(portal.rect.topleft)
+            if prefetch:
+                world.scheduler.run(math.inf)
+            x = portal.rect.x + portal.destination[0] * world.chunk_size
+            y = portal.rect.y + portal.destination[1] * world.chunk_size
+
+            start = time.perf_counter()
+            world.update_active_chunks((x, y))
+            chunked = time.perf_counter()
+            world.update_enemies((x, y))
+            updated = time.perf_counter()
+            light_map.clear()
+            light_map.add_light(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, PLAYER_LIGHT_RADIUS)
+            world.render(screen, (x - SCREEN_WIDTH // 2, y - SCREEN_HEIGHT // 2), light_map)
+            end = time.perf_counter()
+            chunks += chunked - start
+            enemies += updated - chunked
+            drawing += end - updated
+
+            # Walk back to where the portal was, finishing whatever is queued
+            world.scheduler.run(math.inf)
+        n = len(portals)
+        return (f"chunks {chunks * 1000 / n:5.2f} + enemies {enemies * 1000 / n:5.2f} + "
+                f"render {drawing * 1000 / n:5.2f} = {(chunks + enemies + drawing) * 1000 / n:5.2f} ms "
+                f"over {n} portals")
+
+    print(f"  prefetched: {first_frames(True)}")
+    print(f"  on arrival: {first_frames(False)}")
+
+def bench_audio():
+    """Placeholder sound generation and the estimated output latency per configured mixer buffer size."""
+    from game.audio_config import AudioConfig
+    from game.sound_manager import SoundManager
+    manager = SoundManager()
+    print(f"  mixer format {manager.audio_config.output_format()}")
+    print(f"  generating all sounds: {time_it(manager._load_sounds, 10):6.2f} ms")
+    for buffer in (256, 512, 1024, 4096):
+        latency = AudioConfig(buffer=buffer).latency()
+        print(f"  configured buffer {buffer:4d}: {latency['buffer']:5.1f} ms per buffer, "
+              f"{latency['best']:5.1f} to {latency['worst']:5.1f} ms estimated from play to output")
+
+def bench_narration():
+    """Main-thread cost of narration clips loaded on the spot versus preloaded."""
+    import tempfile
+    import wave
+    import numpy as np
+    from game.narration import Narrator
+
+    # Write clips of a few lengths in the mixer's format
+    frequency, bits, channels = pygame.mixer.get_init()
+    folder = tempfile.mkdtemp()
+    names = []
+    for seconds in (2, 10, 60):
+        name = f"memory_{seconds}s.wav"
+        samples = (np.sin(np.arange(frequency * seconds) * 0.05) * 8000).astype(np.int16)
+        with wave.open(os.path.join(folder, name), "wb") as f:
+            f.setnchannels(channels)
+            f.setsampwidth(2)
+            f.setframerate(frequency)
+            f.writeframes(np.repeat(samples, channels).tobytes())
+        names.append(name)
+
+    for name in names:
+        path = os.path.join(folder, name)
+        direct = time_it(lambda: pygame.mixer.Sound(path), 5)
+
+        # Preload, then time what the frame that plays it has to do
+        narrator = Narrator(audio_dir=folder)
+        start = time.perf_counter()
+        narrator.update((0, 0), [((0, 0), name)])
+        submit = (time.perf_counter() - start) * 1000
+        narrator.loading[name].result()
+        start = time.perf_counter()
+        narrator.update((0, 0))
+        narrator.play(name, 0.0)
+        played = (time.perf_counter() - start) * 1000
+        pygame.mixer.stop()
+        pygame.mixer.music.stop()
+        print(f"  {name}: {os.path.getsize(path) / 1024:7.0f} KiB, decoded on the spot {direct:6.2f} ms, "
+              f"preloaded {submit:5.2f} + {played:5.2f} ms")
+        narrator.loader.shutdown()
+    print(f"  report: {narrator.report()}")
+
+def bench_echo_reflections():
+    """Mixing an echo's reflections from precomputed material responses versus convolving per surface."""
+    import numpy as np
+    from game.echo_audio import EchoReverb
+    from game.echo_propagation import EchoResult
+    from game.sound_manager import SoundManager
+    manager = SoundManager()
+    start = time.perf_counter()
+    reverb = EchoReverb(manager.sounds["echo"], manager.audio_config, max_reflections=10000)
+    print(f"  precomputing impulse responses: {(time.perf_counter() - start) * 1000:6.2f} ms")
+
+    # Surfaces in a ring around the origin, of every material
+    for count in (8, 24, 96):
+        revealed = [(300 * math.cos(i) + 400, 300 * math.sin(i) + 300, i % len(SURFACE_TYPES) + 1, 0.5)
+                    for i in range(count)]
+        result = EchoResult((400, 300), (0, 0), np.zeros((1, 1), np.uint8), np.zeros((1, 1), np.float32))
+        result.revealed = revealed
+
+        def convolve_each():
+            return [np.convolve(reverb.ping, reverb.impulses[material]) for _, _, material, _ in revealed]
+        print(f"  {count:3d} reflections: mixed {time_it(lambda: reverb.mix(result), 20):6.2f} ms, "
+              f"convolving each surface {time_it(convolve_each, 3):7.2f} ms")
+
+def bench_asset_pack():
+    """Loading the sounds from loose files and placeholders versus from a memory-mapped asset pack."""
+    import tempfile
+    from pack_assets import pack_assets
+    from game.asset_pack import AssetPack
+    from game.sound_manager import SoundManager
+    path = os.path.join(tempfile.mkdtemp(), "assets.pack")
+    pack_assets(path)
+
+    manager = SoundManager()
+    print(f"  loose files: {time_it(manager._load_sounds, 10):6.2f} ms")
+    start = time.perf_counter()
+    pack = AssetPack(path)
+    print(f"  opening the pack: {(time.perf_counter() - start) * 1000:6.2f} ms")
+    manager.assets = pack
+    print(f"  from the pack: {time_it(manager._load_sounds, 10):6.2f} ms")
+    pack.close()
+
+def bench_level_setup():
+    """Setting up a level from scratch versus with the services shared between levels."""
+    from game.engine_new import GameEngine
+    from game.services import GameServices
+    fresh = [GameEngine().setup_time for _ in range(5)]
+    start = time.perf_counter()
+    services = GameServices()
+    GameEngine(services=services)
+    first = (time.perf_counter() - start) * 1000
+    shared = [GameEngine(services=services).setup_time for _ in range(5)]
+    print(f"  from scratch: {sum(fresh) / len(fresh):6.2f} ms per level")
+    print(f"  shared services: {first:6.2f} ms for the first level (building them), {sum(shared) / len(shared):6.2f} ms per level after")
+
+def bench_level_preload():
+    """Main-thread time from the transition screen to the first frame, with the world built there or ahead of time."""
+    from game.engine_new import GameEngine
+    from game.level_system import LevelSystem, LevelTransitionScreen
+    from game.services import GameServices
+    services = GameServices()
+    levels = LevelSystem()
+    level_data = levels.get_current_level_data()
+    GameEngine(1.5, level_data, services=services)
+
+    def first_frame(level=None):
+        start = time.perf_counter()
+        game = GameEngine(1.5, level_data, services=services, level=level)
+        game.update()
+        game.render()
+        return (time.perf_counter() - start) * 1000
+
+    print(f"  built on the spot: {first_frame():6.2f} ms")
+
+    # Draw the transition screen while the world builds on the worker
+    level = levels.prepare_level(services, 1.5)
+    transition = LevelTransitionScreen(services.screen, level_data, level)
+    frames = 0
+    start = time.perf_counter()
+    while not level.done():
+        transition.update()
+        transition.render()
+        frames += 1
+    transition_frame = (time.perf_counter() - start) * 1000 / max(1, frames)
+    print(f"  built ahead: {first_frame(level):6.2f} ms (build {level.build_time:6.2f} ms on the worker, "
+          f"transition frames {transition_frame:5.2f} ms meanwhile)")
+    levels.shutdown()
+    services.shutdown()
+
+BENCHMARKS = {
+    "echo": bench_echo_propagation,
+    "flow": bench_flow_field,
+    "sound": bench_sound_propagation,
+    "sleep": bench_sleeping_enemies,
+    "patrol": bench_patrols,
+    "timers": bench_timers,
+    "memory": bench_chunk_memory,
+    "records": bench_record_access,
+    "render": bench_render,
+    "radii": bench_world_radii,
+    "scheduler": bench_work_scheduler,
+    "teleport": bench_teleport,
+    "audio": bench_audio,
+    "narration": bench_narration,
+    "reflections": bench_echo_reflections,
+    "pack": bench_asset_pack,
+    "levels": bench_level_setup,
+    "preload": bench_level_preload,
+}
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    # Run the benchmarks named on the command line, or all of them
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        print(f"{name}: {BENCHMARKS[name].__doc__}")
+        BENCHMARKS[name]()
+
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
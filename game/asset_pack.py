@@ -0,0 +1,119 @@
+import io
+import json
+import mmap
+import os
+import struct
+import pygame
+
+PACK_MAGIC = b"ECHOPAK1"
+PACK_HEADER = struct.Struct("<8sI")  # magic, index length in bytes
+PACK_ALIGN = 16
+DEFAULT_PACK = os.path.join(os.path.dirname(__file__), "assets", "assets.pack")
+
+class AssetPack:
+    def __init__(self, path=DEFAULT_PACK):
+        """All the game's assets in one memory-mapped file.
+
+        The file starts with PACK_MAGIC, the length of a JSON index and the
+        index itself, which gives each asset's offset, size and format; the
+        asset data follows. Opening a pack is one open() and one mmap(), and
+        nothing more is read until an asset is asked for.
+
+        Sounds are stored as raw samples in the mixer's format, so making one
+        needs no decoding: Sound(buffer=) copies the mapped bytes into the
+        mixer once (pygame always keeps its own copy). Images are stored
+        encoded and decoded the first time they are asked for.
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)  # Stays valid once f is closed
+        self.view = memoryview(self.map)
+        self.images = {}  # name -> decoded Surface
+
+        try:
+            magic, index_size = PACK_HEADER.unpack_from(self.map)
+            if magic != PACK_MAGIC:
+                raise ValueError(f"{path} is not an asset pack")
+            start = PACK_HEADER.size
+            self.index = json.loads(bytes(self.view[start:start + index_size]))
+        except (ValueError, struct.error):
+            self.close()
+            raise
+
+    @classmethod
+    def open(cls, path=DEFAULT_PACK):
+        """Return the pack at path, or None if there isn't a usable one."""
+        try:
+            return cls(path)
+        except (OSError, ValueError, struct.error):
+            return None
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def buffer(self, name):
+        """Return a read-only view of an asset's bytes in the mapped file."""
+        entry = self.index[name]
+        return self.view[entry["offset"]:entry["offset"] + entry["size"]]
+
+    def sound(self, name, output_format):
+        """Return a packed sound as a Sound, or None if it isn't packed for this mixer format.
+
+        output_format is the mixer's (frequency, size, channels).
+        """
+        entry = self.index.get(name)
+        if entry is None or entry["format"] != "pcm":
+            return None
+        if (entry["frequency"], entry["bits"], entry["channels"]) != tuple(output_format):
+            return None
+        return pygame.mixer.Sound(buffer=self.buffer(name))
+
+    def image(self, name):
+        """Return a packed image as a Surface, decoding it on first use; None if it isn't packed.
+
+        Raises pygame.error if the packed data isn't a valid image.
+        """
+        image = self.images.get(name)
+        if image is None:
+            if name not in self.index:
+                return None
+            image = pygame.image.load(io.BytesIO(self.buffer(name)), name)
+            self.images[name] = image
+        return image
+
+    def close(self):
+        """Unmap and close the file. Sounds already made from the pack keep working."""
+        self.images.clear()
+        self.view.release()
+        self.map.close()
+
+def write_pack(path, assets):
+    """Write an asset pack.
+
+    assets maps each name to (data, entry), where data is the asset's bytes
+    and entry the rest of its index entry (at least its "format"). Data is
+    aligned to PACK_ALIGN bytes.
+    """
+    index = {}
+    offset = 0
+    for name, (data, entry) in assets.items():
+        index[name] = dict(entry, offset=offset, size=len(data))
+        offset += -(-len(data) // PACK_ALIGN) * PACK_ALIGN
+
+    # Offsets in the index are from the start of the file, which depends on
+    # the index's own length, so grow it until it fits before the data
+    start = PACK_HEADER.size
+    while True:
+        shifted = {name: dict(entry, offset=entry["offset"] + start) for name, entry in index.items()}
+        encoded = json.dumps(shifted, sort_keys=True).encode()
+        data_start = -(-(PACK_HEADER.size + len(encoded)) // PACK_ALIGN) * PACK_ALIGN
+        if data_start == start:
+            break
+        start = data_start
+
+    with open(path, "wb") as f:
+        f.write(PACK_HEADER.pack(PACK_MAGIC, len(encoded)))
+        f.write(encoded)
+        for name, (data, _) in assets.items():
+            f.seek(shifted[name]["offset"])
+            f.write(data)
@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+from game.asset_pack import AssetPack, write_pack, PACK_ALIGN
+from game.audio_config import AudioConfig
+
+class AssetPackTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.path = os.path.join(self.folder, "test.pack")
+
+        self.config = AudioConfig()
+        self.config.init()
+        self.output_format = self.config.output_format()
+        self.sound = self.config.make_sound(np.sin(np.arange(1000) * 0.1))
+
+        image = pygame.Surface((4, 3))
+        image.fill((10, 20, 30))
+        image_path = os.path.join(self.folder, "image.bmp")
+        pygame.image.save(image, image_path)
+        with open(image_path, "rb") as f:
+            self.image_data = f.read()
+
+    def write(self):
+        frequency, bits, channels = self.output_format
+        write_pack(self.path, {
+            "audio/tone.wav": (self.sound.get_raw(), {"format": "pcm", "frequency": frequency,
+                                                      "bits": bits, "channels": channels}),
+            "notes.txt": (b"odd length", {"format": "txt"}),
+            "images/image.bmp": (self.image_data, {"format": "bmp"}),
+        })
+        pack = AssetPack(self.path)
+        self.addCleanup(pack.close)
+        return pack
+
+    def test_round_trip(self):
+        pack = self.write()
+        self.assertIn("notes.txt", pack)
+        self.assertNotIn("missing.txt", pack)
+        self.assertEqual(bytes(pack.buffer("notes.txt")), b"odd length")
+        self.assertEqual(bytes(pack.buffer("images/image.bmp")), self.image_data)
+        for entry in pack.index.values():
+            self.assertEqual(entry["offset"] % PACK_ALIGN, 0)
+
+    def test_sound_comes_back_with_the_same_samples(self):
+        pack = self.write()
+        sound = pack.sound("audio/tone.wav", self.output_format)
+        self.assertEqual(sound.get_raw(), self.sound.get_raw())
+
+    def test_sound_for_another_mixer_format_is_not_used(self):
+        pack = self.write()
+        frequency, bits, channels = self.output_format
+        self.assertIsNone(pack.sound("audio/tone.wav", (frequency // 2, bits, channels)))
+        self.assertIsNone(pack.sound("notes.txt", self.output_format))
+        self.assertIsNone(pack.sound("audio/missing.wav", self.output_format))
+
+    def test_image_is_decoded_once(self):
+        pack = self.write()
+        image = pack.image("images/image.bmp")
+        self.assertEqual(image.get_size(), (4, 3))
+        self.assertEqual(image.get_at((0, 0))[:3], (10, 20, 30))
+        self.assertIs(pack.image("images/image.bmp"), image)
+        self.assertIsNone(pack.image("images/missing.png"))
+
+    def test_unusable_files_are_not_opened(self):
+        self.assertIsNone(AssetPack.open(os.path.join(self.folder, "missing.pack")))
+        for data in (b"", b"ECHO", b"NOTAPACK" + bytes(32)):
+            with open(self.path, "wb") as f:
+                f.write(data)
+            self.assertIsNone(AssetPack.open(self.path))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import numpy as np
+import pygame
+import pygame.sndarray
+from .constants import *
+
+class AudioConfig:
+    def __init__(self, frequency=MIXER_FREQUENCY, size=MIXER_SIZE, channels=MIXER_CHANNELS, buffer=MIXER_BUFFER):
+        """Mixer settings, and sounds made to match them.
+
+        pre_init() has to run before pygame.init() for the settings to be
+        used. The buffer is how many sample frames the mixer fills at a time,
+        so it sets most of the delay between playing a sound and hearing it.
+        """
+        self.frequency = frequency
+        self.size = size  # bits per sample, negative for signed
+        self.channels = channels
+        self.buffer = buffer
+
+    def pre_init(self):
+        """Make the next mixer start-up (including pygame.init()) use these settings."""
+        pygame.mixer.pre_init(self.frequency, self.size, self.channels, self.buffer)
+
+    def init(self):
+        """Start the mixer with these settings unless it is already running."""
+        if not pygame.mixer.get_init():
+            pygame.mixer.init(self.frequency, self.size, self.channels, self.buffer)
+
+    def output_format(self):
+        """Return the (frequency, size, channels) the mixer actually runs at."""
+        return pygame.mixer.get_init() or (self.frequency, self.size, self.channels)
+
+    def make_sound(self, wave):
+        """Turn samples between -1 and 1 into a Sound in the mixer's own format.
+
+        wave is mono (one sample per frame) or has one column per mixer channel.
+        """
+        frequency, size, channels = self.output_format()
+        if size == 32:
+            samples = wave.astype(np.float32)
+        elif size < 0:
+            peak = 2 ** (-size - 1) - 1
+            samples = (wave * peak).astype(np.int8 if size == -8 else np.int16)
+        else:
+            middle = 2 ** (size - 1)
+            samples = (wave * (middle - 1) + middle).astype(np.uint8 if size == 8 else np.uint16)
+        if channels > 1 and samples.ndim == 1:
+            samples = np.repeat(samples[:, np.newaxis], channels, axis=1)
+        elif channels == 1 and samples.ndim > 1:
+            samples = samples.mean(axis=1).astype(samples.dtype)
+        return pygame.sndarray.make_sound(np.ascontiguousarray(samples))
+
+    def latency(self):
+        """Estimate the delay from queuing a sound to hearing it, in milliseconds.
+
+        Worked out from the configured buffer rather than measured, since
+        pygame doesn't report the buffer size the device actually opened
+        with (SDL may round it or pick another). A sound played waits for
+        the end of the frame (the sound manager flushes once per frame),
+        then for the buffer being played to finish, and is heard from the
+        next one. The device's own buffering can add up to about one more
+        buffer.
+        """
+        frequency = self.output_format()[0]
+        frame = 1000 / FPS
+        buffer = self.buffer / frequency * 1000
+        return {
+            "frame": frame,
+            "buffer": buffer,  # of the configured size, not necessarily the device's
+            "best": buffer,
+            "worst": frame + 2 * buffer,
+        }
@@ -0,0 +1,58 @@
+import os
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+import pygame.sndarray
+from game.audio_config import AudioConfig
+from game.constants import *
+
+class AudioConfigTest(unittest.TestCase):
+    def setUp(self):
+        # Each test starts the mixer in its own format; put back whatever ran before
+        running = pygame.mixer.get_init()
+        pygame.mixer.quit()
+        if running:
+            self.addCleanup(pygame.mixer.init, *running)
+        self.addCleanup(pygame.mixer.quit)
+
+    def start(self, size, channels, frequency=22050):
+        config = AudioConfig(frequency, size, channels, 512)
+        config.init()
+        return config
+
+    def samples(self, sound):
+        return pygame.sndarray.array(sound).tolist()
+
+    def test_mono_wave_is_copied_to_every_channel_at_16_bits(self):
+        config = self.start(-16, 2)
+        sound = config.make_sound(np.array([0.0, 1.0, -1.0, 0.5]))
+        self.assertEqual(self.samples(sound), [[0, 0], [32767, 32767], [-32767, -32767], [16383, 16383]])
+
+    def test_stereo_wave_is_mixed_down_for_a_mono_mixer(self):
+        config = self.start(-16, 1)
+        sound = config.make_sound(np.array([[1.0, 0.0], [-0.5, -0.5]]))
+        self.assertEqual(self.samples(sound), [16383, -16383])
+
+    def test_unsigned_8_bit_samples_are_centred(self):
+        config = self.start(8, 1)
+        sound = config.make_sound(np.array([0.0, 1.0, -1.0]))
+        self.assertEqual(self.samples(sound), [128, 255, 1])
+
+    def test_latency_follows_the_buffer(self):
+        config = self.start(-16, 2, 32000)
+        latency = config.latency()
+        self.assertEqual(latency["frame"], 1000 / FPS)
+        self.assertEqual(latency["buffer"], 16.0)
+        self.assertEqual(latency["best"], 16.0)
+        self.assertEqual(latency["worst"], 1000 / FPS + 32.0)
+
+    def test_latency_uses_the_configured_rate_until_the_mixer_runs(self):
+        config = AudioConfig(44100, -16, 2, 2048)
+        self.assertAlmostEqual(config.latency()["buffer"], 2048 / 44100 * 1000)
+
+if __name__ == "__main__":
+    unittest.main()
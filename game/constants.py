@@ -18,21 +18,145 @@ WARDEN_DETECTION_RADIUS = 150
 ECHO_DURATION = 60  # frames
 ECHO_SPEED = 5  # pixels per frame
 
+# Light map settings
+LIGHTMAP_SCALE = 8  # screen pixels per light map cell
+AMBIENT_LIGHT = 0
+LIGHT_LEVELS = 16  # cached intensity steps per light radius
+PLAYER_LIGHT_RADIUS = 300
+ECHO_LIGHT_RADIUS = 600
+ITEM_LIGHT_RADIUS = 60
+PORTAL_LIGHT_RADIUS = 100
+
 # Sound settings
 SOUND_COOLDOWN = 1000  # milliseconds
 
+# Mixer output: 16-bit signed stereo at 44.1 kHz, filled 512 sample frames
+# (about 12 ms) at a time so an echo is heard soon after the key press
+MIXER_FREQUENCY = 44100
+MIXER_SIZE = -16
+MIXER_CHANNELS = 2
+MIXER_BUFFER = 512
+
+# Mixer channels set aside for each category of sound, so that one kind
+# can't take every channel from the others
+SOUND_CHANNELS = {
+    "ui": 2,
+    "player": 4,
+    "enemies": 6,
+    "ambience": 4,
+    "narration": 1,
+}
+SOUND_CATEGORIES = {
+    "echo": "player",
+    "echo_reflections": "player",
+    "footstep": "player",
+    "heartbeat": "player",
+    "door_creak": "player",
+    "obstacle_hit": "player",
+    "warden_groan": "enemies",
+    "whisper1": "ambience",
+    "whisper2": "ambience",
+    "whisper3": "ambience",
+    "key_pickup": "ui",
+    "memory_trigger": "ui",
+    "victory": "ui",
+}
+# Memory narration is loaded once the player is this close to a fragment.
+# Clips over NARRATION_STREAM_SIZE bytes are streamed instead of decoded, and
+# loaded clips are kept up to NARRATION_CACHE_BUDGET bytes
+NARRATION_PRELOAD_DISTANCE = 400
+NARRATION_STREAM_SIZE = 1024 * 1024
+NARRATION_CACHE_BUDGET = 32 * 1024 * 1024
+
+# Chance of a memory fragment in each generated chunk (see MEMORY_TYPES below)
+MEMORY_FRAGMENT_CHANCE = 0.15
+
+# Plays of the same sound this close together (in milliseconds) are merged
+# into one, at the louder volume
+SOUND_COALESCE_WINDOW = 50
+
+# A sound with a full category takes the channel of its lowest priority
+# (then oldest) sound, as long as that one isn't more important
+SOUND_PRIORITY = {
+    "victory": 10,
+    "warden_groan": 8,
+    "echo": 7,
+    "echo_reflections": 7,
+    "key_pickup": 6,
+    "memory_trigger": 6,
+    "door_creak": 5,
+    "obstacle_hit": 4,
+    "heartbeat": 3,
+    "whisper1": 2,
+    "whisper2": 2,
+    "whisper3": 2,
+    "footstep": 1,
+}
+
 # Memory fragment settings
 MEMORY_TYPES = ["orphanage", "fire", "warden", "experiments"]
 
 # Surface types and their echo properties
+# (echo_decay is how long in seconds a reflection rings on, echo_softness
+# how much it muffles the sound)
 SURFACE_TYPES = {
-    "wood": {"color": (139, 69, 19), "echo_intensity": 0.7},
-    "metal": {"color": (192, 192, 192), "echo_intensity": 0.9},
-    "flesh": {"color": (255, 182, 193), "echo_intensity": 0.5},
-    "stone": {"color": (169, 169, 169), "echo_intensity": 0.8},
-    "fabric": {"color": (210, 180, 140), "echo_intensity": 0.3}
+    "wood": {"color": (139, 69, 19), "echo_intensity": 0.7, "echo_decay": 0.015, "echo_softness": 4},
+    "metal": {"color": (192, 192, 192), "echo_intensity": 0.9, "echo_decay": 0.04, "echo_softness": 1},
+    "flesh": {"color": (255, 182, 193), "echo_intensity": 0.5, "echo_decay": 0.008, "echo_softness": 12},
+    "stone": {"color": (169, 169, 169), "echo_intensity": 0.8, "echo_decay": 0.02, "echo_softness": 2},
+    "fabric": {"color": (210, 180, 140), "echo_intensity": 0.3, "echo_decay": 0.005, "echo_softness": 16}
 }
 
+# Entity type codes (ENTITY_NAMES gives their names)
+WARDEN = 0
+PHANTOM = 1
+CRAWLER = 2
+TURRET = 3
+RITUAL = 4
+ENTITY_NAMES = ["warden", "phantom", "crawler", "turret", "ritual"]
+
+# Material codes for the per-chunk occupancy grid (0 means empty)
+SURFACE_CODES = {name: code for code, name in enumerate(SURFACE_TYPES, start=1)}
+
+# Occupancy grid and echo propagation settings
+GRID_CELL_SIZE = 50  # world pixels per grid cell
+ECHO_RAYS = 360
+ECHO_MAX_DISTANCE = 600
+ECHO_RAY_STEP = 10  # world pixels between ray samples
+ECHO_RETURN_SPEED = 40  # world pixels per frame the returning echo travels
+ECHO_RETURN_VOLUME = 0.3
+ECHO_REFLECTIONS = 24  # strongest surfaces heard in an echo's reflections
+ECHO_IMPULSE_LENGTH = 0.05  # seconds of each material's impulse response
+
+# Flow field pathfinding toward the player
+FLOW_FIELD_RADIUS = 1000  # world pixels searched around the player
+FLOW_FIELD_SLACK = 2  # cells the player may get ahead of the field before it is rebuilt that frame
+
+# Sound propagation (loudness 1.0 carries SOUND_MAX_RANGE world pixels)
+SOUND_MAX_RANGE = 1200
+SOUND_MEMORY = 180  # frames a sound event is remembered
+SOUND_LOUDNESS = {
+    "echo": 1.0,
+    "footstep": 0.2,
+    "pickup": 0.5,
+    "impact": 0.6
+}
+WARDEN_HEARING = 0.05  # quietest sound a warden reacts to
+CRAWLER_HEARING = 0.75  # crawlers only come for loud, nearby sounds
+
+# Idle enemies further than this from the player are put to sleep, and woken
+# again once the player comes within the (smaller) wake distance
+ENEMY_SLEEP_DISTANCE = 800
+ENEMY_WAKE_DISTANCE = 650
+
+# How far outside its chunk an enemy (sprite and patrol orbit) can reach
+ENEMY_RENDER_MARGIN = 100
+
+# Milliseconds per frame the work scheduler may spend on deferred work
+# such as generating chunks ahead of the player; the game loop spends
+# less when the rest of the frame leaves less time than this
+FRAME_WORK_BUDGET = 4.0
+
 # Game states
 STATES = ["PLAYING", "PAUSED", "MEMORY", "GAME_OVER"]
 
@@ -1,17 +1,18 @@
 import pygame
 import math
+from .entities import Portal
 
 class DoorIndicator:
-    def __init__(self, world):
+    def __init__(self, world, font=None):
         self.world = world
-        self.font = pygame.font.Font(None, 20)
+        self.font = font or pygame.font.Font(None, 20)
     
     def render(self, screen, camera_pos):
-        # Find exit door in active chunks
+        # Find exit door in loaded chunks
         exit_door = None
-        for chunk in self.world.active_chunks:
-            for portal in chunk.portals:
-                if portal.get("is_exit", False):
+        for chunk in self.world.loaded_chunks:
+            for entity, portal in self.world.entities.query(chunk.portals, Portal):
+                if portal.is_exit:
                     exit_door = portal
                     break
             if exit_door:
@@ -21,8 +22,8 @@ class DoorIndicator:
             return
         
         # Calculate screen position of exit door
-        door_x = exit_door["rect"].x - camera_pos[0]
-        door_y = exit_door["rect"].y - camera_pos[1]
+        door_x = exit_door.rect.x - camera_pos[0]
+        door_y = exit_door.rect.y - camera_pos[1]
         
         # If door is on screen, just show the ritual count
         if -60 < door_x < pygame.display.get_surface().get_width() + 60 and -60 < door_y < pygame.display.get_surface().get_height() + 60:
@@ -39,8 +40,8 @@ class DoorIndicator:
         # Calculate direction to exit door
         player_x = screen_width // 2
         player_y = screen_height // 2
-        dx = exit_door["rect"].centerx - (camera_pos[0] + player_x)
-        dy = exit_door["rect"].centery - (camera_pos[1] + player_y)
+        dx = exit_door.rect.centerx - (camera_pos[0] + player_x)
+        dy = exit_door.rect.centery - (camera_pos[1] + player_y)
         angle = math.atan2(dy, dx)
         
         # Calculate position on screen edge
@@ -0,0 +1,118 @@
+import math
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pygame
+import pygame.sndarray
+from .echo_propagation import MATERIAL_ECHO
+from .constants import *
+
+class EchoReverb:
+    def __init__(self, ping, audio_config, max_reflections=ECHO_REFLECTIONS):
+        """Sound of an echo coming back off the surfaces it revealed.
+
+        At start-up every material gets a short impulse response: a sharp
+        reflection followed by a decaying, muffled tail, scaled by the
+        material's echo_intensity. The ping is convolved with each one once,
+        so an echo only has to add a delayed, panned copy of its material's
+        reflection per surface heard, and its mixing time grows with the
+        number of reflections rather than with their length times the number
+        of surfaces. Mixing runs on a worker thread, and the sound is picked
+        up once the first reflection is due back.
+        """
+        self.audio_config = audio_config
+        self.frequency = audio_config.output_format()[0]
+        self.max_reflections = max_reflections
+
+        # The ping as mono samples between -1 and 1
+        samples = pygame.sndarray.array(ping).astype(np.float32)
+        if samples.ndim > 1:
+            samples = samples.mean(axis=1)
+        peak = np.abs(samples).max()
+        self.ping = samples / peak if peak else samples
+
+        # Reflection of the ping off each material, by material code
+        self.impulses = [None]
+        self.reflections = [None]
+        for name, surface in SURFACE_TYPES.items():
+            impulse = self._impulse_response(SURFACE_CODES[name], surface)
+            self.impulses.append(impulse)
+            self.reflections.append(np.convolve(self.ping, impulse).astype(np.float32))
+
+        self.mixer = ThreadPoolExecutor(max_workers=1)
+        self.mixing = None
+
+    def _impulse_response(self, code, surface):
+        """Unit reflection followed by a smoothed, exponentially decaying noise tail."""
+        length = int(ECHO_IMPULSE_LENGTH * self.frequency)
+        t = np.arange(length) / self.frequency
+        tail = np.random.default_rng(code).uniform(-1.0, 1.0, length) * np.exp(-t / surface["echo_decay"])
+
+        # Softer materials take the edge off the sound
+        softness = surface["echo_softness"]
+        tail = np.convolve(tail, np.full(softness, 1.0 / softness))[:length]
+
+        impulse = 0.3 * tail
+        impulse[0] += 1.0
+        return (impulse * surface["echo_intensity"]).astype(np.float32)
+
+    def emit(self, result):
+        """Start mixing the reflections of an echo result on the worker thread."""
+        self.mixing = self.mixer.submit(self.mix, result)
+
+    def reset(self):
+        """Forget the echo being mixed, if any, so its reflections are never played."""
+        self.mixing = None
+
+    def shutdown(self):
+        """Stop the worker thread once the game is over."""
+        self.reset()
+        self.mixer.shutdown(wait=True)
+
+    def mix(self, result):
+        """Return the reflections of an echo as stereo samples starting at the moment it was sent out."""
+        if not result.revealed:
+            return None
+
+        # The strongest surfaces, louder the closer they are (the material's
+        # own strength is in its impulse response)
+        origin_x, origin_y = result.origin
+        surfaces = sorted(result.revealed, key=lambda cell: cell[3], reverse=True)[:self.max_reflections]
+        samples_per_pixel = 2 * self.frequency / (ECHO_RETURN_SPEED * FPS)
+        reflections = []
+        for cell_x, cell_y, material, strength in surfaces:
+            dx = cell_x + GRID_CELL_SIZE / 2 - origin_x
+            dy = cell_y + GRID_CELL_SIZE / 2 - origin_y
+            distance = math.sqrt(dx*dx + dy*dy)
+            gain = strength / MATERIAL_ECHO[material]
+            pan = max(-1.0, min(1.0, dx / ECHO_MAX_DISTANCE))
+            reflections.append((int(distance * samples_per_pixel), material, gain, pan))
+
+        length = max(delay + len(self.reflections[material]) for delay, material, _, _ in reflections)
+        out = np.zeros((length, 2), dtype=np.float32)
+        for delay, material, gain, pan in reflections:
+            reflection = self.reflections[material]
+            end = delay + len(reflection)
+            out[delay:end, 0] += reflection * (gain * min(1.0, 1.0 - pan))
+            out[delay:end, 1] += reflection * (gain * min(1.0, 1.0 + pan))
+
+        # Keep the loudest pile-up of reflections from clipping
+        peak = np.abs(out).max()
+        if peak > 1.0:
+            out /= peak
+        return out, min(delay for delay, _, _, _ in reflections)
+
+    def returned(self):
+        """Return a Sound of the last echo's reflections from the first one on, or None.
+
+        Meant to be called when the first reflection is due back, which is
+        far longer than mixing takes, so it seldom has to wait for the mix.
+        """
+        if self.mixing is None:
+            return None
+        mixed = self.mixing.result()
+        self.mixing = None
+        if mixed is None:
+            return None
+
+        out, first = mixed
+        return self.audio_config.make_sound(out[first:])
@@ -0,0 +1,79 @@
+import os
+import unittest
+from types import SimpleNamespace
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+from game.audio_config import AudioConfig
+from game.echo_audio import EchoReverb
+from game.echo_propagation import EchoPropagator, MATERIAL_ECHO
+from game.infinite_world_updated import Chunk
+from game.constants import *
+
+class EchoReverbTest(unittest.TestCase):
+    def setUp(self):
+        self.config = AudioConfig()
+        self.config.init()
+        wave = np.sin(np.arange(2000) * 0.2)
+        self.reverb = EchoReverb(self.config.make_sound(wave), self.config)
+        self.addCleanup(self.reverb.shutdown)
+        self.samples_per_pixel = 2 * self.reverb.frequency / (ECHO_RETURN_SPEED * FPS)
+
+    def surface(self, dx, dy, material="stone"):
+        """A revealed cell whose centre is (dx, dy) from the origin, at full strength."""
+        code = SURFACE_CODES[material]
+        return (dx - GRID_CELL_SIZE / 2, dy - GRID_CELL_SIZE / 2, code, MATERIAL_ECHO[code])
+
+    def mix(self, *surfaces):
+        return self.reverb.mix(SimpleNamespace(origin=(0, 0), revealed=list(surfaces)))
+
+    def test_nothing_revealed_mixes_nothing(self):
+        self.assertIsNone(self.mix())
+
+    def test_reflection_is_delayed_by_its_distance(self):
+        out, first = self.mix(self.surface(300, 0))
+        self.assertEqual(first, int(300 * self.samples_per_pixel))
+        self.assertFalse(out[:first].any())
+        self.assertTrue(out[first:].any())
+
+    def test_reflection_is_panned_toward_its_side(self):
+        out, _ = self.mix(self.surface(300, 0))
+        self.assertGreater(np.abs(out[:, 1]).sum(), np.abs(out[:, 0]).sum())
+        out, _ = self.mix(self.surface(-300, 0))
+        self.assertGreater(np.abs(out[:, 0]).sum(), np.abs(out[:, 1]).sum())
+
+    def test_only_the_strongest_surfaces_are_heard(self):
+        # A faint surface far off, past as many strong ones as can be heard
+        strong = [self.surface(100 + 10 * i, 0) for i in range(ECHO_REFLECTIONS)]
+        faint = (3000, 0, SURFACE_CODES["wood"], 0.01)
+        out, first = self.mix(faint, *strong)
+        self.assertEqual(first, int(100 * self.samples_per_pixel))
+        self.assertLess(len(out), int(3000 * self.samples_per_pixel))
+
+    def test_pile_up_does_not_clip(self):
+        out, _ = self.mix(*[self.surface(200, 0, "metal")] * ECHO_REFLECTIONS)
+        self.assertLessEqual(np.abs(out).max(), 1.0 + 1e-6)
+
+    def test_emitted_echo_comes_back_from_its_first_reflection(self):
+        chunks = {(0, 0): Chunk(0, 0)}
+        chunks[(0, 0)].grid[:, 14] = SURFACE_CODES["stone"]
+        echo = EchoPropagator(chunks, 1000).emit((525, 525))
+        self.reverb.emit(echo)
+        sound = self.reverb.returned()
+        self.assertIsInstance(sound, pygame.mixer.Sound)
+        self.assertIsNone(self.reverb.returned())
+
+        out, first = self.reverb.mix(echo)
+        self.assertEqual(len(pygame.sndarray.array(sound)), len(out) - first)
+        self.assertTrue(pygame.sndarray.array(sound)[:len(self.reverb.ping)].any())
+
+    def test_reset_drops_the_echo_being_mixed(self):
+        self.reverb.emit(SimpleNamespace(origin=(0, 0), revealed=[self.surface(300, 0)]))
+        self.reverb.reset()
+        self.assertIsNone(self.reverb.returned())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import math
+import numpy as np
+from .occupancy import stitch_grids
+from .constants import *
+
+# Echo strength and color per material code (index 0 is empty space)
+MATERIAL_ECHO = np.array([0.0] + [SURFACE_TYPES[name]["echo_intensity"] for name in SURFACE_TYPES],
+                         dtype=np.float32)
+MATERIAL_COLORS = [None] + [SURFACE_TYPES[name]["color"] for name in SURFACE_TYPES]
+
+class EchoResult:
+    def __init__(self, origin, grid_origin, materials, strength, nearest=None):
+        """Grid cells revealed by a single echo emission.
+
+        materials and strength cover a window of grid cells around the origin
+        whose top-left corner is at grid_origin in world coordinates; strength
+        is how strongly each cell reflected the echo (0 if it was never hit).
+        nearest is how far the closest hit was, or None if nothing was hit.
+        """
+        self.origin = origin
+        self.grid_origin = grid_origin
+        self.materials = materials
+        self.strength = strength
+        self.nearest = nearest
+        self.age = 0
+
+        # World rectangles of the revealed cells, for rendering
+        self.revealed = []
+        cells_y, cells_x = np.nonzero(strength)
+        for cell_x, cell_y in zip(cells_x.tolist(), cells_y.tolist()):
+            self.revealed.append((
+                grid_origin[0] + cell_x * GRID_CELL_SIZE,
+                grid_origin[1] + cell_y * GRID_CELL_SIZE,
+                int(materials[cell_y, cell_x]),
+                float(strength[cell_y, cell_x])
+            ))
+
+    def strength_at(self, world_x, world_y):
+        """Return how strongly the cell at a world position reflected the echo."""
+        cell_x = int(world_x - self.grid_origin[0]) // GRID_CELL_SIZE
+        cell_y = int(world_y - self.grid_origin[1]) // GRID_CELL_SIZE
+        if 0 <= cell_y < self.strength.shape[0] and 0 <= cell_x < self.strength.shape[1]:
+            return float(self.strength[cell_y, cell_x])
+        return 0.0
+
+class EchoPropagator:
+    def __init__(self, chunks, chunk_size, num_rays=ECHO_RAYS, max_distance=ECHO_MAX_DISTANCE,
+                 step=ECHO_RAY_STEP, duration=ECHO_DURATION):
+        """Ray march echoes over the chunk occupancy grids."""
+        self.chunks = chunks
+        self.chunk_size = chunk_size
+        self.max_distance = max_distance
+        self.duration = duration
+        self.last_result = None
+
+        # Sample offsets of every ray relative to the origin, shape (rays, steps)
+        angles = np.linspace(0, 2 * math.pi, num_rays, endpoint=False)
+        distances = np.arange(step, max_distance + step, step, dtype=np.float64)
+        self.distances = distances
+        self.offset_x = np.cos(angles)[:, None] * distances[None, :]
+        self.offset_y = np.sin(angles)[:, None] * distances[None, :]
+
+        # Echoes get weaker the further they travel
+        self.attenuation = (1.0 - distances / (max_distance + step)).astype(np.float32)
+
+    def emit(self, origin):
+        """Propagate an echo from a world position and cache the result."""
+        materials, grid_origin = stitch_grids(self.chunks, self.chunk_size,
+                                              origin[0] - self.max_distance, origin[1] - self.max_distance,
+                                              origin[0] + self.max_distance, origin[1] + self.max_distance)
+
+        # Grid cell under every ray sample
+        cells_x = ((origin[0] - grid_origin[0] + self.offset_x) // GRID_CELL_SIZE).astype(np.intp)
+        cells_y = ((origin[1] - grid_origin[1] + self.offset_y) // GRID_CELL_SIZE).astype(np.intp)
+        samples = materials[cells_y, cells_x]
+
+        # Each ray stops at the first occupied cell it reaches
+        hits = samples != 0
+        rays = np.nonzero(hits.any(axis=1))[0]
+        steps = hits[rays].argmax(axis=1)
+        hit_x = cells_x[rays, steps]
+        hit_y = cells_y[rays, steps]
+        values = MATERIAL_ECHO[samples[rays, steps]] * self.attenuation[steps]
+
+        strength = np.zeros(materials.shape, dtype=np.float32)
+        np.maximum.at(strength, (hit_y, hit_x), values)
+
+        nearest = float(self.distances[steps.min()]) if len(steps) else None
+        self.last_result = EchoResult(origin, grid_origin, materials, strength, nearest)
+        return self.last_result
+
+    def update(self):
+        """Age the cached result and drop it once the echo has faded."""
+        if self.last_result:
+            self.last_result.age += 1
+            if self.last_result.age > self.duration:
+                self.last_result = None
+
+    def get_intensity(self):
+        """Return the current intensity (0-255) of the cached echo."""
+        if not self.last_result:
+            return 0
+        return 255 - int(255 * (self.last_result.age / self.duration))
@@ -0,0 +1,47 @@
+import os
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from game.echo_propagation import EchoPropagator, MATERIAL_ECHO
+from game.infinite_world_updated import Chunk
+from game.constants import *
+
+class EchoPropagatorTest(unittest.TestCase):
+    def setUp(self):
+        self.chunks = {(0, 0): Chunk(0, 0)}
+        self.propagator = EchoPropagator(self.chunks, 1000)
+
+    def test_empty_space_reveals_nothing(self):
+        result = self.propagator.emit((500, 500))
+        self.assertEqual(result.revealed, [])
+        self.assertIsNone(result.nearest)
+
+    def test_wall_is_revealed_with_its_material(self):
+        # A column of stone cells starting 175 pixels to the right of the origin
+        code = SURFACE_CODES["stone"]
+        self.chunks[(0, 0)].grid[:, 14] = code
+        result = self.propagator.emit((525, 525))
+
+        self.assertTrue(result.revealed)
+        self.assertTrue(all(material == code for _, _, material, _ in result.revealed))
+        self.assertAlmostEqual(result.nearest, 175, delta=ECHO_RAY_STEP)
+        self.assertGreater(result.strength_at(14 * GRID_CELL_SIZE + 1, 525), 0)
+        self.assertLessEqual(result.strength_at(14 * GRID_CELL_SIZE + 1, 525), MATERIAL_ECHO[code])
+
+    def test_wall_hides_what_is_behind_it(self):
+        self.chunks[(0, 0)].grid[:, 14] = SURFACE_CODES["stone"]
+        self.chunks[(0, 0)].grid[:, 16] = SURFACE_CODES["metal"]
+        result = self.propagator.emit((525, 525))
+        self.assertEqual(result.strength_at(16 * GRID_CELL_SIZE + 1, 525), 0)
+
+    def test_result_fades(self):
+        self.propagator.emit((500, 500))
+        for _ in range(ECHO_DURATION + 1):
+            self.propagator.update()
+        self.assertIsNone(self.propagator.last_result)
+        self.assertEqual(self.propagator.get_intensity(), 0)
+
+if __name__ == "__main__":
+    unittest.main()
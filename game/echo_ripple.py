@@ -0,0 +1,72 @@
+import pygame
+import pygame.gfxdraw
+from .constants import *
+
+class EchoRipple:
+    def __init__(self, x, y):
+        """An expanding echo ring anchored at a world position."""
+        self.x = x
+        self.y = y
+        self.timer = 0
+
+class EchoRippleRenderer:
+    def __init__(self, duration=ECHO_DURATION, speed=ECHO_SPEED):
+        """Pre-bake the ring animation and track active ripples."""
+        self.duration = duration
+        self.ripples = []
+
+        # Radius and ring colors for every frame of the animation
+        self.frames = []
+        for timer in range(duration + 1):
+            intensity = 255 - int(255 * (timer / duration))
+            radius = int(timer * speed)
+            self.frames.append((
+                radius,
+                (200, 50, 200, intensity),
+                (150, 50, 150, intensity // 2)
+            ))
+
+    def spawn(self, x, y):
+        """Start a new ripple at a world position."""
+        self.ripples.append(EchoRipple(x, y))
+
+    def update(self):
+        """Advance every ripple and drop the finished ones."""
+        for ripple in self.ripples:
+            ripple.timer += 1
+        self.ripples = [ripple for ripple in self.ripples if ripple.timer <= self.duration]
+
+    def get_intensity(self, ripple):
+        """Return the current intensity (0-255) of a ripple."""
+        return self.frames[ripple.timer][1][3]
+
+    def render(self, screen, camera_pos):
+        """Draw the rings straight onto the screen.
+
+        gfxdraw blends the ring pixels in place, so the cost depends on the
+        ring's circumference rather than on the screen size.
+        """
+        screen_rect = screen.get_rect()
+        for ripple in self.ripples:
+            radius, color, inner_color = self.frames[ripple.timer]
+            if radius <= 0:
+                continue
+
+            # Skip rings whose bounding box is entirely off-screen
+            center_x = int(ripple.x - camera_pos[0])
+            center_y = int(ripple.y - camera_pos[1])
+            bounds = pygame.Rect(center_x - radius, center_y - radius, radius * 2 + 1, radius * 2 + 1)
+            if not bounds.colliderect(screen_rect):
+                continue
+
+            self._draw_ring(screen, center_x, center_y, radius, color)
+
+            # Draw another circle for visual effect
+            if radius > 10:
+                self._draw_ring(screen, center_x, center_y, radius - 10, inner_color)
+
+    def _draw_ring(self, screen, x, y, radius, color):
+        """Draw a 2 pixel wide ring, matching pygame.draw.circle(..., 2)."""
+        pygame.gfxdraw.circle(screen, x, y, radius, color)
+        if radius > 1:
+            pygame.gfxdraw.circle(screen, x, y, radius - 1, color)
@@ -345,6 +345,7 @@ class GameEngine:
         while self.running:
             self.handle_events()
             self.update()
+            self.sound_manager.flush()
             self.render()
             self.clock.tick(FPS)
             
@@ -3,21 +3,44 @@ import sys
 import os
 import math
 import random
+import time
 from .player_animated import AnimatedPlayer
 from .infinite_world_updated import InfiniteWorld
-from .sound_manager import SoundManager
+from .echo_ripple import EchoRippleRenderer
 from .memory_fragment import MemoryFragmentManager
+from .services import GameServices
+from .sim_clock import SimClock
+from .work_scheduler import WorkScheduler
 from .constants import *
 
 class GameEngine:
-    def __init__(self, warden_speed=1.5, level_data=None):
-        """Initialize the game engine and all game components."""
-        # Set up the display
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Echoes of the Forgotten")
+    def __init__(self, warden_speed=1.5, level_data=None, time_scale=1.0, services=None, level=None):
+        """Initialize the game engine and all game components.
         
-        # Set up the clock
+        time_scale runs the game that many times faster than real time (for
+        headless runs); only every time_scale-th frame is then drawn.
+        services are the display, audio, assets and fonts shared between
+        levels (see GameServices); without them the engine makes its own.
+        level is the level's world built ahead of time (a LevelBuild made
+        with the same services and settings), waited for if unfinished.
+        setup_time is how long this took, in milliseconds.
+        """
+        started = time.perf_counter()
+        
+        # Shared services, cleared of whatever the last level left running
+        self.services = services or GameServices()
+        self.services.reset()
+        self.screen = self.services.screen
+        
+        # Set up the clock, and the game time that all components share
+        # (a level built ahead of time comes with its own)
         self.clock = pygame.time.Clock()
+        self.sim_clock = SimClock(scale=time_scale) if level is None else level.sim_clock
+        self.sim_clock.scale = time_scale
+        
+        # Deferred work (such as generating chunks ahead of the player),
+        # spread over frames a few milliseconds at a time
+        self.scheduler = WorkScheduler(FRAME_WORK_BUDGET) if level is None else level.scheduler
         
         # Game state
         self.running = True
@@ -33,44 +56,72 @@ class GameEngine:
         }
         
         # Initialize game components
-        self.sound_manager = SoundManager()
-        self.player = AnimatedPlayer(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, self.sound_manager)
-        self.world = InfiniteWorld(self.sound_manager, warden_speed, 
-                                  self.level_data["ritual_items_required"],
-                                  self.level_data["enemy_count"])
-        self.memory_manager = MemoryFragmentManager()
+        self.assets = self.services.assets
+        self.sound_manager = self.services.sound_manager
+        self.echo_reverb = self.services.echo_reverb
+        self.player = AnimatedPlayer(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, self.sound_manager, self.sim_clock,
+                                     self.services.player_sprites)
+        if level is None:
+            self.world = InfiniteWorld(self.sound_manager, warden_speed, 
+                                      self.level_data["ritual_items_required"],
+                                      self.level_data["enemy_count"],
+                                      self.sim_clock, scheduler=self.scheduler,
+                                      textures=self.services.world_textures)
+        else:
+            self.world = level.result()
+        self.services.player_sprites = self.player.sprites
+        self.services.world_textures = self.world.textures()
+        self.memory_manager = MemoryFragmentManager(self.services.narrator, self.services.memory_font)
         
         # Initialize turret enemies and projectiles
         self.turrets = []
         self.projectiles = []
         
+        # Real time from stepping into a portal to the first frame drawn
+        # after the update that brings the player to its destination, in
+        # milliseconds. teleport_arrived holds the step's time once that
+        # update has run, until a frame is drawn
+        self.teleport_started = None
+        self.teleport_arrived = None
+        self.teleport_latencies = []
+        
+        # When run() started the current frame and how long the last frame
+        # took to draw, so update() knows how much of the frame is left over
+        self.frame_started = None
+        self.render_time = 0.0
+        
         # Create door indicator
         from .door_indicator import DoorIndicator
-        self.door_indicator = DoorIndicator(self.world)
+        self.door_indicator = DoorIndicator(self.world, self.services.small_font)
         
         # Camera position (centered on player)
         self.camera_x = self.player.x - SCREEN_WIDTH // 2
         self.camera_y = self.player.y - SCREEN_HEIGHT // 2
         
-        # Echo effect surface
-        self.echo_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        self.echo_timer = 0
+        # Echo effect
+        self.echo_ripples = EchoRippleRenderer()
+        self.light_map = self.services.light_map
         self.echo_active = False
+        self.echo_end = None  # Timer that ends the current echo
+        self.echo_return = None  # Timer that plays the current echo's reflections
         
-        # Load fonts
-        try:
-            fonts_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 
-                                    "game", "assets", "fonts")
-            self.font = pygame.font.Font(None, 24)  # Smaller font
-            self.title_font = pygame.font.Font(None, 36)
-        except:
-            self.font = pygame.font.Font(None, 24)
-            self.title_font = pygame.font.Font(None, 36)
+        # Fonts
+        self.font = self.services.font
+        self.title_font = self.services.title_font
             
-        # UI elements
+        # UI elements (the tutorial is shown for the first 5 seconds)
         self.show_tutorial = True
-        self.tutorial_timer = 0
+        self.sim_clock.schedule(300, self._hide_tutorial)
         self.show_controls = False
+        
+        # Pre-composed static parts of the VICTORY, GAME_OVER and MEMORY screens
+        # (rebuilt whenever the game enters one of those states)
+        self.state_screen = None
+        self.state_screen_for = None
+        self.state_screen_texts = []
+        self.pulse_layer = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        
+        self.setup_time = (time.perf_counter() - started) * 1000
     
     def handle_events(self):
         """Process all game events."""
@@ -86,9 +137,24 @@ class GameEngine:
                     # Emit sound/echolocation
                     if self.player.emit_sound():
                         self.echo_active = True
-                        self.echo_timer = 0
+                        if self.echo_end:
+                            self.echo_end.cancel()
+                        self.echo_end = self.sim_clock.schedule(ECHO_DURATION + 1, self._end_echo)
+                        self.echo_ripples.spawn(self.player.x, self.player.y)
+                        echo = self.world.emit_echo(self.player.rect.center)
+                        self.world.sounds.emit("echo", self.player.rect.center)
                         # Play sound at higher volume
                         self.sound_manager.play_sound("echo", 0.8)
+                        
+                        # Mix what comes back off the revealed surfaces, and play it
+                        # once the echo has reached the nearest one and returned
+                        self.echo_reverb.emit(echo)
+                        if self.echo_return:
+                            self.echo_return.cancel()
+                            self.echo_return = None
+                        if echo.nearest is not None:
+                            self.echo_return = self.sim_clock.schedule(2 * echo.nearest / ECHO_RETURN_SPEED,
+                                                                       self._play_echo_return)
                 elif self.game_state == "MEMORY":
                     # Any key press in memory state returns to playing
                     self.game_state = "PLAYING"
@@ -102,12 +168,32 @@ class GameEngine:
     def update(self):
         """Update game state."""
         if self.game_state == "PLAYING":
+            # Game time only moves while playing
+            self.sim_clock.tick()
+            
+            # The player stepped into a portal last update, so arrives at its
+            # destination this one; the next frame drawn shows the arrival
+            if self.teleport_started is not None:
+                self.teleport_arrived, self.teleport_started = self.teleport_started, None
+            
             # Store previous position for collision handling
             prev_x, prev_y = self.player.x, self.player.y
             
             # Update player
             self.player.update()
             
+            # Keep the player out of obstacles, sliding along them where possible
+            # (moving out of one is always allowed, e.g. after a teleport)
+            if self.world.check_obstacle_collision(self.player.rect) and \
+               not self.world.check_obstacle_collision(pygame.Rect(prev_x, prev_y, self.player.width, self.player.height)):
+                if not self.world.check_obstacle_collision(pygame.Rect(self.player.x, prev_y, self.player.width, self.player.height)):
+                    self.player.y = prev_y
+                elif not self.world.check_obstacle_collision(pygame.Rect(prev_x, self.player.y, self.player.width, self.player.height)):
+                    self.player.x = prev_x
+                else:
+                    self.player.x, self.player.y = prev_x, prev_y
+                self.player.rect.x, self.player.rect.y = self.player.x, self.player.y
+            
             # Update camera to follow player
             self.camera_x = self.player.x - SCREEN_WIDTH // 2
             self.camera_y = self.player.y - SCREEN_HEIGHT // 2
@@ -115,28 +201,17 @@ class GameEngine:
             # Update active chunks based on player position
             self.world.update_active_chunks((self.player.x, self.player.y))
             
-            # Track if player made a sound this frame
-            sound_made = False
-            if self.echo_active and self.echo_timer == 0:
-                sound_made = True
+            # Let enemies hear the player's footsteps
+            if self.player.stepped:
+                self.world.sounds.emit("footstep", self.player.rect.center)
             
             # Update all enemies
-            self.world.update_enemies((self.player.x, self.player.y), sound_made)
+            self.world.update_enemies((self.player.x, self.player.y))
             
-            # Check for turret projectiles
-            for chunk in self.world.active_chunks:
-                for enemy in chunk.enemies:
-                    if enemy["type"] == "turret" and enemy.get("has_fired", False):
-                        # Create new projectile
-                        from .projectile import Projectile
-                        new_proj = Projectile(
-                            enemy["x"] + 16, 
-                            enemy["y"] + 16, 
-                            enemy.get("target_x", self.player.x), 
-                            enemy.get("target_y", self.player.y)
-                        )
-                        self.projectiles.append(new_proj)
-                        enemy["has_fired"] = False
+            # Create projectiles for the turrets that fired
+            for x, y, target_x, target_y in self.world.fired_shots:
+                from .projectile import Projectile
+                self.projectiles.append(Projectile(x, y, target_x, target_y))
             
             # Update projectiles
             for proj in self.projectiles[:]:
@@ -144,6 +219,7 @@ class GameEngine:
                     self.projectiles.remove(proj)
                 elif proj.check_collision(self.player.rect):
                     # Player hit by projectile
+                    self.world.sounds.emit("impact", (proj.x, proj.y))
                     if not self.player.take_damage(proj.damage):
                         self.game_state = "GAME_OVER"
                     else:
@@ -152,7 +228,7 @@ class GameEngine:
             
             # Check for collisions with collectables
             collectable = self.world.check_collectable_collision(self.player.rect)
-            if collectable == "ritual":
+            if collectable == RITUAL:
                 self.player.score += 100
                 # Play special sound
                 self.sound_manager.play_sound("key_pickup")
@@ -162,6 +238,13 @@ class GameEngine:
                     self.player.heal(20)
                     self.sound_manager.play_sound("victory")
             
+            # Touching a memory fragment brings the memory back
+            fragment = self.world.check_memory_collision(self.player.rect)
+            if fragment:
+                self.sound_manager.play_sound("memory_trigger")
+                self.memory_manager.trigger_memory(fragment)
+                self.game_state = "MEMORY"
+            
             # Check for portal collision
             portal_dest = self.world.check_portal_collision(self.player.rect)
             if portal_dest:
@@ -172,6 +255,7 @@ class GameEngine:
                     self.sound_manager.play_sound("victory")
                 else:
                     # Teleport player to a new location
+                    self.teleport_started = time.perf_counter()
                     self.player.x += portal_dest[0] * 1000
                     self.player.y += portal_dest[1] * 1000
                     self.player.rect.x = self.player.x
@@ -179,16 +263,14 @@ class GameEngine:
                     self.sound_manager.play_sound("door_creak")
             
             # Update echo effect
-            if self.echo_active:
-                self.echo_timer += 1
-                if self.echo_timer > ECHO_DURATION:
-                    self.echo_active = False
+            self.echo_ripples.update()
+            self.world.echo.update()
             
             # Check for enemy collision
             enemy_hit = self.world.check_enemy_collision(self.player.rect)
             if enemy_hit:
                 # Different enemies have different effects
-                if enemy_hit == "warden":
+                if enemy_hit == WARDEN:
                     # Warden does heavy damage
                     if not self.player.take_damage(40):
                         self.game_state = "GAME_OVER"
@@ -197,7 +279,7 @@ class GameEngine:
                         self.player.x, self.player.y = prev_x - 50, prev_y - 50
                         self.player.rect.x, self.player.rect.y = self.player.x, self.player.y
                         self.sound_manager.play_sound("warden_groan", 0.8)
-                elif enemy_hit == "crawler":
+                elif enemy_hit == CRAWLER:
                     # Crawler damages player
                     if not self.player.take_damage(20):
                         self.game_state = "GAME_OVER"
@@ -206,7 +288,7 @@ class GameEngine:
                         self.player.x, self.player.y = prev_x - 20, prev_y - 20
                         self.player.rect.x, self.player.rect.y = self.player.x, self.player.y
                         self.sound_manager.play_sound("obstacle_hit", 0.5)
-                elif enemy_hit == "phantom":
+                elif enemy_hit == PHANTOM:
                     # Phantom drains player's health
                     if not self.player.take_damage(10):
                         self.game_state = "GAME_OVER"
@@ -216,178 +298,69 @@ class GameEngine:
             # Update high score
             if self.player.score > self.world.highest_score:
                 self.world.highest_score = self.player.score
+            
+            # Let playing sounds follow the player
+            self.sound_manager.update(self.player.rect.center)
+            
+            # Load the narration of memory fragments the player is getting close to
+            self.memory_manager.preload_nearby(self.player.rect.center,
+                                               [fragment for chunk in self.world.active_chunks
+                                                for fragment in chunk.memory_fragments])
+            
+            # Spend up to the scheduler's budget on deferred work, but no
+            # more than is left of the frame once as long as the last frame
+            # took to draw is kept back
+            if self.frame_started is None:
+                self.scheduler.run()
+            else:
+                frame_time = 1000 / self.sim_clock.frame_rate()
+                spent = (time.perf_counter() - self.frame_started) * 1000
+                self.scheduler.run(min(self.scheduler.budget, frame_time - self.render_time - spent))
+    
+    def _end_echo(self):
+        """Called by the clock once the current echo has faded."""
+        self.echo_active = False
+        self.echo_end = None
+    
+    def _play_echo_return(self):
+        """Called by the clock once the current echo's first reflection is due back."""
+        self.echo_return = None
+        reflections = self.echo_reverb.returned()
+        if reflections:
+            self.sound_manager.set_sound("echo_reflections", reflections)
+            self.sound_manager.play_sound("echo_reflections", ECHO_RETURN_VOLUME)
+    
+    def _hide_tutorial(self):
+        """Called by the clock once the tutorial has been shown long enough."""
+        self.show_tutorial = False
     
     def render(self):
         """Render the game screen."""
-        if self.game_state == "PLAYING" or self.game_state == "VICTORY":
-            # Render world with background
-            self.world.render(self.screen, (self.camera_x, self.camera_y), 
-                             50 if not self.echo_active else 200)
-                             
-            # Render door indicator
-            self.door_indicator.render(self.screen, (self.camera_x, self.camera_y))
-            
-            # Render turrets and projectiles
-            for turret in self.turrets:
-                turret.render(self.screen, (self.camera_x, self.camera_y))
-            
-            # Render projectiles
-            for proj in self.projectiles:
-                proj.render(self.screen, (self.camera_x, self.camera_y))
-            
-            # Render echo effect - now used as a "reveal" ability
-            if self.echo_active:
-                # Calculate echo intensity based on timer
-                intensity = 255 - int(255 * (self.echo_timer / ECHO_DURATION))
-                
-                # Clear echo surface
-                self.echo_surface.fill((0, 0, 0, 0))
-                
-                # Draw expanding circle for echo effect
-                radius = int(self.echo_timer * ECHO_SPEED)
-                pygame.draw.circle(
-                    self.echo_surface, 
-                    (200, 50, 200, intensity), 
-                    (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2), 
-                    radius, 
-                    2
-                )
-                
-                # Draw another circle for visual effect
-                if radius > 10:
-                    pygame.draw.circle(
-                        self.echo_surface, 
-                        (150, 50, 150, intensity // 2), 
-                        (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2), 
-                        radius - 10, 
-                        2
-                    )
-                
-                # Blit echo surface onto screen
-                self.screen.blit(self.echo_surface, (0, 0))
-            
-            # Always render player in center of screen
-            self.player.render(self.screen, (self.camera_x, self.camera_y))
-            
-            # Show level info
-            if self.show_tutorial:
-                self.tutorial_timer += 1
-                if self.tutorial_timer < 300:  # Show for 5 seconds
-                    # Draw semi-transparent background
-                    tutorial_bg = pygame.Surface((SCREEN_WIDTH, 120))
-                    tutorial_bg.fill((0, 0, 0))
-                    tutorial_bg.set_alpha(180)
-                    self.screen.blit(tutorial_bg, (0, 0))
-                    
-                    # Draw level name
-                    level_name = self.font.render(f"Level: {self.level_data['name']}", True, (200, 50, 200))
-                    self.screen.blit(level_name, (SCREEN_WIDTH // 2 - level_name.get_width() // 2, 20))
-                    
-                    # Draw tutorial text
-                    controls = self.font.render("WASD/Arrows: Move | SPACE: Reveal Spirits", True, WHITE)
-                    self.screen.blit(controls, (SCREEN_WIDTH // 2 - controls.get_width() // 2, 50))
-                    
-                    objective = self.font.render(f"Collect {self.world.ritual_items_required} ritual items to unlock the exit door", True, WHITE)
-                    self.screen.blit(objective, (SCREEN_WIDTH // 2 - objective.get_width() // 2, 80))
-                else:
-                    self.show_tutorial = False
-            
-            # Draw UI elements - reveal cooldown indicator
-            cooldown_pct = min(1.0, (pygame.time.get_ticks() - self.player.last_sound_time) / self.player.sound_cooldown)
-            pygame.draw.rect(self.screen, (50, 50, 50), (10, 10, 100, 20))
-            pygame.draw.rect(self.screen, (200, 50, 200), (10, 10, 100 * cooldown_pct, 20))
-            sound_text = self.font.render("Reveal", True, WHITE)
-            self.screen.blit(sound_text, (120, 10))
-            
-            # Draw health bar
-            health_pct = max(0, self.player.health / 100)
-            pygame.draw.rect(self.screen, (50, 50, 50), (10, 40, 100, 20))
-            health_color = (
-                int(255 * (1 - health_pct)),  # Red increases as health decreases
-                int(255 * health_pct),        # Green decreases as health decreases
-                50
-            )
-            pygame.draw.rect(self.screen, health_color, (10, 40, 100 * health_pct, 20))
-            health_text = self.font.render("Health", True, WHITE)
-            self.screen.blit(health_text, (120, 40))
-            
-            # Draw score and ritual item counter
-            score_text = self.font.render(f"Score: {self.player.score}", True, WHITE)
-            self.screen.blit(score_text, (SCREEN_WIDTH - score_text.get_width() - 20, 10))
-            
-            # Draw high score
-            if self.world.highest_score > 0:
-                high_score_text = self.font.render(f"Best: {self.world.highest_score}", True, (200, 200, 100))
-                self.screen.blit(high_score_text, (SCREEN_WIDTH - high_score_text.get_width() - 20, 40))
-            
-            # Draw ritual item counter with icon
-            ritual_bg = pygame.Surface((120, 30), pygame.SRCALPHA)
-            ritual_bg.fill((0, 0, 0, 128))
-            self.screen.blit(ritual_bg, (SCREEN_WIDTH - 140, 70))
-            
-            ritual_text = self.font.render(f"Ritual: {self.world.ritual_items_collected}", True, (200, 50, 200))
-            self.screen.blit(ritual_text, (SCREEN_WIDTH - 135, 75))
-            
-            # Show victory screen if player won
-            if self.game_state == "VICTORY":
-                # Semi-transparent overlay
-                victory_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-                victory_overlay.fill((0, 0, 0, 180))
-                self.screen.blit(victory_overlay, (0, 0))
-                
-                # Victory message
-                victory_text = self.title_font.render("RITUAL COMPLETE", True, (200, 50, 200))
-                self.screen.blit(victory_text, (SCREEN_WIDTH // 2 - victory_text.get_width() // 2, 
-                                              SCREEN_HEIGHT // 2 - 100))
-                
-                # Score display
-                score_text = self.font.render(f"Final Score: {self.player.score}", True, WHITE)
-                self.screen.blit(score_text, (SCREEN_WIDTH // 2 - score_text.get_width() // 2, 
-                                            SCREEN_HEIGHT // 2 - 20))
-                
-                # High score display
-                if self.player.score >= self.world.highest_score:
-                    high_score_text = self.font.render("NEW HIGH SCORE!", True, (255, 215, 0))
-                    self.screen.blit(high_score_text, (SCREEN_WIDTH // 2 - high_score_text.get_width() // 2, 
-                                                    SCREEN_HEIGHT // 2 + 20))
-                
-                # Continue prompt
-                continue_text = self.font.render("Press SPACE to play again", True, WHITE)
-                self.screen.blit(continue_text, (SCREEN_WIDTH // 2 - continue_text.get_width() // 2, 
-                                               SCREEN_HEIGHT // 2 + 80))
+        if self.game_state == "PLAYING":
+            self._render_playing()
+            self.state_screen_for = None
+        
+        elif self.game_state == "VICTORY":
+            # Freeze the last frame under the overlay; nothing animates here
+            if self.state_screen_for != "VICTORY":
+                self._render_playing()
+                self._compose_victory_screen()
+            self.screen.blit(self.state_screen, (0, 0))
         
         elif self.game_state == "MEMORY":
-            # Render memory fragment with a nice background
-            memory_bg = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            memory_bg.fill((20, 20, 40))
-            self.screen.blit(memory_bg, (0, 0))
-            
-            # Draw a decorative frame
-            pygame.draw.rect(self.screen, (100, 100, 180), (50, 50, SCREEN_WIDTH - 100, SCREEN_HEIGHT - 100), 3)
-            
-            # Render the memory content
-            self.memory_manager.render(self.screen)
-            
-            # Display prompt to continue with animation
-            alpha = 128 + int(127 * abs(math.sin(pygame.time.get_ticks() / 500)))
-            continue_text = self.font.render("Press any key to continue...", True, WHITE)
-            self.screen.blit(continue_text, (SCREEN_WIDTH // 2 - continue_text.get_width() // 2, 
-                                           SCREEN_HEIGHT - 80))
+            if self.state_screen_for != "MEMORY":
+                self._compose_memory_screen()
+            self.screen.blit(self.state_screen, (0, 0))
         
         elif self.game_state == "GAME_OVER":
-            # Game over screen with creepy background
-            # Draw background texture first
-            if hasattr(self.world, "background_texture") and self.world.background_texture:
-                bg_width, bg_height = self.world.background_texture.get_size()
-                for x in range(0, SCREEN_WIDTH, bg_width):
-                    for y in range(0, SCREEN_HEIGHT, bg_height):
-                        self.screen.blit(self.world.background_texture, (x, y))
+            if self.state_screen_for != "GAME_OVER":
+                self._compose_game_over_screen()
+            self.screen.blit(self.state_screen, (0, 0))
             
-            # Add red overlay that pulses
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+            # Red overlay pulse, added on top of the pre-darkened background
             pulse = int(40 + 20 * math.sin(pygame.time.get_ticks() / 200))
-            overlay.fill((pulse, 0, 0, 150))
-            self.screen.blit(overlay, (0, 0))
+            self.pulse_layer.fill((pulse * 150 // 255, 0, 0))
+            self.screen.blit(self.pulse_layer, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
             
             # Draw creepy symbols
             for i in range(10):
@@ -396,38 +369,196 @@ class GameEngine:
                 size = 10 + 5 * math.sin(pygame.time.get_ticks() / 500 + i)
                 pygame.draw.circle(self.screen, (200, 0, 0), (int(x), int(y)), int(size))
             
-            # Game over text with shadow and blood effect
-            shadow_text = self.title_font.render("YOU ARE CONSUMED", True, BLACK)
-            self.screen.blit(shadow_text, (SCREEN_WIDTH // 2 - shadow_text.get_width() // 2 + 2, 
-                                         SCREEN_HEIGHT // 2 - 52))
-            
-            game_over_text = self.title_font.render("YOU ARE CONSUMED", True, (200, 0, 0))
-            self.screen.blit(game_over_text, (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, 
-                                            SCREEN_HEIGHT // 2 - 50))
-            
-            # Show score
-            score_text = self.font.render(f"Score: {self.player.score}", True, WHITE)
-            self.screen.blit(score_text, (SCREEN_WIDTH // 2 - score_text.get_width() // 2, 
-                                        SCREEN_HEIGHT // 2))
-            
-            # Restart prompt with animation
-            alpha = 128 + int(127 * abs(math.sin(pygame.time.get_ticks() / 500)))
-            restart_text = self.font.render("Press R to try again", True, WHITE)
-            self.screen.blit(restart_text, (SCREEN_WIDTH // 2 - restart_text.get_width() // 2, 
-                                          SCREEN_HEIGHT // 2 + 60))
+            # Text goes above the symbols
+            for text_surface, pos in self.state_screen_texts:
+                self.screen.blit(text_surface, pos)
         
         # Update the display
         pygame.display.flip()
     
+    def _render_playing(self):
+        """Render the world, player and HUD."""
+        # Light the world from the player and any active echoes
+        self.light_map.clear()
+        self.light_map.add_light(SCREEN_WIDTH // 2 + self.player.width // 2,
+                                 SCREEN_HEIGHT // 2 + self.player.height // 2, PLAYER_LIGHT_RADIUS)
+        for ripple in self.echo_ripples.ripples:
+            self.light_map.add_light(ripple.x - self.camera_x, ripple.y - self.camera_y,
+                                     ECHO_LIGHT_RADIUS, self.echo_ripples.get_intensity(ripple))
+        
+        # Render world with background
+        self.world.render(self.screen, (self.camera_x, self.camera_y), self.light_map)
+                         
+        # Render door indicator
+        self.door_indicator.render(self.screen, (self.camera_x, self.camera_y))
+        
+        # Render turrets and projectiles
+        for turret in self.turrets:
+            turret.render(self.screen, (self.camera_x, self.camera_y))
+        
+        # Render projectiles
+        for proj in self.projectiles:
+            proj.render(self.screen, (self.camera_x, self.camera_y))
+        
+        # Render echo ripples - now used as a "reveal" ability
+        self.echo_ripples.render(self.screen, (self.camera_x, self.camera_y))
+        
+        # Always render player in center of screen
+        self.player.render(self.screen, (self.camera_x, self.camera_y))
+        
+        # Show level info
+        if self.show_tutorial:
+            # Draw semi-transparent background
+            tutorial_bg = pygame.Surface((SCREEN_WIDTH, 120))
+            tutorial_bg.fill((0, 0, 0))
+            tutorial_bg.set_alpha(180)
+            self.screen.blit(tutorial_bg, (0, 0))
+            
+            # Draw level name
+            level_name = self.font.render(f"Level: {self.level_data['name']}", True, (200, 50, 200))
+            self.screen.blit(level_name, (SCREEN_WIDTH // 2 - level_name.get_width() // 2, 20))
+            
+            # Draw tutorial text
+            controls = self.font.render("WASD/Arrows: Move | SPACE: Reveal Spirits", True, WHITE)
+            self.screen.blit(controls, (SCREEN_WIDTH // 2 - controls.get_width() // 2, 50))
+            
+            objective = self.font.render(f"Collect {self.world.ritual_items_required} ritual items to unlock the exit door", True, WHITE)
+            self.screen.blit(objective, (SCREEN_WIDTH // 2 - objective.get_width() // 2, 80))
+        
+        # Draw UI elements - reveal cooldown indicator
+        cooldown_pct = min(1.0, (self.sim_clock.now() - self.player.last_sound_time) / self.player.sound_cooldown)
+        pygame.draw.rect(self.screen, (50, 50, 50), (10, 10, 100, 20))
+        pygame.draw.rect(self.screen, (200, 50, 200), (10, 10, 100 * cooldown_pct, 20))
+        sound_text = self.font.render("Reveal", True, WHITE)
+        self.screen.blit(sound_text, (120, 10))
+        
+        # Draw health bar
+        health_pct = max(0, self.player.health / 100)
+        pygame.draw.rect(self.screen, (50, 50, 50), (10, 40, 100, 20))
+        health_color = (
+            int(255 * (1 - health_pct)),  # Red increases as health decreases
+            int(255 * health_pct),        # Green decreases as health decreases
+            50
+        )
+        pygame.draw.rect(self.screen, health_color, (10, 40, 100 * health_pct, 20))
+        health_text = self.font.render("Health", True, WHITE)
+        self.screen.blit(health_text, (120, 40))
+        
+        # Draw score and ritual item counter
+        score_text = self.font.render(f"Score: {self.player.score}", True, WHITE)
+        self.screen.blit(score_text, (SCREEN_WIDTH - score_text.get_width() - 20, 10))
+        
+        # Draw high score
+        if self.world.highest_score > 0:
+            high_score_text = self.font.render(f"Best: {self.world.highest_score}", True, (200, 200, 100))
+            self.screen.blit(high_score_text, (SCREEN_WIDTH - high_score_text.get_width() - 20, 40))
+        
+        # Draw ritual item counter with icon
+        ritual_bg = pygame.Surface((120, 30), pygame.SRCALPHA)
+        ritual_bg.fill((0, 0, 0, 128))
+        self.screen.blit(ritual_bg, (SCREEN_WIDTH - 140, 70))
+        
+        ritual_text = self.font.render(f"Ritual: {self.world.ritual_items_collected}", True, (200, 50, 200))
+        self.screen.blit(ritual_text, (SCREEN_WIDTH - 135, 75))
+    
+    def _compose_victory_screen(self):
+        """Build the victory screen on top of the current frame."""
+        self.state_screen = self.screen.copy()
+        
+        # Semi-transparent overlay
+        victory_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        victory_overlay.fill((0, 0, 0, 180))
+        self.state_screen.blit(victory_overlay, (0, 0))
+        
+        # Victory message
+        victory_text = self.title_font.render("RITUAL COMPLETE", True, (200, 50, 200))
+        self.state_screen.blit(victory_text, (SCREEN_WIDTH // 2 - victory_text.get_width() // 2, 
+                                              SCREEN_HEIGHT // 2 - 100))
+        
+        # Score display
+        score_text = self.font.render(f"Final Score: {self.player.score}", True, WHITE)
+        self.state_screen.blit(score_text, (SCREEN_WIDTH // 2 - score_text.get_width() // 2, 
+                                            SCREEN_HEIGHT // 2 - 20))
+        
+        # High score display
+        if self.player.score >= self.world.highest_score:
+            high_score_text = self.font.render("NEW HIGH SCORE!", True, (255, 215, 0))
+            self.state_screen.blit(high_score_text, (SCREEN_WIDTH // 2 - high_score_text.get_width() // 2, 
+                                                    SCREEN_HEIGHT // 2 + 20))
+        
+        # Continue prompt
+        continue_text = self.font.render("Press SPACE to play again", True, WHITE)
+        self.state_screen.blit(continue_text, (SCREEN_WIDTH // 2 - continue_text.get_width() // 2, 
+                                               SCREEN_HEIGHT // 2 + 80))
+        
+        self.state_screen_texts = []
+        self.state_screen_for = "VICTORY"
+    
+    def _compose_memory_screen(self):
+        """Build the memory screen; the whole thing is static."""
+        self.state_screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.state_screen.fill((20, 20, 40))
+        
+        # Draw a decorative frame
+        pygame.draw.rect(self.state_screen, (100, 100, 180), (50, 50, SCREEN_WIDTH - 100, SCREEN_HEIGHT - 100), 3)
+        
+        # Render the memory content
+        self.memory_manager.render(self.state_screen)
+        
+        # Display prompt to continue
+        continue_text = self.font.render("Press any key to continue...", True, WHITE)
+        self.state_screen.blit(continue_text, (SCREEN_WIDTH // 2 - continue_text.get_width() // 2, 
+                                               SCREEN_HEIGHT - 80))
+        
+        self.state_screen_texts = []
+        self.state_screen_for = "MEMORY"
+    
+    def _compose_game_over_screen(self):
+        """Build the static background and text of the game over screen."""
+        self.state_screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        
+        # Draw background texture first
+        if hasattr(self.world, "background_texture") and self.world.background_texture:
+            bg_width, bg_height = self.world.background_texture.get_size()
+            for x in range(0, SCREEN_WIDTH, bg_width):
+                for y in range(0, SCREEN_HEIGHT, bg_height):
+                    self.state_screen.blit(self.world.background_texture, (x, y))
+        
+        # Darken it the way the red overlay would; the red pulse is added per frame
+        shade = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        shade.fill((0, 0, 0, 150))
+        self.state_screen.blit(shade, (0, 0))
+        
+        # Game over text with shadow and blood effect
+        shadow_text = self.title_font.render("YOU ARE CONSUMED", True, BLACK)
+        game_over_text = self.title_font.render("YOU ARE CONSUMED", True, (200, 0, 0))
+        score_text = self.font.render(f"Score: {self.player.score}", True, WHITE)
+        restart_text = self.font.render("Press R to try again", True, WHITE)
+        self.state_screen_texts = [
+            (shadow_text, (SCREEN_WIDTH // 2 - shadow_text.get_width() // 2 + 2, SCREEN_HEIGHT // 2 - 52)),
+            (game_over_text, (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, SCREEN_HEIGHT // 2 - 50)),
+            (score_text, (SCREEN_WIDTH // 2 - score_text.get_width() // 2, SCREEN_HEIGHT // 2)),
+            (restart_text, (SCREEN_WIDTH // 2 - restart_text.get_width() // 2, SCREEN_HEIGHT // 2 + 60)),
+        ]
+        self.state_screen_for = "GAME_OVER"
+    
     def run(self):
         """Main game loop."""
         result = None
         
         while self.running:
+            self.frame_started = time.perf_counter()
             self.handle_events()
             self.update()
-            self.render()
-            self.clock.tick(FPS)
+            self.sound_manager.flush()
+            if self.game_state != "PLAYING" or self.sim_clock.frame % max(1, int(self.sim_clock.scale)) == 0:
+                render_started = time.perf_counter()
+                self.render()
+                self.render_time = (time.perf_counter() - render_started) * 1000
+                if self.teleport_arrived is not None:
+                    self.teleport_latencies.append((time.perf_counter() - self.teleport_arrived) * 1000)
+                    self.teleport_arrived = None
+            self.clock.tick(self.sim_clock.frame_rate())
             
             # Check if we need to restart or victory
             if self.game_state == "RESTART":
@@ -436,5 +567,7 @@ class GameEngine:
             elif self.game_state == "VICTORY":
                 result = "VICTORY"
                 self.running = False
-                
+        
+        # This level's fragments are gone, so don't go on loading their narration
+        self.services.narrator.reset()
         return result
\ No newline at end of file
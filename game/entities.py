@@ -0,0 +1,104 @@
+class Position:
+    __slots__ = ("x", "y")
+
+    def __init__(self, x, y):
+        """Top-left world position of a moving entity."""
+        self.x = x
+        self.y = y
+
+class Chase:
+    __slots__ = ("kind", "detection_range", "speed", "target_x", "target_y", "heard_sound")
+
+    def __init__(self, kind, detection_range, speed):
+        """An enemy that goes after the player or sounds.
+
+        kind is its type code and picks the behaviour: wardens (WARDEN) see
+        and hear, phantoms (PHANTOM) only see and crawlers (CRAWLER) only hear.
+        """
+        self.kind = kind
+        self.detection_range = detection_range
+        self.speed = speed
+        self.target_x = 0
+        self.target_y = 0
+        self.heard_sound = False
+
+class Turret:
+    __slots__ = ("detection_range", "fire_cooldown", "loaded")
+
+    def __init__(self, detection_range=250, fire_cooldown=120):
+        """A stationary enemy that fires at the player when in range."""
+        self.detection_range = detection_range
+        self.fire_cooldown = fire_cooldown  # frames
+        self.loaded = True
+
+class Collectable:
+    __slots__ = ("kind", "rect", "collected", "glow", "glow_dir")
+
+    def __init__(self, kind, rect, glow=0):
+        """An item of a type code (such as RITUAL) the player picks up by touching it."""
+        self.kind = kind
+        self.rect = rect
+        self.collected = False
+        self.glow = glow
+        self.glow_dir = 1
+
+class Portal:
+    __slots__ = ("rect", "destination", "active", "is_exit")
+
+    def __init__(self, rect, destination=None, is_exit=False):
+        """A portal to another chunk (destination offset) or the level exit."""
+        self.rect = rect
+        self.destination = destination
+        self.active = True
+        self.is_exit = is_exit
+
+class Renderable:
+    __slots__ = ("kind", "variant")
+
+    def __init__(self, kind, variant=0):
+        """What an entity is drawn as: its type code (see ENTITY_NAMES) and texture variant."""
+        self.kind = kind
+        self.variant = variant
+
+class EntityStore:
+    def __init__(self):
+        """Components of every entity, one table per component type.
+
+        Entities are plain integer ids. Each table maps the ids that have that
+        component to their record, so a system only looks at the entities
+        that have the components it works on.
+        """
+        self.next_id = 0
+        self.tables = {}
+
+    def create(self, *components):
+        """Create an entity with the given components and return its id."""
+        entity = self.next_id
+        self.next_id += 1
+        for component in components:
+            self.table(type(component))[entity] = component
+        return entity
+
+    def table(self, component_type):
+        """Return the id -> component table of a component type."""
+        table = self.tables.get(component_type)
+        if table is None:
+            table = self.tables[component_type] = {}
+        return table
+
+    def get(self, entity, component_type):
+        """Return an entity's component of a type, or None if it has none."""
+        return self.table(component_type).get(entity)
+
+    def remove(self, entity):
+        """Delete an entity and all its components."""
+        for table in self.tables.values():
+            table.pop(entity, None)
+
+    def query(self, entities, *component_types):
+        """Yield (entity, component, ...) for the entities that have all the types."""
+        tables = [self.table(component_type) for component_type in component_types]
+        for entity in entities:
+            components = [table.get(entity) for table in tables]
+            if None not in components:
+                yield (entity, *components)
@@ -0,0 +1,42 @@
+import unittest
+
+from game.entities import EntityStore, Position, Chase, Turret, Renderable
+from game.constants import *
+
+class EntityStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.store = EntityStore()
+        self.warden = self.store.create(Position(1, 2), Chase(WARDEN, 200, 1.5), Renderable(WARDEN))
+        self.turret = self.store.create(Position(3, 4), Turret(), Renderable(TURRET))
+
+    def test_ids_are_unique(self):
+        self.assertNotEqual(self.warden, self.turret)
+        self.assertNotEqual(self.store.create(), self.turret)
+
+    def test_get_component(self):
+        self.assertEqual(self.store.get(self.warden, Position).y, 2)
+        self.assertIsNone(self.store.get(self.warden, Turret))
+
+    def test_tables_hold_only_entities_with_the_component(self):
+        self.assertEqual(set(self.store.table(Position)), {self.warden, self.turret})
+        self.assertEqual(set(self.store.table(Chase)), {self.warden})
+
+    def test_query_yields_entities_with_every_type(self):
+        entities = [self.warden, self.turret]
+        found = list(self.store.query(entities, Position, Chase))
+        self.assertEqual(len(found), 1)
+        entity, position, chase = found[0]
+        self.assertEqual(entity, self.warden)
+        self.assertEqual((position.x, chase.kind), (1, WARDEN))
+
+    def test_query_only_looks_at_given_entities(self):
+        self.assertEqual(list(self.store.query([self.turret], Chase)), [])
+
+    def test_remove_drops_every_component(self):
+        self.store.remove(self.warden)
+        self.assertIsNone(self.store.get(self.warden, Position))
+        self.assertIsNone(self.store.get(self.warden, Chase))
+        self.assertIsNotNone(self.store.get(self.turret, Position))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import math
+import numpy as np
+from .occupancy import stitch_grids, grid_distances, UNREACHED
+from .constants import *
+
+# Neighbour offsets (dx, dy) and the unit direction toward each of them
+NEIGHBOURS = [(-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1)]
+NEIGHBOUR_DIRECTIONS = np.array([(dx / math.hypot(dx, dy), dy / math.hypot(dx, dy)) for dx, dy in NEIGHBOURS],
+                                dtype=np.float32)
+
+class FlowField:
+    def __init__(self, world, radius=FLOW_FIELD_RADIUS):
+        """Shared direction field leading every chaser toward one target.
+
+        A breadth-first search from the target's grid cell runs over the
+        occupancy grids around it. It is only redone when the target moves to
+        another cell or new chunks (and so new obstacles) appear, and every
+        chaser then reads its direction with a single lookup.
+        """
+        self.world = world
+        self.radius = radius
+        self.target_cell = None
+        self.grid_version = None
+        self.grid_origin = (0, 0)
+        self.dir_x = np.zeros((0, 0), dtype=np.float32)
+        self.dir_y = np.zeros((0, 0), dtype=np.float32)
+        self.rebuilds = 0
+
+    def update(self, target_pos):
+        """Rebuild the field if the target changed cell or the obstacles changed."""
+        target_cell = (int(target_pos[0] // GRID_CELL_SIZE), int(target_pos[1] // GRID_CELL_SIZE))
+        if target_cell == self.target_cell and self.world.grid_version == self.grid_version:
+            return False
+
+        self.target_cell = target_cell
+        self.grid_version = self.world.grid_version
+        self._build(target_pos)
+        self.rebuilds += 1
+        return True
+
+    def cells_behind(self, target_pos):
+        """Return how many cells a position is from the cell the field leads to, or None if it was never built."""
+        if self.target_cell is None:
+            return None
+        return max(abs(int(target_pos[0] // GRID_CELL_SIZE) - self.target_cell[0]),
+                   abs(int(target_pos[1] // GRID_CELL_SIZE) - self.target_cell[1]))
+
+    def _build(self, target_pos):
+        materials, self.grid_origin = stitch_grids(self.world.chunks, self.world.chunk_size,
+                                                   target_pos[0] - self.radius, target_pos[1] - self.radius,
+                                                   target_pos[0] + self.radius, target_pos[1] + self.radius)
+        height, width = materials.shape
+
+        # Steps from every free cell to the target's cell
+        start = (self.target_cell[0] - self.grid_origin[0] // GRID_CELL_SIZE,
+                 self.target_cell[1] - self.grid_origin[1] // GRID_CELL_SIZE)
+        distance = grid_distances(materials == 0, start)
+
+        # Point every cell at its closest neighbour. A diagonal step is only
+        # allowed when both cells beside it are free, so chasers don't cut
+        # through the corner between two obstacles
+        padded = np.pad(distance, 1, constant_values=UNREACHED)
+        blocked = np.pad(materials != 0, 1, constant_values=True)
+        neighbours = np.stack([padded[1 + dy:1 + dy + height, 1 + dx:1 + dx + width] for dx, dy in NEIGHBOURS])
+        for i, (dx, dy) in enumerate(NEIGHBOURS):
+            if dx and dy:
+                corner = blocked[1:1 + height, 1 + dx:1 + dx + width] | blocked[1 + dy:1 + dy + height, 1:1 + width]
+                neighbours[i][corner] = UNREACHED
+        best = neighbours.argmin(axis=0)
+        downhill = np.take_along_axis(neighbours, best[None], axis=0)[0] < distance
+
+        self.dir_x = np.where(downhill, NEIGHBOUR_DIRECTIONS[best, 0], 0).astype(np.float32)
+        self.dir_y = np.where(downhill, NEIGHBOUR_DIRECTIONS[best, 1], 0).astype(np.float32)
+
+    def leads_to(self, world_x, world_y):
+        """Check if a world position is in the cell the field leads to."""
+        return (int(world_x // GRID_CELL_SIZE), int(world_y // GRID_CELL_SIZE)) == self.target_cell
+
+    def get_direction(self, world_x, world_y):
+        """Return the unit direction toward the target, or None.
+
+        None means the position is outside the field, unreachable or already
+        in the target's cell; callers should then head straight for the target.
+        """
+        cell_x = int(world_x - self.grid_origin[0]) // GRID_CELL_SIZE
+        cell_y = int(world_y - self.grid_origin[1]) // GRID_CELL_SIZE
+        if not (0 <= cell_y < self.dir_x.shape[0] and 0 <= cell_x < self.dir_x.shape[1]):
+            return None
+        dx = self.dir_x[cell_y, cell_x]
+        dy = self.dir_y[cell_y, cell_x]
+        if dx == 0 and dy == 0:
+            return None
+        return float(dx), float(dy)
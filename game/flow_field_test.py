@@ -0,0 +1,66 @@
+import os
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from game.flow_field import FlowField
+from game.test_support import GridWorld
+from game.constants import *
+
+def cell_centre(cell_x, cell_y):
+    return (cell_x * GRID_CELL_SIZE + GRID_CELL_SIZE / 2, cell_y * GRID_CELL_SIZE + GRID_CELL_SIZE / 2)
+
+class FlowFieldTest(unittest.TestCase):
+    def setUp(self):
+        self.world = GridWorld()
+        self.grid = self.world.chunks[(0, 0)].grid
+        self.field = FlowField(self.world, radius=400)
+
+    def test_open_space_points_toward_target(self):
+        self.field.update(cell_centre(10, 10))
+        dx, dy = self.field.get_direction(*cell_centre(5, 10))
+        self.assertGreater(dx, 0)
+        self.assertAlmostEqual(dy, 0)
+        dx, dy = self.field.get_direction(*cell_centre(10, 14))
+        self.assertAlmostEqual(dx, 0)
+        self.assertLess(dy, 0)
+
+    def test_no_direction_in_target_cell(self):
+        self.field.update(cell_centre(10, 10))
+        self.assertIsNone(self.field.get_direction(*cell_centre(10, 10)))
+        self.assertTrue(self.field.leads_to(*cell_centre(10, 10)))
+        self.assertFalse(self.field.leads_to(*cell_centre(11, 10)))
+
+    def test_goes_around_a_wall(self):
+        # Wall between the chaser and the target with a gap at the bottom
+        self.grid[5:15, 10] = SURFACE_CODES["stone"]
+        self.field.update(cell_centre(12, 8))
+        x, y = cell_centre(8, 8)
+        for _ in range(40):
+            direction = self.field.get_direction(x, y)
+            if direction is None:
+                break
+            x += direction[0] * GRID_CELL_SIZE / 2
+            y += direction[1] * GRID_CELL_SIZE / 2
+            self.assertEqual(self.grid[int(y // GRID_CELL_SIZE), int(x // GRID_CELL_SIZE)], 0)
+        self.assertTrue(self.field.leads_to(x, y))
+
+    def test_no_diagonal_through_a_blocked_corner(self):
+        # Target diagonally up-right of the chaser, past the corner of two obstacles
+        self.grid[9, 10] = SURFACE_CODES["wood"]
+        self.grid[10, 11] = SURFACE_CODES["wood"]
+        self.field.update(cell_centre(11, 9))
+        dx, dy = self.field.get_direction(*cell_centre(10, 10))
+        self.assertFalse(dx > 0 and dy < 0)
+
+    def test_rebuilds_only_on_cell_or_grid_change(self):
+        self.assertTrue(self.field.update(cell_centre(10, 10)))
+        self.assertFalse(self.field.update((510, 520)))
+        self.assertTrue(self.field.update(cell_centre(11, 10)))
+        self.world.grid_version += 1
+        self.assertTrue(self.field.update(cell_centre(11, 10)))
+        self.assertEqual(self.field.rebuilds, 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+import os
+import random
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import math
+import pygame
+from game.infinite_world_updated import Chunk, InfiniteWorld
+from game.entities import Portal
+from game.level import Surface
+from game.constants import *
+
+class ChunkPlacementTest(unittest.TestCase):
+    def test_free_position_avoids_obstacles(self):
+        random.seed(3)
+        chunk = Chunk(1, 2)
+        chunk.obstacles.append(Surface(pygame.Rect(1000, 2000, 500, 1000), "stone"))
+        for _ in range(50):
+            position = chunk._random_free_position(100, 32)
+            if position is not None:
+                self.assertFalse(chunk.obstacles[0].rect.colliderect((*position, 32, 32)))
+
+    def test_no_free_position_in_a_full_chunk(self):
+        chunk = Chunk(0, 0)
+        chunk.obstacles.append(Surface(pygame.Rect(0, 0, 1000, 1000), "wood"))
+        self.assertIsNone(chunk._random_free_position(100, 32))
+
+    def test_full_chunk_generates_no_overlapping_content(self):
+        random.seed(5)
+        chunk = Chunk(0, 0)
+        chunk.obstacles.append(Surface(pygame.Rect(0, 0, 1000, 1000), "wood"))
+        chunk.generate_content()
+        self.assertEqual(chunk.collectables, [])
+        self.assertEqual(chunk.enemies, [])
+
+class InfiniteWorldTest(unittest.TestCase):
+    def make_world(self, seed):
+        pygame.init()
+        random.seed(seed)
+        world = InfiniteWorld(None)
+        world.update_active_chunks((SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+        world.scheduler.run(math.inf)
+        world.sim_clock.advance(3000)
+        return world
+
+    def lists_holding(self, world, entity):
+        """(chunk key, list name) of every enemy list the entity is in, once per entry."""
+        return [(key, name) for key, chunk in world.chunks.items()
+                for name in ("enemies", "sleeping") for held in getattr(chunk, name) if held == entity]
+
+    def test_exit_door_goes_next_to_the_player(self):
+        chunks = set()
+        for seed in range(12):
+            world = self.make_world(seed)
+            world.ritual_items_collected = world.ritual_items_required
+            world.update_active_chunks((SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+            exits = [key for key, chunk in world.chunks.items()
+                     if any(portal.is_exit for _, portal in world.entities.query(chunk.portals, Portal))]
+            self.assertEqual(len(exits), 1)
+            self.assertEqual(max(abs(exits[0][0]), abs(exits[0][1])), 1)
+            chunks.add(exits[0])
+        self.assertGreater(len(chunks), 1)
+
+    def test_exit_door_prefers_chunks_not_generated_yet(self):
+        world = self.make_world(1)
+        for key in [(-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1)]:
+            world.get_or_create_chunk(*key)
+        world.chunks.pop((1, 1), None)
+        self.assertEqual(world._exit_door_chunk(0, 0), (1, 1))
+
+    def test_queued_chunks_are_dropped_when_the_player_leaves(self):
+        world = self.make_world(2)
+        world._prefetch_portal_destinations = lambda: None
+        world.update_active_chunks((20000, 300))
+        self.assertTrue(world.scheduler.is_queued(("chunk", (22, 0))))
+        world.update_active_chunks((-20000, 300))
+        self.assertFalse(world.scheduler.is_queued(("chunk", (22, 0))))
+        self.assertGreater(world.scheduler.report()["jobs_cancelled"], 0)
+
+    def test_teleport_lands_on_a_prefetched_flow_field(self):
+        world = self.make_world(1)
+        portal = next(portal for chunk in world.active_chunks
+                      for _, portal in world.entities.query(chunk.portals, Portal) if portal.destination)
+        world.update_active_chunks(portal.rect.topleft)
+        world.update_enemies(portal.rect.topleft)
+        world.scheduler.run(math.inf)
+
+        x = portal.rect.x + portal.destination[0] * world.chunk_size
+        y = portal.rect.y + portal.destination[1] * world.chunk_size
+        world.update_active_chunks((x, y))
+        field = world.flow_field
+        world.update_enemies((x, y))
+        self.assertIsNot(world.flow_field, field)
+        self.assertLessEqual(world.flow_field.cells_behind((x + 16, y + 16)), FLOW_FIELD_SLACK)
+        self.assertEqual(world.flow_field.rebuilds, 1)
+
+    def test_settling_puts_far_idle_enemies_to_sleep(self):
+        world = self.make_world(4)
+        world.update_active_chunks((30000, 30000))
+        chunk = next(chunk for chunk in world.chunks.values() if chunk.enemies and (chunk.x, chunk.y) != (30, 30))
+        enemies = chunk.enemies + chunk.sleeping
+        world._settle_enemies((chunk.x, chunk.y), (30000, 30000))
+        self.assertEqual(chunk.enemies, [])
+        self.assertEqual(sorted(chunk.sleeping), sorted(enemies))
+
+    def test_chaser_that_crosses_into_another_chunk_is_moved_there(self):
+        world = self.make_world(3)
+        size = world.chunk_size
+        player = (size + 60, 484)
+        world.update_active_chunks(player)
+
+        # Listed in the chunk it spawned in, but its centre is past the edge
+        warden = world.chunks[(0, 0)].create_enemy(WARDEN, size - 10, 500)
+        world.update_enemies(player)
+        self.assertEqual(self.lists_holding(world, warden), [((1, 0), "enemies")])
+
+        world.update_enemies(player)
+        self.assertEqual(self.lists_holding(world, warden), [((1, 0), "enemies")])
+
+    def test_idle_chaser_far_off_in_another_chunk_sleeps_there(self):
+        world = self.make_world(3)
+        size = world.chunk_size
+        warden = world.chunks[(0, 0)].create_enemy(WARDEN, size + 500, size + 500)
+        world.update_enemies((400, 300))
+        self.assertEqual(self.lists_holding(world, warden), [((1, 1), "sleeping")])
+
+    def test_sleeper_wakes_when_the_player_comes_near(self):
+        world = self.make_world(4)
+        chunk = world.chunks[(0, 0)]
+        warden = chunk.create_enemy(WARDEN, 900, 900)
+        chunk.enemies.remove(warden)
+        chunk.sleeping.append(warden)
+
+        world.update_enemies((100, 100))
+        self.assertEqual(self.lists_holding(world, warden), [((0, 0), "sleeping")])
+
+        # Just inside the wake distance, but out of the warden's sight
+        world.update_enemies((900 - ENEMY_WAKE_DISTANCE + 10, 900))
+        self.assertEqual(self.lists_holding(world, warden), [((0, 0), "enemies")])
+
+    def test_sleeper_wakes_when_it_hears_a_sound(self):
+        world = self.make_world(4)
+        chunk = world.chunks[(0, 0)]
+        warden = chunk.create_enemy(WARDEN, 900, 900)
+        chunk.enemies.remove(warden)
+        chunk.sleeping.append(warden)
+
+        world.sounds.emit("echo", (916, 916))
+        world.update_enemies((100, 100))
+        self.assertEqual(self.lists_holding(world, warden), [((0, 0), "enemies")])
+
+    def test_far_idle_enemy_falls_asleep(self):
+        world = self.make_world(4)
+        chunk = world.chunks[(0, 0)]
+        near = chunk.create_enemy(WARDEN, 100 + ENEMY_SLEEP_DISTANCE - 100, 100)
+        far = chunk.create_enemy(WARDEN, 900, 900)
+
+        world.update_enemies((100, 100))
+        self.assertEqual(self.lists_holding(world, near), [((0, 0), "enemies")])
+        self.assertEqual(self.lists_holding(world, far), [((0, 0), "sleeping")])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,102 +1,208 @@
 import pygame
+import pygame.gfxdraw
 import random
 import math
 import os
+import numpy as np
+from .level import Surface, MemoryFragment
+from .echo_propagation import EchoPropagator, MATERIAL_COLORS
+from .flow_field import FlowField
+from .sound_propagation import SoundPropagation
+from .patrol import Patrol
+from .entities import EntityStore, Position, Chase, Turret, Collectable, Portal, Renderable
+from .sim_clock import SimClock
+from .work_scheduler import WorkScheduler
 from .constants import *
 
 class Chunk:
-    def __init__(self, x, y, chunk_size=1000):
+    __slots__ = ("x", "y", "chunk_size", "entities", "collectables", "enemies", "sleeping", "portals",
+                 "obstacles", "memory_fragments", "generated", "grid_size", "grid", "bounds")
+    
+    def __init__(self, x, y, chunk_size=1000, entities=None):
         self.x = x
         self.y = y
         self.chunk_size = chunk_size
+        self.entities = entities or EntityStore()  # Shared with the world and its other chunks
+        
+        # Ids of the entities in this chunk
         self.collectables = []
         self.enemies = []
+        self.sleeping = []  # Idle enemies skipped by update_enemies until woken
+        self.portals = []
+        
         self.obstacles = []
         self.memory_fragments = []
-        self.portals = []
         self.generated = False
         
+        # Material code per grid cell (0 = empty), see SURFACE_CODES
+        self.grid_size = chunk_size // GRID_CELL_SIZE
+        self.grid = np.zeros((self.grid_size, self.grid_size), dtype=np.uint8)
+        
+        # World area covered by the chunk
+        self.bounds = pygame.Rect(x * chunk_size, y * chunk_size, chunk_size, chunk_size)
+        
     def get_world_position(self):
         return (self.x * self.chunk_size, self.y * self.chunk_size)
+    
+    def is_blocked(self, world_x, world_y):
+        """Check if a world position inside this chunk is occupied by an obstacle"""
+        cell_x = int(world_x - self.x * self.chunk_size) // GRID_CELL_SIZE
+        cell_y = int(world_y - self.y * self.chunk_size) // GRID_CELL_SIZE
+        if 0 <= cell_x < self.grid_size and 0 <= cell_y < self.grid_size:
+            return self.grid[cell_y, cell_x] != 0
+        return False
+    
+    def _random_free_position(self, margin, size, attempts=10):
+        """Pick a random position for a size x size object that avoids obstacles, or None if none was found"""
+        world_x, world_y = self.get_world_position()
+        for _ in range(attempts):
+            x = world_x + random.randint(margin, self.chunk_size - margin)
+            y = world_y + random.randint(margin, self.chunk_size - margin)
+            if not any(obstacle.rect.colliderect((x, y, size, size)) for obstacle in self.obstacles):
+                return x, y
+        return None
+    
+    def _generate_obstacles(self, keep_clear):
+        """Place grid-aligned surfaces of random materials and fill the grid"""
+        world_x, world_y = self.get_world_position()
+        num_obstacles = random.randint(2, 5)
+        for i in range(num_obstacles):
+            width = random.randint(1, 4)
+            height = random.randint(1, 4)
+            cell_x = random.randint(1, self.grid_size - width - 1)
+            cell_y = random.randint(1, self.grid_size - height - 1)
+            rect = pygame.Rect(world_x + cell_x * GRID_CELL_SIZE, world_y + cell_y * GRID_CELL_SIZE,
+                               width * GRID_CELL_SIZE, height * GRID_CELL_SIZE)
+            if rect.collidelist(keep_clear) != -1:
+                continue
+            
+            surface_type = random.choice(list(SURFACE_TYPES))
+            self.obstacles.append(Surface(rect, surface_type))
+            self.grid[cell_y:cell_y + height, cell_x:cell_x + width] = SURFACE_CODES[surface_type]
+        
+    def add_exit_door(self):
+        """Put the exit door in the middle of an already generated chunk, clearing obstacles under it"""
+        world_x, world_y = self.get_world_position()
+        door = pygame.Rect(world_x + self.chunk_size // 2, world_y + self.chunk_size // 2, 80, 80)
+        for obstacle in [obstacle for obstacle in self.obstacles if obstacle.rect.colliderect(door)]:
+            self.obstacles.remove(obstacle)
+            rect = obstacle.rect.move(-world_x, -world_y)
+            self.grid[rect.top // GRID_CELL_SIZE:rect.bottom // GRID_CELL_SIZE,
+                      rect.left // GRID_CELL_SIZE:rect.right // GRID_CELL_SIZE] = 0
+        self.portals.append(self.entities.create(Portal(door, is_exit=True)))
+    
+    def create_enemy(self, enemy_type, x, y, warden_speed=1.5):
+        """Create an enemy entity with all the components its type needs"""
+        components = [Position(x, y), Renderable(enemy_type, random.randint(0, 2))]  # Random variant for warden
+        if enemy_type == WARDEN:
+            components.append(Chase(WARDEN, 200, warden_speed))
+        elif enemy_type == PHANTOM:
+            components.append(Chase(PHANTOM, 150, 1.2))
+            components.append(self._clear_patrol(x, y, 50, 1 / 5000))
+        elif enemy_type == CRAWLER:
+            components.append(Chase(CRAWLER, 100, 0.8))
+            components.append(self._clear_patrol(x, y, 30, 1 / 4000, random.randint(0, 99)))
+        else:
+            components.append(Turret())
+        
+        enemy = self.entities.create(*components)
+        self.enemies.append(enemy)
+        return enemy
+    
+    def _clear_patrol(self, x, y, radius, angular_speed, phase=0.0):
+        """A patrol around (x, y) whose orbit is shrunk until it keeps clear of the obstacles
         
-    def generate_content(self, difficulty=1.0, is_exit_chunk=False):
+        The orbit is a pure function of time, so it can't stop at a wall;
+        instead it is made small enough never to reach one.
+        """
+        walls = [obstacle.rect for obstacle in self.obstacles]
+        while True:
+            patrol = Patrol(x, y, radius, angular_speed, phase)
+            if radius <= 0 or patrol.area.collidelist(walls) == -1:
+                return patrol
+            radius -= 10
+    
+    def generate_content(self, difficulty=1.0, is_exit_chunk=False, keep_clear=(), warden_speed=1.5):
         """Generate random content for this chunk based on difficulty"""
         if self.generated:
             return
             
         world_x, world_y = self.get_world_position()
         
+        # Exit door sits in the middle of the chunk, so keep it clear of obstacles
+        keep_clear = list(keep_clear)
+        if is_exit_chunk:
+            keep_clear.append(pygame.Rect(world_x + self.chunk_size // 2, world_y + self.chunk_size // 2, 80, 80))
+        self._generate_obstacles(keep_clear)
+        
         # Generate collectables (ritual items)
         num_collectables = random.randint(1, 3)
         for i in range(num_collectables):
-            x = world_x + random.randint(100, self.chunk_size - 100)
-            y = world_y + random.randint(100, self.chunk_size - 100)
-            self.collectables.append({
-                "type": "ritual",
-                "rect": pygame.Rect(x, y, 32, 32),
-                "collected": False,
-                "glow": random.randint(0, 50),
-                "glow_dir": 1,
-                "variant": random.randint(0, 2)  # Random variant for different textures
-            })
+            position = self._random_free_position(100, 32)
+            if position is None:
+                continue
+            x, y = position
+            self.collectables.append(self.entities.create(
+                Collectable(RITUAL, pygame.Rect(x, y, 32, 32), random.randint(0, 50)),
+                Renderable(RITUAL, random.randint(0, 2))  # Random variant for different textures
+            ))
         
         # Generate enemies based on difficulty
         num_enemies = int(1 + difficulty)
         for i in range(num_enemies):
             # Add turret enemies with 20% chance
             if random.random() < 0.2:
-                enemy_type = "turret"
+                enemy_type = TURRET
             else:
-                enemy_type = random.choice(["crawler", "phantom", "warden"])
+                enemy_type = random.choice([CRAWLER, PHANTOM, WARDEN])
                 
-            x = world_x + random.randint(100, self.chunk_size - 100)
-            y = world_y + random.randint(100, self.chunk_size - 100)
-            patrol_radius = random.randint(80, 150)
-            
-            self.enemies.append({
-                "type": enemy_type,
-                "x": x,
-                "y": y,
-                "patrol_radius": patrol_radius,
-                "start_x": x,
-                "start_y": y,
-                "variant": random.randint(0, 2),  # Random variant for warden
-                "prev_x": x,
-                "prev_y": y,
-                "fire_cooldown": 120,  # For turrets
-                "cooldown_timer": 0     # For turrets
-            })
+            position = self._random_free_position(100, 32)
+            if position is not None:
+                self.create_enemy(enemy_type, *position, warden_speed)
         
         # Generate exit door if this is the exit chunk
         if is_exit_chunk:
             door_x = world_x + self.chunk_size // 2
             door_y = world_y + self.chunk_size // 2
-            self.portals.append({
-                "rect": pygame.Rect(door_x, door_y, 80, 80),
-                "destination": None,  # None means it's an exit door
-                "active": True,
-                "is_exit": True
-            })
+            self.portals.append(self.entities.create(
+                Portal(pygame.Rect(door_x, door_y, 80, 80), is_exit=True)
+            ))
         # Generate special features
         elif random.random() < 0.3:  # 30% chance for a portal
-            x = world_x + random.randint(200, self.chunk_size - 200)
-            y = world_y + random.randint(200, self.chunk_size - 200)
-            self.portals.append({
-                "rect": pygame.Rect(x, y, 60, 60),
-                "destination": (random.randint(-5, 5), random.randint(-5, 5)),
-                "active": True,
-                "is_exit": False
-            })
+            position = self._random_free_position(200, 60)
+            if position is not None:
+                self.portals.append(self.entities.create(
+                    Portal(pygame.Rect(*position, 60, 60), (random.randint(-5, 5), random.randint(-5, 5)))
+                ))
+        
+        # Now and then a memory fragment (its text and narration come from
+        # the MemoryFragmentManager)
+        if random.random() < MEMORY_FRAGMENT_CHANCE:
+            position = self._random_free_position(100, 20)
+            if position is not None:
+                self.memory_fragments.append(MemoryFragment(*position, random.choice(MEMORY_TYPES), None))
         
         self.generated = True
 
 class InfiniteWorld:
-    def __init__(self, sound_manager, warden_speed=1.5, ritual_items_required=5, enemy_count=4):
+    def __init__(self, sound_manager, warden_speed=1.5, ritual_items_required=5, enemy_count=4, sim_clock=None,
+                 generation_distance=2, simulation_distance=1, scheduler=None, textures=None):
         self.chunks = {}  # Dictionary of chunks indexed by (x,y) coordinates
-        self.active_chunks = []  # List of currently active chunks
+        self.loaded_chunks = []  # Chunks generated ahead of the player
+        self.active_chunks = []  # Chunks whose enemies and items are simulated
+        self.visible_chunks = []  # Chunks that can show up on screen
         self.sound_manager = sound_manager
         self.chunk_size = 1000
-        self.view_distance = 2  # How many chunks to load in each direction
+        
+        # How many chunks around the player's to generate, to simulate and to
+        # draw. Drawing only needs the chunks half a screen (plus enemies
+        # reaching out of their chunk) away, and generating covers whichever
+        # reaches furthest. Chunks simulated or drawn are generated as soon as
+        # they are needed, the rest of the generation radius in the background
+        self.simulation_distance = simulation_distance
+        self.render_distance = math.ceil((max(SCREEN_WIDTH, SCREEN_HEIGHT) / 2 + ENEMY_RENDER_MARGIN) /
+                                         self.chunk_size)
+        self.generation_distance = max(generation_distance, simulation_distance, self.render_distance)
         self.ritual_items_collected = 0
         self.ritual_items_required = ritual_items_required
         self.enemy_count = enemy_count
@@ -104,9 +210,39 @@ class InfiniteWorld:
         self.difficulty = 1.0
         self.warden_speed = warden_speed  # Configurable warden speed
         self.exit_door_created = False
+        self.prefetched_portals = {}  # Portal -> landing chunk of portals whose destination is being generated ahead
+        self.landing_fields = {}  # Portal -> flow field already leading to where it lands
+        self.player_chunk = None
+        
+        # Game time, advanced by whoever owns the clock (the engine)
+        self.sim_clock = sim_clock or SimClock()
+        
+        # Deferred work such as generating chunks ahead of the player, run a
+        # little every frame by whoever owns the scheduler (the engine)
+        self.scheduler = scheduler or WorkScheduler(FRAME_WORK_BUDGET)
+        
+        # Components of every item, enemy and portal; chunks hold their ids
+        self.entities = EntityStore()
+        self.fired_shots = []  # (x, y, target_x, target_y) of turret shots this tick
+        
+        # Area around the player's spawn point that obstacles must not cover
+        self.spawn_area = pygame.Rect(SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 - 100, 232, 232)
         
-        # Create textures
-        self._create_textures()
+        # Echo propagation, chaser pathfinding and sound propagation over the
+        # chunk occupancy grids (grid_version changes whenever a chunk, and so
+        # its obstacles, is added)
+        self.grid_version = 0
+        self.echo = EchoPropagator(self.chunks, self.chunk_size)
+        self.flow_field = FlowField(self)
+        self.flow_target = None  # Where the flow field should lead once it is next rebuilt
+        self.sounds = SoundPropagation(self)
+        
+        # Create textures, or reuse those of an earlier world (see textures())
+        if textures is None:
+            self._create_textures()
+        else:
+            for name, texture in textures.items():
+                setattr(self, name, texture)
         
         # Create the starting chunk
         self.get_or_create_chunk(0, 0)
@@ -168,10 +304,10 @@ class InfiniteWorld:
         
         # Enemy textures with variations
         self.enemy_textures = {
-            "warden": [self._create_warden_texture(i) for i in range(3)],
-            "crawler": self._create_crawler_texture(),
-            "phantom": self._create_phantom_texture(),
-            "turret": self._create_turret_texture()
+            WARDEN: [self._create_warden_texture(i) for i in range(3)],
+            CRAWLER: self._create_crawler_texture(),
+            PHANTOM: self._create_phantom_texture(),
+            TURRET: self._create_turret_texture()
         }
         
         # Background texture
@@ -181,6 +317,19 @@ class InfiniteWorld:
             x, y = random.randint(0, 63), random.randint(0, 63)
             pygame.draw.circle(self.background_texture, (20, 10, 30), (x, y), random.randint(1, 3))
     
+    @classmethod
+    def create_textures(cls):
+        """Create the textures a world draws with, by attribute name, without making a world"""
+        painter = cls.__new__(cls)
+        painter._create_textures()
+        return painter.textures()
+    
+    def textures(self):
+        """Return the world's textures by attribute name, to hand to the next world."""
+        return {name: getattr(self, name) for name in ("ritual_textures", "portal_texture", "exit_door_texture",
+                                                       "exit_door_active_glow", "enemy_textures",
+                                                       "background_texture")}
+    
     def _create_warden_texture(self, variant=0):
         texture = pygame.Surface((32, 32), pygame.SRCALPHA)
         
@@ -246,181 +395,605 @@ class InfiniteWorld:
         """Get an existing chunk or create a new one"""
         chunk_key = (chunk_x, chunk_y)
         if chunk_key not in self.chunks:
-            self.chunks[chunk_key] = Chunk(chunk_x, chunk_y, self.chunk_size)
-            self.chunks[chunk_key].generate_content(self.difficulty, is_exit)
+            self.chunks[chunk_key] = Chunk(chunk_x, chunk_y, self.chunk_size, self.entities)
+            self.chunks[chunk_key].generate_content(self.difficulty, is_exit, [self.spawn_area], self.warden_speed)
+            self.grid_version += 1
         return self.chunks[chunk_key]
     
+    def emit_echo(self, origin):
+        """Send an echo out from a world position through the occupancy grids"""
+        return self.echo.emit(origin)
+    
+    def is_blocked(self, world_x, world_y):
+        """Check if a world position is inside an obstacle"""
+        chunk = self.chunks.get((int(world_x // self.chunk_size), int(world_y // self.chunk_size)))
+        return chunk is not None and chunk.is_blocked(world_x, world_y)
+    
+    def check_obstacle_collision(self, rect):
+        """Check if a rect (no larger than a grid cell) overlaps an obstacle"""
+        return (self.is_blocked(rect.left, rect.top) or
+                self.is_blocked(rect.right - 1, rect.top) or
+                self.is_blocked(rect.left, rect.bottom - 1) or
+                self.is_blocked(rect.right - 1, rect.bottom - 1))
+    
     def update_active_chunks(self, player_pos):
-        """Update which chunks are active based on player position"""
+        """Update which chunks are loaded, simulated and drawn based on player position"""
         player_chunk_x = int(player_pos[0] // self.chunk_size)
         player_chunk_y = int(player_pos[1] // self.chunk_size)
         
+        # Create exit door when player has collected half the required items,
+        # in a chunk that's not the current one but next to it
+        if not self.exit_door_created and self.ritual_items_collected >= self.ritual_items_required // 2:
+            self._place_exit_door(*self._exit_door_chunk(player_chunk_x, player_chunk_y))
+        
+        moved = (player_chunk_x, player_chunk_y) != self.player_chunk
+        self.player_chunk = (player_chunk_x, player_chunk_y)
+        was_active = self.active_chunks
+        
+        self.loaded_chunks = []
         self.active_chunks = []
-        for x in range(player_chunk_x - self.view_distance, player_chunk_x + self.view_distance + 1):
-            for y in range(player_chunk_y - self.view_distance, player_chunk_y + self.view_distance + 1):
-                # Check if this should be the exit chunk
-                is_exit = False
-                if not self.exit_door_created and self.ritual_items_collected >= self.ritual_items_required // 2:
-                    # Create exit door when player has collected half the required items
-                    # Place it in a chunk that's not the current one but within view distance
-                    if (x != player_chunk_x or y != player_chunk_y) and \
-                       abs(x - player_chunk_x) <= 1 and abs(y - player_chunk_y) <= 1:
-                        is_exit = True
-                        self.exit_door_created = True
+        self.visible_chunks = []
+        for x in range(player_chunk_x - self.generation_distance, player_chunk_x + self.generation_distance + 1):
+            for y in range(player_chunk_y - self.generation_distance, player_chunk_y + self.generation_distance + 1):
+                distance = max(abs(x - player_chunk_x), abs(y - player_chunk_y))
+                key = (x, y)
+                if distance <= self.simulation_distance or distance <= self.render_distance:
+                    chunk = self._require_chunk(x, y)
+                else:
+                    # Nearer chunks first, when a frame has time to spare
+                    chunk = self.chunks.get(key)
+                    if chunk is None:
+                        self.scheduler.submit(distance, ("chunk", key), self.get_or_create_chunk, x, y)
+                        continue
+                self.loaded_chunks.append(chunk)
                 
-                chunk = self.get_or_create_chunk(x, y, is_exit)
-                self.active_chunks.append(chunk)
+                if distance <= self.simulation_distance:
+                    self.active_chunks.append(chunk)
+                if distance <= self.render_distance:
+                    self.visible_chunks.append(chunk)
+        
+        if moved:
+            self._drop_distant_work(player_chunk_x, player_chunk_y, was_active)
+            self._settle_left_chunks(was_active, player_pos)
+        self._prefetch_portal_destinations()
         
         # Increase difficulty over time
         self.difficulty = min(3.0, 1.0 + self.ritual_items_collected / 20)
     
+    def _require_chunk(self, chunk_x, chunk_y):
+        """Return a chunk that is needed this frame, generating it now if it isn't yet"""
+        chunk = self.chunks.get((chunk_x, chunk_y))
+        if chunk is None:
+            chunk = self.scheduler.run_now(("chunk", (chunk_x, chunk_y)), self.get_or_create_chunk, chunk_x, chunk_y)
+        return chunk
+    
+    def _exit_door_chunk(self, player_chunk_x, player_chunk_y):
+        """Pick one of the chunks around the player's for the exit door, preferring ones not generated yet"""
+        neighbours = [(player_chunk_x + dx, player_chunk_y + dy)
+                      for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+        fresh = [key for key in neighbours if key not in self.chunks]
+        return random.choice(fresh or neighbours)
+    
+    def _place_exit_door(self, chunk_x, chunk_y):
+        """Put the exit door in a chunk, generating the chunk around it if needed"""
+        self.exit_door_created = True
+        if (chunk_x, chunk_y) not in self.chunks:
+            self.scheduler.run_now(("chunk", (chunk_x, chunk_y)), self.get_or_create_chunk, chunk_x, chunk_y, True)
+        else:
+            self.chunks[(chunk_x, chunk_y)].add_exit_door()
+            self.grid_version += 1
+    
+    def _prefetch_portal_destinations(self):
+        """Queue generation of the chunks around where each newly active portal leads
+        
+        A teleport then lands among chunks that are already there instead of
+        generating all of them on the frame the player steps in. New portals
+        are handled in order of destination, and each neighbourhood from its
+        middle out, so the chunks come out the same however frames fall.
+        Once a neighbourhood is generated, a flow field leading to the
+        landing point is built and the enemies around it are settled, so the
+        first frame there doesn't do that either.
+        """
+        portals = []
+        for chunk in self.active_chunks:
+            for entity, portal in self.entities.query(chunk.portals, Portal):
+                if portal.destination and entity not in self.prefetched_portals:
+                    landing = (int(portal.rect.centerx // self.chunk_size) + portal.destination[0],
+                               int(portal.rect.centery // self.chunk_size) + portal.destination[1])
+                    self.prefetched_portals[entity] = landing
+                    portals.append((portal.destination, entity, landing))
+        
+        # After the chunks around the player, which have priorities up to the
+        # generation distance
+        reach = max(self.simulation_distance, self.render_distance)
+        for destination, entity, (landing_x, landing_y) in sorted(portals):
+            for ring in range(reach + 1):
+                for y in range(landing_y - ring, landing_y + ring + 1):
+                    for x in range(landing_x - ring, landing_x + ring + 1):
+                        if max(abs(x - landing_x), abs(y - landing_y)) == ring and (x, y) not in self.chunks:
+                            self.scheduler.submit(self.generation_distance + 1 + ring, ("chunk", (x, y)),
+                                                  self.get_or_create_chunk, x, y)
+            self.scheduler.submit(self.generation_distance + 2 + reach, ("landing", entity),
+                                  self._prepare_landing, entity, destination)
+    
+    def _prepare_landing(self, entity, destination):
+        """Build the flow field for, and settle the enemies around, where a portal leads"""
+        portal = self.entities.table(Portal).get(entity)
+        if portal is None:
+            return
+        target = (portal.rect.centerx + destination[0] * self.chunk_size,
+                  portal.rect.centery + destination[1] * self.chunk_size)
+        field = FlowField(self)
+        field.update(target)
+        self.landing_fields[entity] = field
+        
+        landing_x, landing_y = self.prefetched_portals.get(entity, (None, None))
+        if landing_x is None:
+            return
+        for y in range(landing_y - self.simulation_distance, landing_y + self.simulation_distance + 1):
+            for x in range(landing_x - self.simulation_distance, landing_x + self.simulation_distance + 1):
+                self._settle_enemies((x, y), target)
+    
+    def _drop_distant_work(self, player_chunk_x, player_chunk_y, was_active):
+        """Take chunks the player has moved away from off the scheduler's queue
+        
+        Queued chunks beyond the generation distance are dropped unless they
+        are around where a still active portal leads; they are queued again
+        if the player comes back. Portals that are no longer active are
+        forgotten, so their destination is prefetched again next time, but
+        the flow fields of those that just were are kept for one more change
+        of chunk, in case the player came through one of them.
+        """
+        active = {entity for chunk in self.active_chunks for entity in chunk.portals}
+        recent = active.union(entity for chunk in was_active for entity in chunk.portals)
+        self.prefetched_portals = {entity: landing for entity, landing in self.prefetched_portals.items()
+                                   if entity in active}
+        self.landing_fields = {entity: field for entity, field in self.landing_fields.items() if entity in recent}
+        landings = list(self.prefetched_portals.values())
+        reach = max(self.simulation_distance, self.render_distance)
+        
+        def distant(key):
+            if key[0] == "landing":
+                return key[1] not in self.prefetched_portals
+            if key[0] != "chunk":
+                return False
+            x, y = key[1]
+            if max(abs(x - player_chunk_x), abs(y - player_chunk_y)) <= self.generation_distance:
+                return False
+            return all(max(abs(x - landing_x), abs(y - landing_y)) > reach for landing_x, landing_y in landings)
+        
+        self.scheduler.cancel(distant)
+    
+    def _settle_left_chunks(self, was_active, player_pos):
+        """Queue the re-sorting of enemies in chunks that are no longer simulated"""
+        for chunk in was_active:
+            key = (chunk.x, chunk.y)
+            if not self._is_simulated(key):
+                self.scheduler.submit(self.generation_distance + 1, ("settle", key),
+                                      self._settle_enemies, key, player_pos)
+    
+    def _is_simulated(self, key):
+        """Check if a chunk is within the simulation distance of the player's chunk"""
+        return self.player_chunk is not None and \
+            max(abs(key[0] - self.player_chunk[0]), abs(key[1] - self.player_chunk[1])) <= self.simulation_distance
+    
+    def _settle_enemies(self, key, focus):
+        """Sort the enemies of a chunk that isn't simulated into awake and asleep around a point
+        
+        Chunks outside the simulation distance aren't updated, so enemies
+        stay as the player left them. Settling them ahead of time means the
+        frame that brings the chunk back only runs the ones near focus: idle
+        enemies far from it go to sleep and sleepers close to it wake up.
+        """
+        chunk = self.chunks.get(key)
+        if chunk is None or self._is_simulated(key):
+            return
+        
+        positions = self.entities.table(Position)
+        patrols = self.entities.table(Patrol)
+        chasers = self.entities.table(Chase)
+        awake = []
+        sleeping = []
+        for entity in chunk.enemies:
+            position = positions[entity]
+            x, y = self.enemy_position(position, patrols.get(entity))
+            dx = focus[0] - x
+            dy = focus[1] - y
+            if dx*dx + dy*dy > ENEMY_SLEEP_DISTANCE * ENEMY_SLEEP_DISTANCE and \
+               self._is_idle(chasers.get(entity), position):
+                sleeping.append(entity)
+            else:
+                awake.append(entity)
+        for entity in chunk.sleeping:
+            x, y = self.enemy_position(positions[entity], patrols.get(entity))
+            dx = focus[0] - x
+            dy = focus[1] - y
+            if dx*dx + dy*dy < ENEMY_WAKE_DISTANCE * ENEMY_WAKE_DISTANCE:
+                awake.append(entity)
+            else:
+                sleeping.append(entity)
+        chunk.enemies = awake
+        chunk.sleeping = sleeping
+    
     def check_collectable_collision(self, player_rect):
         """Check if player has collided with any collectable"""
+        collectables = self.entities.table(Collectable)
         for chunk in self.active_chunks:
-            for item in chunk.collectables:
-                if not item["collected"] and item["rect"].colliderect(player_rect):
-                    item["collected"] = True
-                    if item["type"] == "ritual":
+            for entity in chunk.collectables:
+                item = collectables[entity]
+                if not item.collected and item.rect.colliderect(player_rect):
+                    item.collected = True
+                    self.sounds.emit("pickup", item.rect.center)
+                    if item.kind == RITUAL:
                         self.ritual_items_collected += 1
                         self.sound_manager.play_sound("key_pickup")
-                    return item["type"]
+                    return item.kind
+        return None
+    
+    def check_memory_collision(self, player_rect):
+        """Check if player has touched a memory fragment; return it, now collected, or None"""
+        for chunk in self.active_chunks:
+            for fragment in chunk.memory_fragments:
+                if not fragment.collected and fragment.rect.colliderect(player_rect):
+                    fragment.collected = True
+                    return fragment
         return None
     
     def check_portal_collision(self, player_rect):
         """Check if player has entered a portal"""
+        portals = self.entities.table(Portal)
         for chunk in self.active_chunks:
-            for portal in chunk.portals:
-                if portal["active"] and portal["rect"].colliderect(player_rect):
+            for entity in chunk.portals:
+                portal = portals[entity]
+                if portal.active and portal.rect.colliderect(player_rect):
                     # Check if it's an exit door
-                    if portal.get("is_exit", False):
+                    if portal.is_exit:
                         # Only allow exit if enough ritual items collected
                         if self.ritual_items_collected >= self.ritual_items_required:
                             return "EXIT"
                     else:
                         # Regular portal
-                        return portal["destination"]
+                        return portal.destination
         return None
     
     def check_enemy_collision(self, player_rect):
         """Check if player has collided with any enemy"""
-        # Add a small grace period at the start of the game (3 seconds)
-        if pygame.time.get_ticks() < 3000:
+        # Add a small grace period at the start of the level (3 seconds)
+        if self.sim_clock.now() < 3000:
             return None
             
+        positions = self.entities.table(Position)
+        patrols = self.entities.table(Patrol)
+        renderables = self.entities.table(Renderable)
         for chunk in self.active_chunks:
-            for enemy in chunk.enemies:
+            for entity in chunk.enemies:
+                # Patrollers whose whole orbit is clear of the player can't hit it
+                patrol = patrols.get(entity)
+                if patrol and patrol.active and not patrol.area.inflate(10, 10).colliderect(player_rect):
+                    continue
+                
                 # Use a slightly larger collision area for enemies
-                enemy_rect = pygame.Rect(enemy["x"] - 5, enemy["y"] - 5, 42, 42)
+                x, y = self.enemy_position(positions[entity], patrol)
+                enemy_rect = pygame.Rect(x - 5, y - 5, 42, 42)
                 if enemy_rect.colliderect(player_rect):
-                    return enemy["type"]
+                    return renderables[entity].kind
         return None
     
-    def update_enemies(self, player_pos, sound_made=False):
+    def update_enemies(self, player_pos):
         """Update all enemies in active chunks"""
-        # Add a small grace period at the start of the game (3 seconds)
-        if pygame.time.get_ticks() < 3000:
+        self.fired_shots = []
+        
+        # Add a small grace period at the start of the level (3 seconds)
+        if self.sim_clock.now() < 3000:
+            self.sounds.end_tick()
             return
-            
+        
+        # One shared path search toward the player for every chaser
+        self._update_flow_field((player_pos[0] + 16, player_pos[1] + 16))
+        
+        # Bring back sleeping enemies the player or a new sound got close to
+        self._wake_enemies(player_pos)
+        
+        positions = self.entities.table(Position)
+        patrols = self.entities.table(Patrol)
+        chasers = self.entities.table(Chase)
+        turrets = self.entities.table(Turret)
+        moved = []  # (chunk key, entity, asleep) of enemies that crossed into another chunk
         for chunk in self.active_chunks:
-            for enemy in chunk.enemies:
+            awake = []
+            for entity in chunk.enemies:
+                position = positions[entity]
+                patrol = patrols.get(entity)
+                chase = chasers.get(entity)
+                
+                # Patrollers that can't notice anything from anywhere on their
+                # orbit are left alone; their position is worked out when needed
+                if patrol and patrol.active and self._patrol_undisturbed(chase, patrol, player_pos):
+                    awake.append(entity)
+                    continue
+                
                 # Calculate distance to player
-                dx = player_pos[0] - enemy["x"]
-                dy = player_pos[1] - enemy["y"]
+                x, y = self.enemy_position(position, patrol)
+                dx = player_pos[0] - x
+                dy = player_pos[1] - y
                 distance = math.sqrt(dx*dx + dy*dy)
                 
-                # Initialize enemy properties if needed
-                if "detection_range" not in enemy:
-                    enemy["variant"] = random.randint(0, 2)  # Random warden variant
-                    
-                    # Set detection range based on enemy type
-                    if enemy["type"] == "warden":
-                        enemy["detection_range"] = 200
-                        enemy["speed"] = self.warden_speed  # Use configurable speed
-                    elif enemy["type"] == "phantom":
-                        enemy["detection_range"] = 150
-                        enemy["speed"] = 1.2
-                    elif enemy["type"] == "turret":
-                        enemy["detection_range"] = 250
-                        enemy["speed"] = 0
-                        enemy["fire_cooldown"] = 120
-                        enemy["cooldown_timer"] = 0
-                    else:  # crawler
-                        enemy["detection_range"] = 100
-                        enemy["speed"] = 0.8
+                if chase:
+                    self._update_chaser(chase, position, patrol, player_pos, dx, dy, distance)
+                else:
+                    self._update_turret(turrets[entity], position, player_pos, distance)
                 
-                # Simple enemy behavior
-                if enemy["type"] == "warden":
-                    # Warden follows player directly when close or when sound is made
-                    if distance < enemy["detection_range"] or sound_made:
-                        # Store player position
-                        enemy["target_x"] = player_pos[0]
-                        enemy["target_y"] = player_pos[1]
-                        enemy["heard_sound"] = True
-                    
-                    # Move toward player or last heard position
-                    if enemy.get("heard_sound", False):
-                        target_x = enemy.get("target_x", enemy["x"])
-                        target_y = enemy.get("target_y", enemy["y"])
-                        
-                        # Calculate distance to target
-                        tx = target_x - enemy["x"]
-                        ty = target_y - enemy["y"]
-                        target_dist = math.sqrt(tx*tx + ty*ty)
-                        
-                        # Move toward target
-                        if target_dist > 5:  # Stop when very close to target
-                            speed = enemy["speed"]
-                            enemy["x"] += tx / target_dist * speed
-                            enemy["y"] += ty / target_dist * speed
-                        
-                        # Update target to player's current position if close enough
-                        if distance < enemy["detection_range"]:
-                            enemy["target_x"] = player_pos[0]
-                            enemy["target_y"] = player_pos[1]
+                # Idle enemies far from the player and from recent sounds go to sleep
+                x, y = self.enemy_position(position, patrol)
+                asleep = distance > ENEMY_SLEEP_DISTANCE and self._is_idle(chase, position) and \
+                    not self.sounds.heard_recently(x + 16, y + 16)
                 
-                elif enemy["type"] == "phantom":
-                    # Phantom follows player if within range
-                    if distance < enemy["detection_range"]:
-                        if distance > 5:
-                            speed = enemy["speed"]
-                            enemy["x"] += dx / distance * speed
-                            enemy["y"] += dy / distance * speed
-                    else:
-                        # Simple patrol in a small area
-                        angle = pygame.time.get_ticks() / 5000
-                        enemy["x"] = enemy["start_x"] + math.cos(angle) * 50
-                        enemy["y"] = enemy["start_y"] + math.sin(angle) * 50
+                # Chasers belong to the chunk their centre is in, so culling and
+                # chunk radii see them where they are rather than where they spawned
+                if chase:
+                    key = (int((x + 16) // self.chunk_size), int((y + 16) // self.chunk_size))
+                    if key != (chunk.x, chunk.y) and key in self.chunks:
+                        moved.append((key, entity, asleep))
+                        continue
                 
-                elif enemy["type"] == "turret":
-                    # Turret behavior - stationary but fires at player
-                    if distance < enemy["detection_range"]:
-                        # Update cooldown timer
-                        if enemy["cooldown_timer"] > 0:
-                            enemy["cooldown_timer"] -= 1
-                        
-                        # Fire projectile if cooldown is ready
-                        if enemy["cooldown_timer"] == 0:
-                            # Signal that this enemy has fired a projectile
-                            enemy["has_fired"] = True
-                            enemy["target_x"] = player_pos[0]
-                            enemy["target_y"] = player_pos[1]
-                            enemy["cooldown_timer"] = enemy["fire_cooldown"]
-                    
-                elif enemy["type"] == "crawler":
-                    # Crawler is attracted to sound
-                    if sound_made and distance < 300:
-                        if distance > 5:
-                            speed = enemy["speed"]
-                            enemy["x"] += dx / distance * speed
-                            enemy["y"] += dy / distance * speed
+                if asleep:
+                    chunk.sleeping.append(entity)
+                else:
+                    awake.append(entity)
+            chunk.enemies = awake
+        
+        # Hand them over once every chunk has been updated, so none moves twice
+        for key, entity, asleep in moved:
+            chunk = self.chunks[key]
+            if asleep:
+                chunk.sleeping.append(entity)
+            else:
+                chunk.enemies.append(entity)
+        
+        self.sounds.end_tick()
+    
+    def _update_chaser(self, chase, position, patrol, player_pos, dx, dy, distance):
+        """Move a warden, phantom or crawler toward the player or what it heard"""
+        if chase.kind == WARDEN:
+            # Warden follows player directly when close, or walks to
+            # whatever it heard
+            loudness, sound = self.sounds.hear(position.x + 16, position.y + 16)
+            if distance < chase.detection_range:
+                # Store player position
+                chase.target_x = player_pos[0]
+                chase.target_y = player_pos[1]
+                chase.heard_sound = True
+            elif loudness > WARDEN_HEARING:
+                # Store sound position
+                chase.target_x = sound.position[0] - 16
+                chase.target_y = sound.position[1] - 16
+                chase.heard_sound = True
+            
+            # Move toward player or last heard position
+            if chase.heard_sound:
+                # Calculate distance to target
+                tx = chase.target_x - position.x
+                ty = chase.target_y - position.y
+                target_dist = math.sqrt(tx*tx + ty*ty)
+                
+                # Move toward target, around obstacles when it's the player
+                if target_dist > 5:  # Stop when very close to target
+                    if self.flow_field.leads_to(chase.target_x + 16, chase.target_y + 16):
+                        move_x, move_y = self._chase_direction(position, tx, ty, target_dist)
                     else:
-                        # Simple patrol in a small area
-                        angle = pygame.time.get_ticks() / 4000 + hash(str(enemy)) % 100
-                        enemy["x"] = enemy["start_x"] + math.cos(angle) * 30
-                        enemy["y"] = enemy["start_y"] + math.sin(angle) * 30
+                        move_x, move_y = tx / target_dist, ty / target_dist
+                    position.x += move_x * chase.speed
+                    position.y += move_y * chase.speed
+                
+                # Update target to player's current position if close enough
+                if distance < chase.detection_range:
+                    chase.target_x = player_pos[0]
+                    chase.target_y = player_pos[1]
+            return
+        
+        if chase.kind == PHANTOM:
+            # Phantom follows player if within range
+            noticed = distance < chase.detection_range
+        else:
+            # Crawler is attracted to loud sounds close by
+            loudness, _ = self.sounds.hear(position.x + 16, position.y + 16)
+            noticed = loudness > CRAWLER_HEARING
+        
+        if noticed:
+            patrol.active = False
+            if distance > 5:
+                move_x, move_y = self._chase_direction(position, dx, dy, distance)
+                position.x += move_x * chase.speed
+                position.y += move_y * chase.speed
+        else:
+            # Simple patrol in a small area
+            patrol.active = True
+    
+    def _update_turret(self, turret, position, player_pos, distance):
+        """Fire at the player when in range and loaded; the clock reloads it after the cooldown"""
+        if distance < turret.detection_range and turret.loaded:
+            self.fired_shots.append((position.x + 16, position.y + 16, player_pos[0], player_pos[1]))
+            turret.loaded = False
+            self.sim_clock.schedule(turret.fire_cooldown, self._reload_turret, turret)
+    
+    def _reload_turret(self, turret):
+        """Let a turret fire again once its cooldown is over"""
+        turret.loaded = True
+    
+    def enemy_position(self, position, patrol=None):
+        """Return an enemy's current position, working it out from its patrol if patrolling"""
+        if patrol and patrol.active:
+            position.x, position.y = patrol.position(self.sim_clock.now())
+        return position.x, position.y
     
-    def render(self, screen, camera_pos, echo_intensity=0):
+    def _patrol_undisturbed(self, chase, patrol, player_pos):
+        """Check if a patroller can keep patrolling without its position being needed
+        
+        That is when no new sound was made and the player is out of its
+        detection range from every point of its orbit, but not so far away
+        that it might be time for it to sleep.
+        """
+        if self.sounds.fresh:
+            return False
+        dx = player_pos[0] - patrol.x
+        dy = player_pos[1] - patrol.y
+        distance_squared = dx*dx + dy*dy
+        notice = chase.detection_range + patrol.radius
+        sleep = ENEMY_SLEEP_DISTANCE + patrol.radius
+        return notice * notice < distance_squared <= sleep * sleep
+    
+    def _is_idle(self, chase, position):
+        """Check if an enemy is only patrolling or waiting rather than going somewhere"""
+        if chase and chase.kind == WARDEN and chase.heard_sound:
+            tx = chase.target_x - position.x
+            ty = chase.target_y - position.y
+            return tx*tx + ty*ty <= 25
+        return True
+    
+    def _update_flow_field(self, target):
+        """Keep the shared flow field leading to the player
+        
+        While the player is at most FLOW_FIELD_SLACK cells from where the
+        field leads, or only new chunks have appeared, chasers still close in
+        on the old field, so the rebuild waits for a frame's spare time.
+        Further off, such as after a teleport, the field prefetched for the
+        landing point is used if there is one, or else it is rebuilt
+        straight away.
+        """
+        self.flow_target = target
+        behind = self.flow_field.cells_behind(target)
+        if behind is None or behind > FLOW_FIELD_SLACK:
+            for entity, field in self.landing_fields.items():
+                if field.cells_behind(target) <= FLOW_FIELD_SLACK:
+                    del self.landing_fields[entity]
+                    self.flow_field = field
+                    behind = field.cells_behind(target)
+                    break
+        
+        if behind == 0 and self.flow_field.grid_version == self.grid_version:
+            return
+        if behind is not None and behind <= FLOW_FIELD_SLACK:
+            self.scheduler.submit(-1, ("flow_field",), self._refresh_flow_field)
+        else:
+            self.scheduler.run_now(("flow_field",), self._refresh_flow_field)
+    
+    def _refresh_flow_field(self):
+        self.flow_field.update(self.flow_target)
+    
+    def _wake_enemies(self, player_pos):
+        """Move sleeping enemies near the player or within reach of a new sound back into play"""
+        wake_distance = ENEMY_WAKE_DISTANCE
+        areas = [pygame.Rect(player_pos[0] - wake_distance, player_pos[1] - wake_distance,
+                             wake_distance * 2, wake_distance * 2)]
+        areas.extend(event.bounds for event in self.sounds.fresh)
+        
+        # Only look at the sleepers of chunks that overlap one of those areas
+        positions = self.entities.table(Position)
+        patrols = self.entities.table(Patrol)
+        for chunk in self.active_chunks:
+            if not chunk.sleeping:
+                continue
+            if chunk.bounds.collidelist(areas) == -1:
+                continue
+            
+            sleeping = []
+            for entity in chunk.sleeping:
+                # Patrollers kept moving along their orbit while asleep
+                x, y = self.enemy_position(positions[entity], patrols.get(entity))
+                dx = player_pos[0] - x
+                dy = player_pos[1] - y
+                if dx*dx + dy*dy < wake_distance * wake_distance or \
+                   self.sounds.hear(x + 16, y + 16)[0] > 0:
+                    chunk.enemies.append(entity)
+                else:
+                    sleeping.append(entity)
+            chunk.sleeping = sleeping
+    
+    def enemy_counts(self):
+        """Return how many enemies in the active chunks are awake and asleep"""
+        awake = sum(len(chunk.enemies) for chunk in self.active_chunks)
+        asleep = sum(len(chunk.sleeping) for chunk in self.active_chunks)
+        return awake, asleep
+    
+    def _chase_direction(self, position, dx, dy, distance):
+        """Direction for an enemy chasing the player, from the shared flow field"""
+        direction = self.flow_field.get_direction(position.x + 16, position.y + 16)
+        if direction is None:
+            # Outside the field or already next to the player: head straight in
+            return dx / distance, dy / distance
+        return direction
+    
+    def render(self, screen, camera_pos, light_map):
         """Render the visible world"""
+        # Only chunks whose area overlaps the view have anything to draw. The
+        # margins cover sprites, glows and patrol orbits that stick out of a
+        # chunk
+        view = pygame.Rect(camera_pos[0], camera_pos[1], SCREEN_WIDTH, SCREEN_HEIGHT)
+        screen_area = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+        enemy_view = view.inflate(ENEMY_RENDER_MARGIN * 2, ENEMY_RENDER_MARGIN * 2)
+        static_view = view.inflate(120, 120)
+        
+        # Gather everything to draw in one pass over the visible chunks.
+        # Collectable visibility is read from the lights placed so far (player
+        # and echoes), then revealed items and portals add their own glow
+        visible_items = []
+        visible_portals = []
+        visible_fragments = []
+        visible_obstacles = []
+        visible_enemies = []
+        for chunk in self.visible_chunks:
+            if chunk.enemies and chunk.bounds.colliderect(enemy_view):
+                visible_enemies.append(chunk)
+            if not chunk.bounds.colliderect(static_view):
+                continue
+            
+            for entity, item, renderable in self.entities.query(chunk.collectables, Collectable, Renderable):
+                if not item.collected:
+                    # Update glow effect
+                    item.glow += item.glow_dir * 2
+                    if item.glow > 50:
+                        item.glow_dir = -1
+                    elif item.glow < 0:
+                        item.glow_dir = 1
+                    
+                    # Calculate screen position
+                    screen_x = item.rect.x - camera_pos[0]
+                    screen_y = item.rect.y - camera_pos[1]
+                    
+                    # Only draw if on screen and somewhat visible
+                    if -50 < screen_x < SCREEN_WIDTH + 50 and -50 < screen_y < SCREEN_HEIGHT + 50:
+                        visibility = light_map.visibility(screen_x + 16, screen_y + 16)
+                        if visibility > 20:
+                            visible_items.append((item, renderable, screen_x, screen_y, visibility))
+                            light_map.add_light(screen_x + 16, screen_y + 16, ITEM_LIGHT_RADIUS,
+                                                min(255, visibility + 50))
+            
+            for entity, portal in self.entities.query(chunk.portals, Portal):
+                # Calculate screen position
+                screen_x = portal.rect.x - camera_pos[0]
+                screen_y = portal.rect.y - camera_pos[1]
+                
+                # Only draw if on screen
+                if -60 < screen_x < SCREEN_WIDTH + 60 and -60 < screen_y < SCREEN_HEIGHT + 60:
+                    visible_portals.append((portal, screen_x, screen_y))
+            
+            for fragment in chunk.memory_fragments:
+                if not fragment.collected and fragment.rect.colliderect(static_view):
+                    visible_fragments.append(fragment)
+            
+            for obstacle in chunk.obstacles:
+                screen_rect = obstacle.rect.move(-camera_pos[0], -camera_pos[1])
+                if screen_rect.colliderect(screen_area):
+                    visible_obstacles.append((obstacle, screen_rect))
+        
+        # Portal and memory glow goes in after every item has read its visibility
+        for portal, screen_x, screen_y in visible_portals:
+            light_map.add_light(screen_x + portal.rect.width // 2,
+                                screen_y + portal.rect.height // 2, PORTAL_LIGHT_RADIUS)
+        for fragment in visible_fragments:
+            light_map.add_light(fragment.rect.centerx - camera_pos[0], fragment.rect.centery - camera_pos[1],
+                                ITEM_LIGHT_RADIUS)
+        
         # Draw background
         if hasattr(self, 'background_texture') and self.background_texture:
             # Tile the background texture
@@ -432,89 +1005,96 @@ class InfiniteWorld:
                 for y in range(start_y, SCREEN_HEIGHT, bg_height):
                     screen.blit(self.background_texture, (x, y))
         
-        # Draw collectables
-        for chunk in self.active_chunks:
-            for item in chunk.collectables:
-                if not item["collected"]:
-                    # Update glow effect
-                    item["glow"] += item["glow_dir"] * 2
-                    if item["glow"] > 50:
-                        item["glow_dir"] = -1
-                    elif item["glow"] < 0:
-                        item["glow_dir"] = 1
-                    
-                    # Calculate screen position
-                    screen_x = item["rect"].x - camera_pos[0]
-                    screen_y = item["rect"].y - camera_pos[1]
-                    
-                    # Only draw if on screen
-                    if -50 < screen_x < SCREEN_WIDTH + 50 and -50 < screen_y < SCREEN_HEIGHT + 50:
-                        # Determine visibility based on echo intensity and distance
-                        distance_to_center = math.sqrt((SCREEN_WIDTH/2 - screen_x)**2 + (SCREEN_HEIGHT/2 - screen_y)**2)
-                        visibility = echo_intensity - distance_to_center / 5
-                        
-                        if visibility > 20:  # Only show if somewhat visible
-                            # Draw ritual item with glow effect
-                            glow_size = 40 + item["glow"] // 2
-                            glow_surf = pygame.Surface((glow_size, glow_size), pygame.SRCALPHA)
-                            glow_color = (200, 50, 200, min(100, int(visibility)))
-                            pygame.draw.circle(glow_surf, glow_color, (glow_size//2, glow_size//2), glow_size//2)
-                            screen.blit(glow_surf, 
-                                       (screen_x + 16 - glow_size//2, 
-                                        screen_y + 16 - glow_size//2))
-                            
-                            # Draw the ritual item texture based on variant
-                            variant = item.get("variant", 0) % len(self.ritual_textures)
-                            if hasattr(self, 'ritual_textures') and len(self.ritual_textures) > variant:
-                                texture_copy = self.ritual_textures[variant].copy()
-                                texture_copy.set_alpha(min(255, int(visibility) + 50))
-                                screen.blit(texture_copy, (screen_x, screen_y))
-                            else:
-                                # Fallback
-                                pygame.draw.circle(screen, (200, 50, 200, min(255, int(visibility))), 
-                                                  (screen_x + 16, screen_y + 16), 15)
+        # Draw obstacles
+        for obstacle, screen_rect in visible_obstacles:
+            pygame.draw.rect(screen, obstacle.color, screen_rect)
         
         # Draw portals
-        for chunk in self.active_chunks:
-            for portal in chunk.portals:
-                # Calculate screen position
-                screen_x = portal["rect"].x - camera_pos[0]
-                screen_y = portal["rect"].y - camera_pos[1]
-                
-                # Only draw if on screen
-                if -60 < screen_x < SCREEN_WIDTH + 60 and -60 < screen_y < SCREEN_HEIGHT + 60:
-                    # Portal animation
-                    glow_radius = 40 + 10 * math.sin(pygame.time.get_ticks() / 300)
-                    glow_surf = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
-                    portal_color = (0, 200, 200)
-                    pygame.draw.circle(glow_surf, (portal_color[0], portal_color[1], portal_color[2], 100), 
-                                      (glow_radius, glow_radius), glow_radius)
-                    screen.blit(glow_surf, (screen_x + 30 - glow_radius, screen_y + 30 - glow_radius))
-                    
-                    # Draw portal
-                    if hasattr(self, 'portal_texture') and self.portal_texture:
-                        screen.blit(self.portal_texture, (screen_x, screen_y))
-                    else:
-                        pygame.draw.circle(screen, portal_color, (screen_x + 30, screen_y + 30), 30)
-                        pygame.draw.circle(screen, (255, 255, 255), (screen_x + 30, screen_y + 30), 20, 2)
+        for portal, screen_x, screen_y in visible_portals:
+            # Portal animation
+            glow_radius = 40 + 10 * math.sin(self.sim_clock.now() / 300)
+            glow_surf = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
+            portal_color = (0, 200, 200)
+            pygame.draw.circle(glow_surf, (portal_color[0], portal_color[1], portal_color[2], 100), 
+                              (glow_radius, glow_radius), glow_radius)
+            screen.blit(glow_surf, (screen_x + 30 - glow_radius, screen_y + 30 - glow_radius))
+            
+            # Draw portal
+            if hasattr(self, 'portal_texture') and self.portal_texture:
+                screen.blit(self.portal_texture, (screen_x, screen_y))
+            else:
+                pygame.draw.circle(screen, portal_color, (screen_x + 30, screen_y + 30), 30)
+                pygame.draw.circle(screen, (255, 255, 255), (screen_x + 30, screen_y + 30), 20, 2)
+        
+        # Darken the environment; revealed items and spirits are drawn on top
+        light_map.apply(screen)
+        
+        # Outline the surfaces the last echo bounced off, by material strength
+        echo_result = self.echo.last_result
+        if echo_result:
+            intensity = self.echo.get_intensity()
+            for cell_x, cell_y, material, strength in echo_result.revealed:
+                screen_x = cell_x - camera_pos[0]
+                screen_y = cell_y - camera_pos[1]
+                if -GRID_CELL_SIZE < screen_x < SCREEN_WIDTH and -GRID_CELL_SIZE < screen_y < SCREEN_HEIGHT:
+                    color = MATERIAL_COLORS[material]
+                    pygame.gfxdraw.box(screen, (int(screen_x), int(screen_y), GRID_CELL_SIZE, GRID_CELL_SIZE),
+                                       (color[0], color[1], color[2], int(strength * intensity)))
+        
+        # Draw collectables
+        for item, renderable, screen_x, screen_y, visibility in visible_items:
+            # Draw ritual item with glow effect
+            glow_size = 40 + item.glow // 2
+            glow_surf = pygame.Surface((glow_size, glow_size), pygame.SRCALPHA)
+            glow_color = (200, 50, 200, min(100, int(visibility)))
+            pygame.draw.circle(glow_surf, glow_color, (glow_size//2, glow_size//2), glow_size//2)
+            screen.blit(glow_surf, 
+                       (screen_x + 16 - glow_size//2, 
+                        screen_y + 16 - glow_size//2))
+            
+            # Draw the ritual item texture based on variant
+            variant = renderable.variant % len(self.ritual_textures)
+            if hasattr(self, 'ritual_textures') and len(self.ritual_textures) > variant:
+                texture_copy = self.ritual_textures[variant].copy()
+                texture_copy.set_alpha(min(255, int(visibility) + 50))
+                screen.blit(texture_copy, (screen_x, screen_y))
+            else:
+                # Fallback
+                pygame.draw.circle(screen, (200, 50, 200, min(255, int(visibility))), 
+                                  (screen_x + 16, screen_y + 16), 15)
+        
+        # Draw memory fragments, pulsing
+        for fragment in visible_fragments:
+            fragment.update()
+            fragment.render(screen, camera_pos)
         
         # Draw enemies
-        for chunk in self.active_chunks:
-            for enemy in chunk.enemies:
+        draw_area = pygame.Rect(camera_pos[0] - 50, camera_pos[1] - 50, SCREEN_WIDTH + 100, SCREEN_HEIGHT + 100)
+        patrols = self.entities.table(Patrol)
+        chasers = self.entities.table(Chase)
+        turrets = self.entities.table(Turret)
+        for chunk in visible_enemies:
+            for entity, renderable, position in self.entities.query(chunk.enemies, Renderable, Position):
+                # Skip patrollers whose whole orbit is off-screen
+                patrol = patrols.get(entity)
+                if patrol and patrol.active and not patrol.area.colliderect(draw_area):
+                    continue
+                
                 # Calculate screen position
-                screen_x = enemy["x"] - camera_pos[0]
-                screen_y = enemy["y"] - camera_pos[1]
+                x, y = self.enemy_position(position, patrol)
+                screen_x = x - camera_pos[0]
+                screen_y = y - camera_pos[1]
                 
                 # Only draw if on screen
                 if -50 < screen_x < SCREEN_WIDTH + 50 and -50 < screen_y < SCREEN_HEIGHT + 50:
-                    enemy_type = enemy["type"]
-                    variant = enemy.get("variant", 0)
+                    enemy_type = renderable.kind
+                    variant = renderable.variant
+                    detection_range = (chasers.get(entity) or turrets[entity]).detection_range
                     
-                    if enemy_type == "warden":
+                    if enemy_type == WARDEN:
                         # Warden is always visible
                         if enemy_type in self.enemy_textures and len(self.enemy_textures[enemy_type]) > variant:
                             # Draw detection range circle
-                            detection_range = enemy.get("detection_range", 200)
                             range_surf = pygame.Surface((detection_range*2, detection_range*2), pygame.SRCALPHA)
                             pygame.draw.circle(range_surf, (200, 0, 0, 30), 
                                              (detection_range, detection_range), detection_range)
@@ -528,15 +1108,12 @@ class InfiniteWorld:
                             # Fallback
                             pygame.draw.circle(screen, (200, 0, 0, 150), (screen_x + 16, screen_y + 16), 16)
                             # Draw detection range
-                            detection_range = enemy.get("detection_range", 200)
                             pygame.draw.circle(screen, (200, 0, 0, 30), (screen_x + 16, screen_y + 16), 
                                              detection_range, 2)
                     
-                    elif enemy_type == "crawler":
-                        # Crawler is only visible during echo or when close
-                        distance_visibility = max(0, 255 - int(math.sqrt((SCREEN_WIDTH/2 - screen_x)**2 + 
-                                                                        (SCREEN_HEIGHT/2 - screen_y)**2) / 2))
-                        visibility = max(echo_intensity, distance_visibility)
+                    elif enemy_type == CRAWLER:
+                        # Crawler is only visible where the light map reaches it
+                        visibility = light_map.visibility(screen_x + 16, screen_y + 16)
                         
                         if visibility > 50 and enemy_type in self.enemy_textures:
                             texture_copy = self.enemy_textures[enemy_type].copy()
@@ -547,11 +1124,10 @@ class InfiniteWorld:
                             pygame.draw.circle(screen, (200, 50, 50, min(255, visibility)), 
                                               (screen_x + 16, screen_y + 16), 15)
                     
-                    elif enemy_type == "turret":
+                    elif enemy_type == TURRET:
                         # Turret is always visible
                         if enemy_type in self.enemy_textures:
                             # Draw detection range
-                            detection_range = enemy.get("detection_range", 250)
                             range_surf = pygame.Surface((detection_range*2, detection_range*2), pygame.SRCALPHA)
                             pygame.draw.circle(range_surf, (255, 0, 0, 20), 
                                              (detection_range, detection_range), detection_range)
@@ -566,12 +1142,11 @@ class InfiniteWorld:
                             pygame.draw.rect(screen, (150, 150, 150), (screen_x, screen_y, 32, 32))
                             pygame.draw.circle(screen, (255, 0, 0), (screen_x + 16, screen_y + 16), 5)
                     
-                    elif enemy_type == "phantom":
+                    elif enemy_type == PHANTOM:
                         # Phantom is semi-transparent
-                        alpha = 100 + 50 * math.sin(pygame.time.get_ticks() / 300)
+                        alpha = 100 + 50 * math.sin(self.sim_clock.now() / 300)
                         if enemy_type in self.enemy_textures:
                             # Draw detection range
-                            detection_range = enemy.get("detection_range", 150)
                             range_surf = pygame.Surface((detection_range*2, detection_range*2), pygame.SRCALPHA)
                             pygame.draw.circle(range_surf, (50, 50, 200, 20), 
                                              (detection_range, detection_range), detection_range)
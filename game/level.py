@@ -34,8 +34,11 @@ class MemoryFragment:
             self.glow_value = 0
             self.glow_direction = 1
 
-    def render(self, surface):
+    def render(self, surface, camera_pos=(0, 0)):
         """Render the memory fragment."""
+        center_x = self.rect.centerx - camera_pos[0]
+        center_y = self.rect.centery - camera_pos[1]
+        
         # Draw a glowing orb
         glow_radius = 15 + (self.glow_value / 10)
         glow_color = (200, 200, 255, 50 + self.glow_value)
@@ -45,10 +48,10 @@ class MemoryFragment:
         pygame.draw.circle(glow_surface, glow_color, (glow_radius, glow_radius), glow_radius)
         
         # Blit the glow surface
-        surface.blit(glow_surface, (self.rect.centerx - glow_radius, self.rect.centery - glow_radius))
+        surface.blit(glow_surface, (center_x - glow_radius, center_y - glow_radius))
         
         # Draw the core
-        pygame.draw.circle(surface, (255, 255, 255), self.rect.center, 5)
+        pygame.draw.circle(surface, (255, 255, 255), (center_x, center_y), 5)
 
 class Enemy:
     def __init__(self, x, y, enemy_type, patrol_radius=100):
@@ -2,6 +2,11 @@ import pygame
 import json
 import os
 import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .infinite_world_updated import InfiniteWorld
+from .sim_clock import SimClock
+from .work_scheduler import WorkScheduler
 from .constants import *
 
 class LevelSystem:
@@ -50,10 +55,21 @@ class LevelSystem:
         self.high_scores = [0] * self.max_level
         self.load_high_scores()
         
+        # Builds levels ahead of time, one at a time
+        self.loader = ThreadPoolExecutor(max_workers=1)
+        
     def get_current_level_data(self):
         """Get data for the current level"""
         return self.levels[self.current_level - 1]
         
+    def prepare_level(self, services, warden_speed):
+        """Start building the current level's world in the background and return the LevelBuild."""
+        return LevelBuild(self.loader, services, self.get_current_level_data(), warden_speed)
+        
+    def shutdown(self):
+        """Stop the loader's worker once the game quits, letting a build it is in the middle of finish."""
+        self.loader.shutdown(wait=True)
+        
     def advance_level(self):
         """Advance to the next level if possible"""
         if self.current_level < self.max_level:
@@ -96,10 +112,66 @@ class LevelSystem:
         except Exception as e:
             print(f"Error loading high scores: {e}")
             
+class LevelBuild:
+    def __init__(self, loader, services, level_data, warden_speed):
+        """A level's world, built on the loader's worker while the story and transition screens show.
+        
+        The world is made with its own clock and scheduler, and every chunk
+        in generation range of the spawn point is generated before it is
+        handed over, so GameEngine (given this as level) starts with nothing
+        left to build. progress goes from 0 to 1 as the chunks are made.
+        
+        Only chunk generation runs on the worker. The world textures are
+        pygame drawing, so they are made here on the main thread the first
+        time (and shared through services after that).
+        """
+        if services.world_textures is None:
+            services.world_textures = InfiniteWorld.create_textures()
+        
+        self.level_data = level_data
+        self.warden_speed = warden_speed
+        self.sim_clock = SimClock()
+        self.scheduler = WorkScheduler(FRAME_WORK_BUDGET)
+        self.world = None
+        self.progress = 0.0
+        self.build_time = None  # milliseconds, once built
+        self.future = loader.submit(self._build, services)
+        
+    def _build(self, services):
+        started = time.perf_counter()
+        world = InfiniteWorld(services.sound_manager, self.warden_speed,
+                              self.level_data["ritual_items_required"],
+                              self.level_data["enemy_count"],
+                              self.sim_clock, scheduler=self.scheduler,
+                              textures=services.world_textures)
+        spawn = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+        world.update_active_chunks(spawn)
+        
+        # Generate the queued chunks one at a time, to report progress
+        total = self.scheduler.backlog()
+        while self.scheduler.backlog():
+            self.scheduler.run(0)
+            self.progress = 1 - self.scheduler.backlog() / total
+        world.update_active_chunks(spawn)
+        
+        self.world = world
+        self.progress = 1.0
+        self.build_time = (time.perf_counter() - started) * 1000
+        
+    def done(self):
+        """Check if the world is ready (or failed to build)."""
+        return self.future.done()
+        
+    def result(self):
+        """Return the world, waiting for it if it isn't built yet; raises what the build raised."""
+        self.future.result()
+        return self.world
+            
 class LevelTransitionScreen:
-    def __init__(self, screen, level_data):
+    def __init__(self, screen, level_data, level=None):
         self.screen = screen
         self.level_data = level_data
+        self.level = level  # LevelBuild being loaded, if any
         self.font_large = pygame.font.Font(None, 48)
         self.font_medium = pygame.font.Font(None, 36)
         self.font_small = pygame.font.Font(None, 24)
@@ -127,15 +199,28 @@ class LevelTransitionScreen:
         items_text = self.font_small.render(f"Ritual Items Required: {self.level_data['ritual_items_required']}", True, (200, 200, 200))
         self.screen.blit(items_text, (SCREEN_WIDTH // 2 - items_text.get_width() // 2, 320))
         
+        # Draw loading progress while the level is still being built
+        if not self.ready():
+            pygame.draw.rect(self.screen, (50, 50, 50), (SCREEN_WIDTH // 2 - 100, 460, 200, 10))
+            pygame.draw.rect(self.screen, (200, 50, 200), (SCREEN_WIDTH // 2 - 100, 460, 200 * self.level.progress, 10))
+        
         # Draw continue prompt
-        if self.timer > 100:
+        if self.done and not self.ready():
+            loading_text = self.font_small.render("Preparing level...", True, (150, 150, 150))
+            self.screen.blit(loading_text, (SCREEN_WIDTH // 2 - loading_text.get_width() // 2, 400))
+        elif self.timer > 100:
             alpha = min(255, (self.timer - 100) * 2)
             continue_text = self.font_small.render("Press any key to begin...", True, (150, 150, 150))
             continue_text.set_alpha(alpha)
             self.screen.blit(continue_text, (SCREEN_WIDTH // 2 - continue_text.get_width() // 2, 400))
             
+    def ready(self):
+        """Check if the level being loaded (if any) is built."""
+        return self.level is None or self.level.done()
+            
     def handle_events(self, events):
+        """Return True once the player has moved on and the level is ready."""
         for event in events:
             if event.type == pygame.KEYDOWN and self.timer > 100:
                 self.done = True
-        return self.done
\ No newline at end of file
+        return self.done and self.ready()
\ No newline at end of file
@@ -0,0 +1,104 @@
+import os
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from game.level_system import LevelSystem, LevelBuild
+from game.engine_new import GameEngine
+from game.level import MemoryFragment
+from game.services import GameServices
+from game.constants import *
+
+class LevelBuildTest(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.services = GameServices(pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT)))
+        self.addCleanup(self.services.shutdown)
+        self.loader = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(self.loader.shutdown)
+        self.level_data = LevelSystem().get_current_level_data()
+
+    def test_builds_every_chunk_in_generation_range(self):
+        build = LevelBuild(self.loader, self.services, self.level_data, 1.5)
+        world = build.result()
+        self.assertTrue(build.done())
+        self.assertEqual(build.progress, 1.0)
+        self.assertGreater(build.build_time, 0)
+        self.assertEqual(build.scheduler.backlog(), 0)
+        self.assertIs(world.sim_clock, build.sim_clock)
+        self.assertIs(world.scheduler, build.scheduler)
+
+        reach = world.generation_distance
+        for x in range(-reach, reach + 1):
+            for y in range(-reach, reach + 1):
+                self.assertIn((x, y), world.chunks)
+        self.assertEqual(world.ritual_items_required, self.level_data["ritual_items_required"])
+
+    def test_textures_are_made_before_the_worker_starts(self):
+        self.assertIsNone(self.services.world_textures)
+
+        # Hold the worker until the build has been handed over
+        blocker = self.loader.submit(lambda: None)
+        build = LevelBuild(self.loader, self.services, self.level_data, 1.5)
+        self.assertIsNotNone(self.services.world_textures)
+        blocker.result()
+
+        world = build.result()
+        self.assertIs(world.portal_texture, self.services.world_textures["portal_texture"])
+
+    def test_failed_build_raises_from_result(self):
+        build = LevelBuild(self.loader, self.services, {}, 1.5)
+        with self.assertRaises(KeyError):
+            build.result()
+        self.assertTrue(build.done())
+
+class LevelSystemTest(unittest.TestCase):
+    def test_next_level_reuses_the_services_and_starts_afresh(self):
+        pygame.init()
+        services = GameServices(pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT)))
+        self.addCleanup(services.shutdown)
+        levels = LevelSystem()
+        self.addCleanup(levels.shutdown)
+
+        first = GameEngine(1.5, levels.get_current_level_data(), services=services,
+                           level=levels.prepare_level(services, 1.5))
+        first.sound_manager.play_sound("echo")
+        first.echo_reverb.emit(first.world.emit_echo(first.player.rect.center))
+        first.memory_manager.trigger_memory(MemoryFragment(0, 0, "fire", None))
+        self.assertTrue(first.sound_manager.pending)
+        textures = services.world_textures
+
+        levels.advance_level()
+        second = GameEngine(1.5, levels.get_current_level_data(), services=services,
+                            level=levels.prepare_level(services, 1.5))
+
+        # Shared between levels
+        self.assertIs(second.sound_manager, first.sound_manager)
+        self.assertIs(second.echo_reverb, first.echo_reverb)
+        self.assertIs(second.light_map, first.light_map)
+        self.assertIs(second.font, services.font)
+        self.assertIs(second.memory_manager.font, services.memory_font)
+        self.assertIs(second.door_indicator.font, services.small_font)
+        self.assertIs(second.world.portal_texture, textures["portal_texture"])
+        self.assertIs(second.player.sprites, first.player.sprites)
+
+        # Made again, or cleared, for each level
+        self.assertIsNot(second.world, first.world)
+        self.assertIsNot(second.sim_clock, first.sim_clock)
+        self.assertIsNot(second.scheduler, first.scheduler)
+        self.assertIsNone(second.memory_manager.current_memory)
+        self.assertEqual(second.sound_manager.pending, {})
+        self.assertIsNone(second.echo_reverb.mixing)
+        self.assertEqual(second.game_state, "PLAYING")
+
+    def test_shutdown_stops_the_loader(self):
+        levels = LevelSystem()
+        levels.shutdown()
+        with self.assertRaises(RuntimeError):
+            levels.loader.submit(print)
+
+if __name__ == "__main__":
+    unittest.main()
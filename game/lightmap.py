@@ -0,0 +1,73 @@
+import pygame
+import numpy as np
+from .constants import *
+
+class LightMap:
+    def __init__(self, width=SCREEN_WIDTH, height=SCREEN_HEIGHT, scale=LIGHTMAP_SCALE,
+                 ambient=AMBIENT_LIGHT, radii=(PLAYER_LIGHT_RADIUS, ECHO_LIGHT_RADIUS,
+                                               ITEM_LIGHT_RADIUS, PORTAL_LIGHT_RADIUS)):
+        """Low resolution darkness buffer built from cached light stamps."""
+        self.width = width
+        self.height = height
+        self.scale = scale
+        self.ambient = ambient
+
+        # Light is accumulated at low resolution and upscaled once per frame
+        cells_x = -(-width // scale)
+        cells_y = -(-height // scale)
+        self.buffer = pygame.Surface((cells_x, cells_y))
+        self.full = pygame.Surface((cells_x * scale, cells_y * scale))
+
+        # Falloff stamps keyed by (radius in cells, intensity level)
+        self.stamps = {}
+        for radius in radii:
+            self._build_stamps(self._to_cells(radius))
+
+    def _to_cells(self, radius):
+        return max(1, int(radius) // self.scale)
+
+    def _build_stamps(self, radius_cells):
+        """Precompute the radial falloff stamps for one radius."""
+        size = radius_cells * 2 + 1
+        coords = np.arange(size, dtype=np.float32) - radius_cells
+        distance = np.sqrt(coords[:, None] ** 2 + coords[None, :] ** 2) / radius_cells
+        falloff = np.clip(1.0 - distance * distance, 0.0, 1.0) ** 2
+
+        for level in range(1, LIGHT_LEVELS + 1):
+            values = (falloff * (255 * level / LIGHT_LEVELS)).astype(np.uint8)
+            rgb = np.repeat(values[:, :, None], 3, axis=2)
+            self.stamps[(radius_cells, level)] = pygame.surfarray.make_surface(rgb)
+
+    def clear(self):
+        """Reset the buffer to ambient light."""
+        self.buffer.fill((self.ambient, self.ambient, self.ambient))
+
+    def add_light(self, x, y, radius, intensity=255):
+        """Add a light at a screen position."""
+        level = int(intensity * LIGHT_LEVELS / 255)
+        if level <= 0:
+            return
+        level = min(level, LIGHT_LEVELS)
+
+        radius_cells = self._to_cells(radius)
+        stamp = self.stamps.get((radius_cells, level))
+        if stamp is None:
+            self._build_stamps(radius_cells)
+            stamp = self.stamps[(radius_cells, level)]
+
+        self.buffer.blit(stamp,
+                         (int(x) // self.scale - radius_cells, int(y) // self.scale - radius_cells),
+                         special_flags=pygame.BLEND_RGB_MAX)
+
+    def visibility(self, x, y):
+        """Return how lit a screen position is (0-255) above the ambient level."""
+        cell_x = int(x) // self.scale
+        cell_y = int(y) // self.scale
+        if not (0 <= cell_x < self.buffer.get_width() and 0 <= cell_y < self.buffer.get_height()):
+            return 0
+        return max(0, self.buffer.get_at((cell_x, cell_y))[0] - self.ambient)
+
+    def apply(self, screen):
+        """Darken the screen by the light map with a single multiply blend."""
+        pygame.transform.smoothscale(self.buffer, self.full.get_size(), self.full)
+        screen.blit(self.full, (0, 0), special_flags=pygame.BLEND_RGB_MULT)
@@ -0,0 +1,54 @@
+import os
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from game.lightmap import LightMap
+from game.constants import *
+
+class LightMapTest(unittest.TestCase):
+    def setUp(self):
+        self.light_map = LightMap(ambient=20)
+        self.light_map.clear()
+
+    def test_cleared_map_is_only_ambient(self):
+        self.assertEqual(self.light_map.visibility(400, 300), 0)
+        self.assertEqual(self.light_map.buffer.get_at((50, 37))[0], 20)
+
+    def test_light_fades_toward_its_radius(self):
+        self.light_map.add_light(400, 300, 100)
+        self.assertEqual(self.light_map.visibility(400, 300), 255 - 20)
+        self.assertGreater(self.light_map.visibility(440, 300), self.light_map.visibility(480, 300))
+        self.assertEqual(self.light_map.visibility(520, 300), 0)
+
+    def test_overlapping_lights_keep_the_brightest(self):
+        self.light_map.add_light(400, 300, 100, 128)
+        dim = self.light_map.visibility(400, 300)
+        self.assertGreater(dim, 0)
+        self.assertLess(dim, 255 - 20)
+
+        # A dimmer light on top takes nothing away, a brighter one wins
+        self.light_map.add_light(400, 300, 100, 64)
+        self.assertEqual(self.light_map.visibility(400, 300), dim)
+        self.light_map.add_light(440, 300, 100)
+        self.assertGreater(self.light_map.visibility(400, 300), dim)
+
+    def test_faint_light_adds_nothing(self):
+        self.light_map.add_light(400, 300, 100, 255 // LIGHT_LEVELS - 1)
+        self.assertEqual(self.light_map.visibility(400, 300), 0)
+
+    def test_new_radius_is_stamped_once(self):
+        count = len(self.light_map.stamps)
+        self.light_map.add_light(100, 100, 200)
+        self.light_map.add_light(600, 400, 200, 128)
+        self.assertEqual(len(self.light_map.stamps), count + LIGHT_LEVELS)
+        self.assertGreater(self.light_map.visibility(600, 400), 0)
+
+    def test_off_screen_position_is_dark(self):
+        self.light_map.add_light(0, 0, 300)
+        self.assertEqual(self.light_map.visibility(-10, 0), 0)
+        self.assertEqual(self.light_map.visibility(SCREEN_WIDTH + 10, 0), 0)
+
+if __name__ == "__main__":
+    unittest.main()
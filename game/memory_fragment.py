@@ -2,16 +2,24 @@ import pygame
 from .constants import *
 
 class MemoryFragmentManager:
-    def __init__(self):
+    def __init__(self, narrator=None, font=None):
         """Initialize the memory fragment manager."""
+        self.narrator = narrator  # Plays each memory's narration, if given
         self.current_memory = None
         self.display_timer = 0
         self.display_duration = 300  # frames (5 seconds)
         self.fade_in = 30  # frames for fade in
         self.fade_out = 30  # frames for fade out
         
-        # Load font
-        self.font = pygame.font.Font(None, 28)
+        # Shared font if given (see GameServices), else load one
+        self.font = font or pygame.font.Font(None, 28)
+        
+        # Full-screen overlay is static, so build it once
+        self.overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        self.overlay.fill((0, 0, 0, 200))
+        
+        # Rendered text lines for the current memory (built in trigger_memory)
+        self.text_lines = []
         
         # Memory content
         self.memories = {
@@ -41,6 +49,46 @@ class MemoryFragmentManager:
         """Trigger a memory fragment display."""
         self.current_memory = memory_fragment
         self.display_timer = 0
+        
+        # Word wrap and render the text once instead of every frame
+        memory_data = self.memories.get(memory_fragment.type, {"text": "A forgotten memory...", "image": None, "audio": None})
+        self.text_lines = self._layout_text(memory_data["text"])
+        
+        # Narration, usually loaded already as the player came near
+        if self.narrator:
+            self.narrator.play(memory_data["audio"])
+    
+    def preload_nearby(self, player_pos, fragments):
+        """Have the narration of uncollected fragments near the player loaded in the background."""
+        if self.narrator:
+            self.narrator.update(player_pos, [(fragment.rect.center, self.memories[fragment.type]["audio"])
+                                              for fragment in fragments
+                                              if not fragment.collected and fragment.type in self.memories])
+    
+    def _layout_text(self, text):
+        """Word wrap text to the screen width and render each line."""
+        words = text.split(' ')
+        lines = []
+        line = ""
+        for word in words:
+            test_line = line + word + " "
+            # Check if the line is too long
+            if self.font.size(test_line)[0] < SCREEN_WIDTH - 100:
+                line = test_line
+            else:
+                lines.append(line)
+                line = word + " "
+        lines.append(line)  # Add the last line
+        
+        # Pre-render each line centered on the screen
+        rendered = []
+        y_offset = SCREEN_HEIGHT // 2 - (len(lines) * 30) // 2
+        for line in lines:
+            text_surface = self.font.render(line, True, (255, 255, 255))
+            text_rect = text_surface.get_rect(center=(SCREEN_WIDTH // 2, y_offset))
+            rendered.append((text_surface, text_rect))
+            y_offset += 30
+        return rendered
     
     def update(self):
         """Update the memory display."""
@@ -54,49 +102,15 @@ class MemoryFragmentManager:
     def render(self, surface):
         """Render the current memory fragment."""
         if self.current_memory:
-            # Calculate alpha based on fade in/out
-            if self.display_timer < self.fade_in:
-                alpha = int(255 * (self.display_timer / self.fade_in))
-            elif self.display_timer > self.display_duration - self.fade_out:
-                alpha = int(255 * ((self.display_duration - self.display_timer) / self.fade_out))
-            else:
-                alpha = 255
-            
-            # Create a semi-transparent overlay
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 200))
-            surface.blit(overlay, (0, 0))
-            
-            # Get memory content
-            memory_type = self.current_memory.type
-            memory_data = self.memories.get(memory_type, {"text": "A forgotten memory...", "image": None, "audio": None})
-            
-            # Render memory text
-            text = memory_data["text"]
-            
-            # Word wrap the text
-            words = text.split(' ')
-            lines = []
-            line = ""
-            for word in words:
-                test_line = line + word + " "
-                # Check if the line is too long
-                if self.font.size(test_line)[0] < SCREEN_WIDTH - 100:
-                    line = test_line
-                else:
-                    lines.append(line)
-                    line = word + " "
-            lines.append(line)  # Add the last line
+            # Darken whatever is behind the memory
+            surface.blit(self.overlay, (0, 0))
             
-            # Render each line
-            y_offset = SCREEN_HEIGHT // 2 - (len(lines) * 30) // 2
-            for line in lines:
-                text_surface = self.font.render(line, True, (255, 255, 255, alpha))
-                text_rect = text_surface.get_rect(center=(SCREEN_WIDTH // 2, y_offset))
+            # Blit the pre-rendered text lines
+            for text_surface, text_rect in self.text_lines:
                 surface.blit(text_surface, text_rect)
-                y_offset += 30
             
             # If there's an image, render it
+            memory_data = self.memories.get(self.current_memory.type, {"image": None})
             if memory_data["image"]:
                 # This would load and display an image in a real implementation
                 pass
@@ -0,0 +1,150 @@
+import io
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+from .constants import *
+
+class NarrationCache:
+    def __init__(self, budget):
+        """Loaded narration clips, dropping the least recently used past a size budget in bytes."""
+        self.budget = budget
+        self.clips = OrderedDict()  # file name -> (clip, size)
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, name):
+        """Return a cached clip (marking it recently used), or None."""
+        entry = self.clips.get(name)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.clips.move_to_end(name)
+        return entry[0]
+
+    def put(self, name, clip, size):
+        """Cache a clip, making room by dropping the least recently used ones."""
+        if name in self.clips:
+            self.used -= self.clips.pop(name)[1]
+        self.clips[name] = (clip, size)
+        self.used += size
+        while self.used > self.budget and len(self.clips) > 1:
+            _, (_, dropped) = self.clips.popitem(last=False)
+            self.used -= dropped
+            self.evictions += 1
+
+class Narrator:
+    def __init__(self, channel=None, audio_dir=None, preload_distance=NARRATION_PRELOAD_DISTANCE,
+                 budget=NARRATION_CACHE_BUDGET, stream_size=NARRATION_STREAM_SIZE):
+        """Plays memory narration, loading it in the background before it is needed.
+
+        Clips up to stream_size bytes are decoded into a Sound. Longer ones
+        are only read into memory and streamed through pygame.mixer.music
+        when played, so they are never decoded whole. Loading happens on a
+        worker thread once the player comes within preload_distance of a
+        fragment; finished loads are picked up by update() on the main
+        thread, which is the only one touching the cache.
+
+        Decoded clips play on channel (such as the sound manager's narration
+        channel), or on any free one if none is given.
+        """
+        self.channel = channel
+        self.audio_dir = audio_dir or os.path.join(os.path.dirname(__file__), "assets", "audio")
+        self.preload_distance = preload_distance
+        self.stream_size = stream_size
+        self.cache = NarrationCache(budget)
+        self.loader = ThreadPoolExecutor(max_workers=1)
+        self.loading = {}  # file name -> Future
+        self.missing = set()  # Files that don't exist or couldn't be loaded
+
+    def update(self, player_pos, sources=()):
+        """Start loading the clips of (position, file name) sources near the player and collect finished loads."""
+        reach = self.preload_distance * self.preload_distance
+        for position, name in sources:
+            dx = position[0] - player_pos[0]
+            dy = position[1] - player_pos[1]
+            if dx*dx + dy*dy <= reach:
+                self.preload(name)
+
+        for name, future in list(self.loading.items()):
+            if future.done():
+                del self.loading[name]
+                self._store(name, future.result())
+
+    def preload(self, name):
+        """Load a clip on the worker thread unless it is cached, loading or missing."""
+        if not name or name in self.loading or name in self.missing or name in self.cache.clips:
+            return
+        self.loading[name] = self.loader.submit(self._load, os.path.join(self.audio_dir, name))
+
+    def _load(self, path):
+        """Read or decode a clip (runs on the worker thread); return (clip, size) or None."""
+        try:
+            size = os.path.getsize(path)
+            with open(path, "rb") as f:
+                data = f.read()
+            if size > self.stream_size:
+                return data, size
+            sound = pygame.mixer.Sound(io.BytesIO(data))
+            frequency, bits, channels = pygame.mixer.get_init()
+            return sound, int(sound.get_length() * frequency) * abs(bits) // 8 * channels
+        except (OSError, pygame.error):
+            return None
+
+    def _store(self, name, loaded):
+        if loaded is None:
+            self.missing.add(name)
+        else:
+            self.cache.put(name, *loaded)
+
+    def play(self, name, volume=1.0):
+        """Play a clip, waiting for it if it's still loading; return False if there is nothing to play."""
+        if not name or name in self.missing:
+            return False
+        if name in self.loading:
+            self._store(name, self.loading.pop(name).result())
+        clip = self.cache.get(name)
+        if clip is None:
+            self._store(name, self._load(os.path.join(self.audio_dir, name)))
+            clip = self.cache.get(name)
+            if clip is None:
+                return False
+
+        if isinstance(clip, bytes):
+            # Long clip: stream it from memory rather than decoding it all
+            pygame.mixer.music.load(io.BytesIO(clip))
+            pygame.mixer.music.set_volume(volume)
+            pygame.mixer.music.play()
+        else:
+            channel = self.channel or pygame.mixer.find_channel(True)
+            if channel:
+                channel.set_volume(volume)
+                channel.play(clip)
+        return True
+
+    def reset(self):
+        """Drop loads that haven't started (such as when a level ends); loaded clips stay cached."""
+        for future in self.loading.values():
+            future.cancel()
+        self.loading = {}
+
+    def shutdown(self):
+        """Stop the worker thread once the game is over, waiting for a load it is in the middle of."""
+        self.reset()
+        self.loader.shutdown(wait=True)
+
+    def report(self):
+        """Return how much memory the cached narration uses against its budget, in bytes."""
+        return {
+            "clips": len(self.cache.clips),
+            "used": self.cache.used,
+            "budget": self.cache.budget,
+            "loading": len(self.loading),
+            "missing": len(self.missing),
+            "hits": self.cache.hits,
+            "misses": self.cache.misses,
+            "evictions": self.cache.evictions,
+        }
@@ -0,0 +1,97 @@
+import os
+import shutil
+import tempfile
+import unittest
+import wave
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from game.narration import Narrator, NarrationCache
+from game.memory_fragment import MemoryFragmentManager
+from game.level import MemoryFragment
+from game.constants import *
+
+class NarrationCacheTest(unittest.TestCase):
+    def test_evicts_least_recently_used_past_the_budget(self):
+        cache = NarrationCache(100)
+        cache.put("a", "clip a", 40)
+        cache.put("b", "clip b", 40)
+        self.assertEqual(cache.get("a"), "clip a")
+        cache.put("c", "clip c", 40)
+        self.assertEqual(list(cache.clips), ["a", "c"])
+        self.assertEqual(cache.used, 80)
+        self.assertEqual(cache.evictions, 1)
+        self.assertIsNone(cache.get("b"))
+
+    def test_keeps_a_single_clip_over_the_budget(self):
+        cache = NarrationCache(100)
+        cache.put("a", "clip a", 40)
+        cache.put("big", "clip big", 150)
+        self.assertEqual(list(cache.clips), ["big"])
+
+class NarratorTest(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.audio_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.audio_dir)
+
+        # Half a second of silence in the mixer's format
+        frequency, bits, channels = pygame.mixer.get_init()
+        self.path = os.path.join(self.audio_dir, "memory_fire.wav")
+        with wave.open(self.path, "wb") as f:
+            f.setnchannels(channels)
+            f.setsampwidth(2)
+            f.setframerate(frequency)
+            f.writeframes(bytes(frequency // 2 * channels * 2))
+
+    def make_narrator(self, **kwargs):
+        narrator = Narrator(audio_dir=self.audio_dir, **kwargs)
+        self.addCleanup(narrator.shutdown)
+        return narrator
+
+    def test_fragment_in_reach_is_loaded(self):
+        narrator = self.make_narrator()
+        manager = MemoryFragmentManager(narrator)
+        near = MemoryFragment(NARRATION_PRELOAD_DISTANCE - 50, 0, "fire", None)
+        far = MemoryFragment(NARRATION_PRELOAD_DISTANCE + 50, 0, "warden", None)
+        manager.preload_nearby((0, 0), [near, far])
+        self.assertNotIn("memory_warden.wav", narrator.loading)
+
+        # The load may already have been collected by the same update
+        if "memory_fire.wav" in narrator.loading:
+            narrator.loading["memory_fire.wav"].result()
+            manager.preload_nearby((0, 0), [near, far])
+        self.assertEqual(narrator.loading, {})
+        self.assertIsInstance(narrator.cache.get("memory_fire.wav"), pygame.mixer.Sound)
+        self.assertNotIn("memory_warden.wav", narrator.missing)
+
+    def test_collected_fragment_is_not_loaded(self):
+        narrator = self.make_narrator()
+        fragment = MemoryFragment(0, 0, "fire", None)
+        fragment.collected = True
+        MemoryFragmentManager(narrator).preload_nearby((0, 0), [fragment])
+        self.assertEqual(narrator.loading, {})
+
+    def test_long_clip_is_kept_as_bytes(self):
+        narrator = self.make_narrator(stream_size=1024)
+        clip, size = narrator._load(self.path)
+        self.assertIsInstance(clip, bytes)
+        self.assertEqual(size, os.path.getsize(self.path))
+
+    def test_missing_clip_plays_nothing(self):
+        narrator = self.make_narrator()
+        self.assertFalse(narrator.play("memory_nowhere.wav"))
+        self.assertIn("memory_nowhere.wav", narrator.missing)
+
+    def test_shutdown_stops_the_worker(self):
+        narrator = self.make_narrator()
+        narrator.preload("memory_fire.wav")
+        narrator.shutdown()
+        self.assertEqual(narrator.loading, {})
+        with self.assertRaises(RuntimeError):
+            narrator.loader.submit(print)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import numpy as np
+from .constants import *
+
+# Distance marker for cells a search never reached
+UNREACHED = np.iinfo(np.int32).max
+
+def stitch_grids(chunks, chunk_size, left, top, right, bottom):
+    """Combine the occupancy grids of every chunk overlapping a world area.
+
+    Returns the combined uint8 material array and the world position of its
+    top-left corner. Chunks that have not been generated count as empty.
+    """
+    first_x = int(left // chunk_size)
+    first_y = int(top // chunk_size)
+    last_x = int(right // chunk_size)
+    last_y = int(bottom // chunk_size)
+
+    cells = chunk_size // GRID_CELL_SIZE
+    materials = np.zeros(((last_y - first_y + 1) * cells, (last_x - first_x + 1) * cells), dtype=np.uint8)
+    for chunk_x in range(first_x, last_x + 1):
+        for chunk_y in range(first_y, last_y + 1):
+            chunk = chunks.get((chunk_x, chunk_y))
+            if chunk is not None:
+                row = (chunk_y - first_y) * cells
+                col = (chunk_x - first_x) * cells
+                materials[row:row + cells, col:col + cells] = chunk.grid
+
+    return materials, (first_x * chunk_size, first_y * chunk_size)
+
+def grid_distances(free, start, max_steps=None):
+    """Breadth-first step counts from a start cell through free cells.
+
+    free is a boolean array of walkable cells and start a (column, row)
+    index; cells that can't be reached (or lie beyond max_steps) are set to
+    UNREACHED. The search advances one whole wavefront per step.
+    """
+    distance = np.full(free.shape, UNREACHED, dtype=np.int32)
+    frontier = np.zeros(free.shape, dtype=bool)
+    frontier[start[1], start[0]] = True
+    distance[frontier] = 0
+    step = 0
+    while frontier.any() and (max_steps is None or step < max_steps):
+        step += 1
+        reached = np.zeros_like(frontier)
+        reached[1:, :] |= frontier[:-1, :]
+        reached[:-1, :] |= frontier[1:, :]
+        reached[:, 1:] |= frontier[:, :-1]
+        reached[:, :-1] |= frontier[:, 1:]
+        reached &= free & (distance == UNREACHED)
+        distance[reached] = step
+        frontier = reached
+    return distance
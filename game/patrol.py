@@ -0,0 +1,29 @@
+import math
+import pygame
+
+class Patrol:
+    __slots__ = ("x", "y", "radius", "angular_speed", "phase", "area", "active")
+
+    def __init__(self, x, y, radius, angular_speed, phase=0.0, size=32):
+        """Circular patrol around (x, y) as a pure function of time.
+
+        angular_speed is in radians per millisecond and phase in radians, so
+        the patroller's position can be worked out for any moment without
+        having moved it every frame in between.
+        """
+        self.x = x
+        self.y = y
+        self.radius = radius
+        self.angular_speed = angular_speed
+        self.phase = phase
+
+        # Area a size x size patroller covers over a whole orbit
+        self.area = pygame.Rect(x - radius, y - radius, radius * 2 + size, radius * 2 + size)
+
+        # False while the patroller is off chasing something
+        self.active = True
+
+    def position(self, ticks):
+        """Return the patroller's top-left position at a time in milliseconds."""
+        angle = ticks * self.angular_speed + self.phase
+        return self.x + math.cos(angle) * self.radius, self.y + math.sin(angle) * self.radius
@@ -0,0 +1,92 @@
+import os
+import math
+import random
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from game.patrol import Patrol
+from game.entities import Renderable
+from game.infinite_world_updated import Chunk, InfiniteWorld
+from game.level import Surface
+from game.constants import *
+
+class PatrolTest(unittest.TestCase):
+    def test_position_depends_only_on_the_time(self):
+        patrol = Patrol(500, 300, 50, 1 / 5000, 2.0)
+        again = Patrol(500, 300, 50, 1 / 5000, 2.0)
+        for ticks in (0, 16, 12345, 10 ** 7):
+            self.assertEqual(patrol.position(ticks), again.position(ticks))
+            self.assertEqual(patrol.position(ticks), patrol.position(ticks))
+
+        x, y = patrol.position(12345)
+        self.assertAlmostEqual(math.hypot(x - 500, y - 300), 50)
+        period = 2 * math.pi / patrol.angular_speed
+        for a, b in zip(patrol.position(12345), patrol.position(12345 + period)):
+            self.assertAlmostEqual(a, b)
+
+    def test_orbit_stays_inside_its_area(self):
+        patrol = Patrol(500, 300, 30, 1 / 4000, 7)
+        for ticks in range(0, 26000, 50):
+            x, y = patrol.position(ticks)
+            self.assertTrue(patrol.area.contains(pygame.Rect(math.floor(x), math.floor(y), 32, 32)))
+
+class PatrolWallTest(unittest.TestCase):
+    def test_orbit_is_shrunk_to_keep_off_a_wall(self):
+        chunk = Chunk(0, 0)
+        wall = pygame.Rect(570, 300, 100, 100)
+        chunk.obstacles.append(Surface(wall, "stone"))
+        phantom = chunk.create_enemy(PHANTOM, 500, 330)
+        patrol = chunk.entities.table(Patrol)[phantom]
+        self.assertLess(patrol.radius, 50)
+        self.assertFalse(patrol.area.colliderect(wall))
+        for ticks in range(0, 32000, 100):
+            self.assertFalse(wall.colliderect((*patrol.position(ticks), 32, 32)))
+
+    def test_orbit_keeps_its_radius_in_the_open(self):
+        chunk = Chunk(0, 0)
+        crawler = chunk.create_enemy(CRAWLER, 500, 500)
+        self.assertEqual(chunk.entities.table(Patrol)[crawler].radius, 30)
+
+    def test_boxed_in_patroller_stands_still(self):
+        chunk = Chunk(0, 0)
+        chunk.obstacles.append(Surface(pygame.Rect(460, 500, 20, 20), "wood"))
+        chunk.obstacles.append(Surface(pygame.Rect(540, 500, 20, 20), "wood"))
+        phantom = chunk.create_enemy(PHANTOM, 500, 500)
+        patrol = chunk.entities.table(Patrol)[phantom]
+        self.assertEqual(patrol.radius, 0)
+        self.assertEqual(patrol.position(1234), (500, 500))
+
+class PatrolCullingTest(unittest.TestCase):
+    def test_culled_collision_check_matches_stepping_every_patroller(self):
+        pygame.init()
+        random.seed(6)
+        world = InfiniteWorld(None)
+        world.update_active_chunks((500, 500))
+        world.sim_clock.advance(3000)
+        for other in world.active_chunks:
+            other.enemies = []
+        chunk = world.chunks[(0, 0)]
+        chunk.obstacles = []
+        for _ in range(40):
+            chunk.create_enemy(random.choice([PHANTOM, CRAWLER]), random.randint(100, 900), random.randint(100, 900))
+        patrols = world.entities.table(Patrol)
+        renderables = world.entities.table(Renderable)
+
+        for _ in range(100):
+            world.sim_clock.advance(random.randint(1, 500))
+            player = pygame.Rect(random.randint(50, 950), random.randint(50, 950), 32, 32)
+
+            # Every patroller moved to where it is now, with no culling
+            stepped = None
+            for entity in chunk.enemies:
+                x, y = patrols[entity].position(world.sim_clock.now())
+                if pygame.Rect(x - 5, y - 5, 42, 42).colliderect(player):
+                    stepped = renderables[entity].kind
+                    break
+            self.assertEqual(world.check_enemy_collision(player), stepped)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,16 @@
 import pygame
 import math
 import os
+from .sim_clock import SimClock
 from .constants import *
 
 class AnimatedPlayer:
-    def __init__(self, x, y, sound_manager):
-        """Initialize the player character with animations."""
+    def __init__(self, x, y, sound_manager, sim_clock=None, sprites=None):
+        """Initialize the player character with animations.
+        
+        sprites are the animation frames of an earlier player, to reuse
+        instead of drawing them again.
+        """
         self.x = x
         self.y = y
         self.width = 32
@@ -13,8 +18,9 @@ class AnimatedPlayer:
         self.rect = pygame.Rect(x, y, self.width, self.height)
         self.speed = PLAYER_SPEED
         self.sound_manager = sound_manager
-        self.last_sound_time = 0
+        self.sim_clock = sim_clock or SimClock()
         self.sound_cooldown = SOUND_COOLDOWN
+        self.last_sound_time = -self.sound_cooldown  # Ready to echo right away
         
         # Game stats
         self.score = 0
@@ -24,12 +30,16 @@ class AnimatedPlayer:
         # Animation state
         self.direction = "down"  # down, up, left, right
         self.moving = False
+        self.stepped = False  # True on frames where a footstep was heard
         self.frame = 0
         self.animation_speed = 0.15
-        self.last_update = pygame.time.get_ticks()
+        self.last_update = self.sim_clock.now()
         
         # Create sprite sheets
-        self._create_animations()
+        if sprites is None:
+            self._create_animations()
+        else:
+            self.sprites = sprites
     
     def _create_animations(self):
         """Create pixelated player animations."""
@@ -138,7 +148,8 @@ class AnimatedPlayer:
         self.rect.y = self.y
         
         # Update animation
-        current_time = pygame.time.get_ticks()
+        self.stepped = False
+        current_time = self.sim_clock.now()
         if self.moving and (current_time - self.last_update > 1000 * self.animation_speed):
             self.last_update = current_time
             self.frame = (self.frame + 1) % len(self.sprites[self.direction])
@@ -146,11 +157,12 @@ class AnimatedPlayer:
             # Play footstep sounds when moving
             if self.frame == 1 or self.frame == 3:
                 self.sound_manager.play_sound("footstep", 0.2)
+                self.stepped = True
     
     def emit_sound(self):
         """Emit a sound for echolocation if cooldown has passed."""
-        current_time = pygame.time.get_ticks()
-        if current_time - self.last_sound_time > self.sound_cooldown:
+        current_time = self.sim_clock.now()
+        if current_time - self.last_sound_time >= self.sound_cooldown:
             self.last_sound_time = current_time
             return True
         return False
@@ -2,6 +2,8 @@ import pygame
 import math
 
 class Projectile:
+    __slots__ = ("x", "y", "radius", "speed", "rect", "dx", "dy", "lifetime", "damage")
+    
     def __init__(self, x, y, target_x, target_y, speed=5.0):
         self.x = x
         self.y = y
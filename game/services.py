@@ -0,0 +1,49 @@
+import pygame
+from .asset_pack import AssetPack
+from .sound_manager import SoundManager
+from .echo_audio import EchoReverb
+from .narration import Narrator
+from .lightmap import LightMap
+from .constants import *
+
+class GameServices:
+    def __init__(self, screen=None, audio_config=None, assets=None):
+        """The parts of the game that outlive a level, made once and shared by every GameEngine.
+
+        That is the display, the asset pack, the sound manager with its
+        loaded and synthesised sounds, echo reverb and narration, the light
+        map, fonts, and the world textures and player sprites (filled in by
+        the first level to draw them). reset() clears what a level leaves
+        behind, so the next one starts from a quiet mixer.
+        """
+        self.screen = screen or pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption("Echoes of the Forgotten")
+
+        self.assets = AssetPack.open() if assets is None else assets
+        self.sound_manager = SoundManager(audio_config, self.assets)
+        self.echo_reverb = EchoReverb(self.sound_manager.sounds["echo"], self.sound_manager.audio_config)
+        self.narrator = Narrator(self.sound_manager.channels.channels["narration"][0])
+        self.light_map = LightMap()
+
+        self.font = pygame.font.Font(None, 24)
+        self.title_font = pygame.font.Font(None, 36)
+        self.memory_font = pygame.font.Font(None, 28)  # Memory fragment text
+        self.small_font = pygame.font.Font(None, 20)  # Exit door indicator
+
+        self.world_textures = None  # Texture attributes of InfiniteWorld, by name
+        self.player_sprites = None  # AnimatedPlayer animation frames, by direction
+
+    def reset(self):
+        """Stop whatever the last level left playing, mixing or loading."""
+        self.sound_manager.reset()
+        self.echo_reverb.reset()
+        self.narrator.reset()
+        pygame.mixer.music.stop()
+
+    def shutdown(self):
+        """Stop the background work of the services; call once when the game quits."""
+        self.reset()
+        self.echo_reverb.shutdown()
+        self.narrator.shutdown()
+        if self.assets is not None:
+            self.assets.close()
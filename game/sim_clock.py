@@ -0,0 +1,42 @@
+import math
+from .timer_wheel import TimerWheel
+from .constants import *
+
+class SimClock:
+    def __init__(self, step=1000 / FPS, scale=1.0):
+        """Simulation time in milliseconds since the level started.
+
+        Time only moves when tick() is called, by the same step every time, so
+        the game behaves the same when paused, replayed or run headless
+        faster than real time. scale is how many times faster than real time
+        the owner should call tick().
+
+        Cooldowns and delayed events are scheduled on the clock in ticks and
+        called back from tick() when they are due.
+        """
+        self.step = step
+        self.scale = scale
+        self.frame = 0
+        self.timers = TimerWheel()
+
+    def tick(self):
+        """Advance the simulation by one step and run the timers that are due."""
+        self.frame += 1
+        self.timers.advance()
+
+    def schedule(self, delay, callback, *args):
+        """Call callback(*args) after delay ticks and return the timer (to cancel it)."""
+        return self.timers.schedule(delay, callback, *args)
+
+    def advance(self, milliseconds):
+        """Advance the simulation by as many steps as it takes to cover some milliseconds."""
+        for _ in range(math.ceil(milliseconds / self.step)):
+            self.tick()
+
+    def now(self):
+        """Return the simulation time in whole milliseconds, like pygame.time.get_ticks()."""
+        return int(round(self.frame * self.step, 6))
+
+    def frame_rate(self):
+        """Return the ticks per real second needed to run at this clock's scale."""
+        return FPS * self.scale
@@ -2,14 +2,169 @@ import pygame
 import os
 import random
 import math
+import numpy as np
+from .audio_config import AudioConfig
 from .constants import *
 
+# Sound effects and the files they are loaded from (these files don't exist
+# yet, but will be placeholders)
+SOUND_FILES = {
+    "echo": "echo_ping.wav",
+    "footstep": "footstep.wav",
+    "warden_groan": "warden_groan.wav",
+    "door_creak": "door_creak.wav",
+    "memory_trigger": "memory_trigger.wav",
+    "heartbeat": "heartbeat.wav",
+    "whisper1": "whisper1.wav",
+    "whisper2": "whisper2.wav",
+    "whisper3": "whisper3.wav",
+    "key_pickup": "key_pickup.wav",
+    "obstacle_hit": "obstacle_hit.wav",
+    "victory": "victory.wav",
+}
+
+class Voice:
+    def __init__(self, sound, name, category, priority, volume, position=None, max_distance=300):
+        """A sound waiting to play or playing on one of the pool's channels.
+        
+        position is the world position of a spatial sound, which the owner
+        may move while it plays; None plays it centred at its own volume.
+        """
+        self.sound = sound
+        self.name = name
+        self.category = category
+        self.priority = priority
+        self.volume = volume
+        self.position = position
+        self.max_distance = max_distance
+        self.channel = None  # Set once it is playing
+        self.started = None
+    
+    def merge(self, volume, position):
+        """Take in another play of the same sound: the louder volume, and a position between the two"""
+        if self.position is None or position is None:
+            self.position = None
+        else:
+            weight = volume / (self.volume + volume) if self.volume + volume > 0 else 0.5
+            self.position = (self.position[0] + (position[0] - self.position[0]) * weight,
+                             self.position[1] + (position[1] - self.position[1]) * weight)
+        self.volume = max(self.volume, volume)
+
+class ChannelPool:
+    def __init__(self, channels_per_category):
+        """Mixer channels split between categories of sound.
+        
+        The channels are reserved so pygame never hands them out on its own,
+        and every play goes through a channel of the sound's category. When a
+        category is full, the new sound takes the channel of the least
+        important (then oldest) sound, unless that one matters more.
+        """
+        total = sum(channels_per_category.values())
+        pygame.mixer.set_num_channels(max(total, pygame.mixer.get_num_channels()))
+        pygame.mixer.set_reserved(total)
+        
+        self.channels = {}
+        index = 0
+        for category, count in channels_per_category.items():
+            self.channels[category] = [pygame.mixer.Channel(i) for i in range(index, index + count)]
+            index += count
+        self.voices = {}  # Channel -> Voice last played on it
+        
+        # Counters
+        self.played = 0
+        self.stolen = 0
+        self.dropped = 0
+    
+    def play(self, voice, listener_pos=None):
+        """Play a voice on a channel of its category and return the channel, or None if dropped"""
+        channel = self._free_channel(voice.category, voice.priority)
+        if channel is None:
+            self.dropped += 1
+            return None
+        
+        self.voices[channel] = voice
+        voice.channel = channel
+        voice.started = pygame.time.get_ticks()
+        channel.play(voice.sound)
+        self._apply_volume(channel, voice, listener_pos)
+        self.played += 1
+        return channel
+    
+    def refresh(self, voice, listener_pos):
+        """Apply a playing voice's changed volume or position straight away"""
+        if self.voices.get(voice.channel) is voice:
+            self._apply_volume(voice.channel, voice, listener_pos)
+    
+    def _free_channel(self, category, priority):
+        victim = None
+        for channel in self.channels[category]:
+            voice = self.voices.get(channel)
+            if voice is None or not channel.get_busy():
+                return channel
+            if victim is None or (voice.priority, voice.started) < (self.voices[victim].priority,
+                                                                   self.voices[victim].started):
+                victim = channel
+        
+        if victim is not None and self.voices[victim].priority <= priority:
+            victim.stop()
+            self.stolen += 1
+            return victim
+        return None
+    
+    def update(self, listener_pos):
+        """Recompute the left/right gains of the spatial voices still playing"""
+        for channel, voice in list(self.voices.items()):
+            if not channel.get_busy():
+                del self.voices[channel]
+            elif voice.position is not None:
+                self._apply_volume(channel, voice, listener_pos)
+    
+    def _apply_volume(self, channel, voice, listener_pos):
+        if voice.position is None or listener_pos is None:
+            channel.set_volume(voice.volume)
+            return
+        
+        # Fade with distance and pan toward the side the sound is on
+        dx = voice.position[0] - listener_pos[0]
+        dy = voice.position[1] - listener_pos[1]
+        distance = math.sqrt(dx*dx + dy*dy)
+        volume = voice.volume * max(0.0, 1.0 - distance / voice.max_distance)
+        pan = max(-1.0, min(1.0, dx / (voice.max_distance / 2)))
+        channel.set_volume(volume * min(1.0, 1.0 - pan), volume * min(1.0, 1.0 + pan))
+    
+    def stop(self):
+        """Stop every channel of the pool and forget what was played on them"""
+        for channels in self.channels.values():
+            for channel in channels:
+                channel.stop()
+        self.voices = {}
+    
+    def voices_in_use(self):
+        """Return how many channels are playing something"""
+        return sum(channel.get_busy() for channels in self.channels.values() for channel in channels)
+
 class SoundManager:
-    def __init__(self):
-        """Initialize the sound manager."""
+    def __init__(self, audio_config=None, assets=None):
+        """Initialize the sound manager.
+
+        Sounds come from the asset pack assets when it has them in the
+        mixer's format, then from loose files, then from generated
+        placeholders.
+        """
         # Ensure pygame mixer is initialized
-        if not pygame.mixer.get_init():
-            pygame.mixer.init()
+        self.audio_config = audio_config or AudioConfig()
+        self.audio_config.init()
+        self.assets = assets
+        
+        # Channels per category of sound
+        self.channels = ChannelPool(SOUND_CHANNELS)
+        self.listener_pos = None
+        
+        # Plays asked for this frame, sent to the mixer by flush(), and the
+        # sounds flushed last, by name
+        self.pending = {}
+        self.recent = {}
+        self.coalesced = 0
         
         # Sound effects dictionary
         self.sounds = {}
@@ -25,28 +180,23 @@ class SoundManager:
     
     def _load_sounds(self):
         """Load all sound effects."""
-        # Define sound paths (these files don't exist yet, but will be placeholders)
-        sound_files = {
-            "echo": "echo_ping.wav",
-            "footstep": "footstep.wav",
-            "warden_groan": "warden_groan.wav",
-            "door_creak": "door_creak.wav",
-            "memory_trigger": "memory_trigger.wav",
-            "heartbeat": "heartbeat.wav",
-            "whisper1": "whisper1.wav",
-            "whisper2": "whisper2.wav",
-            "whisper3": "whisper3.wav",
-            "key_pickup": "key_pickup.wav",
-            "obstacle_hit": "obstacle_hit.wav",
-            "victory": "victory.wav",
-        }
+        # Packed sounds need no file lookups at all
+        missing = dict(SOUND_FILES)
+        if self.assets is not None:
+            output_format = self.audio_config.output_format()
+            for sound_name, file_name in SOUND_FILES.items():
+                sound = self.assets.sound("audio/" + file_name, output_format)
+                if sound is not None:
+                    self.sounds[sound_name] = sound
+                    del missing[sound_name]
         
         # Create assets directory if it doesn't exist
         assets_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "game", "assets", "audio")
-        os.makedirs(assets_dir, exist_ok=True)
+        if missing:
+            os.makedirs(assets_dir, exist_ok=True)
         
         # Load each sound or create placeholder
-        for sound_name, file_name in sound_files.items():
+        for sound_name, file_name in missing.items():
             file_path = os.path.join(assets_dir, file_name)
             
             # Check if file exists
@@ -94,25 +244,18 @@ class SoundManager:
     def _generate_tone(self, frequency, duration):
         """Generate a simple tone as a placeholder sound."""
         # This is a simplified version - in a real game, you'd use actual sound files
-        sample_rate = 44100
+        sample_rate = self.audio_config.output_format()[0]
         n_samples = int(round(duration * sample_rate))
         
-        # Generate a simple sine wave
-        buf = bytearray(n_samples)
-        for i in range(n_samples):
-            # Simple fade in/out
-            if i < n_samples * 0.1:
-                amplitude = i / (n_samples * 0.1)
-            elif i > n_samples * 0.9:
-                amplitude = (n_samples - i) / (n_samples * 0.1)
-            else:
-                amplitude = 1.0
-                
-            buf[i] = 128 + int(amplitude * 127 * (0.5 if i % (sample_rate // frequency) < (sample_rate // frequency // 2) else -0.5))
+        # Square wave at half volume with a simple fade in/out
+        i = np.arange(n_samples)
+        period = sample_rate // frequency
+        wave = np.where(i % period < period // 2, 0.5, -0.5)
+        fade = n_samples * 0.1
+        amplitude = np.minimum(1.0, np.minimum(i / fade, (n_samples - i) / fade))
         
-        # Create a Sound object from the buffer
-        sound = pygame.mixer.Sound(buffer=bytes(buf))
-        return sound
+        # Create a Sound object in the mixer's own format
+        return self.audio_config.make_sound(wave * amplitude)
     
     def _save_placeholder_sound(self, sound_name, file_path):
         """Save placeholder sound to file for future use."""
@@ -120,49 +263,85 @@ class SoundManager:
         # For now, we'll skip saving placeholder files
         pass
     
-    def play_sound(self, sound_name, volume=1.0):
-        """Play a sound effect."""
-        if sound_name in self.sounds:
+    def set_sound(self, sound_name, sound):
+        """Add or replace a sound effect, such as one mixed while playing."""
+        self.sounds[sound_name] = sound
+    
+    def play_sound(self, sound_name, volume=1.0, category=None, priority=None):
+        """Play a sound effect at the end of the frame and return its Voice.
+        
+        Plays of the same sound in the same frame, or while the last one has
+        only just started, are merged into one Voice.
+        """
+        return self._play(sound_name, volume, category, priority)
+    
+    def play_spatial_sound(self, sound_name, source_pos, listener_pos, max_distance=300, category=None,
+                           priority=None):
+        """Play a sound panned and faded by where it is relative to the listener.
+        
+        The returned Voice's position can be moved while it plays; update()
+        follows it.
+        """
+        self.listener_pos = listener_pos
+        return self._play(sound_name, 1.0, category, priority, source_pos, max_distance)
+    
+    def _play(self, sound_name, volume, category, priority, position=None, max_distance=300):
+        if sound_name not in self.sounds:
+            return None
+        
+        # Merge with a play of the same sound that is queued or just started
+        # (and still has its channel, rather than having lost it to another sound)
+        voice = self.pending.get(sound_name)
+        if voice is None:
+            voice = self.recent.get(sound_name)
+            if voice is not None and (self.channels.voices.get(voice.channel) is not voice or
+                                      not voice.channel.get_busy() or
+                                      pygame.time.get_ticks() - voice.started > SOUND_COALESCE_WINDOW):
+                voice = None
+        if voice is not None:
+            voice.merge(volume, position)
+            if voice.channel is not None:
+                self.channels.refresh(voice, self.listener_pos)
+            self.coalesced += 1
+            return voice
+        
+        voice = Voice(self.sounds[sound_name], sound_name, category or SOUND_CATEGORIES.get(sound_name, "ui"),
+                      SOUND_PRIORITY.get(sound_name, 0) if priority is None else priority,
+                      volume, position, max_distance)
+        self.pending[sound_name] = voice
+        return voice
+    
+    def flush(self):
+        """Send the plays queued this frame to the mixer; call once at the end of every frame."""
+        for sound_name, voice in self.pending.items():
             try:
-                # Set volume and ensure channel is available
-                self.sounds[sound_name].set_volume(volume)
-                channel = pygame.mixer.find_channel(True)  # Force find a channel
-                if channel:
-                    channel.set_volume(volume)
-                    channel.play(self.sounds[sound_name])
-                else:
-                    # Fallback to normal play
-                    self.sounds[sound_name].play()
-            except Exception as e:
+                if self.channels.play(voice, self.listener_pos) is not None:
+                    self.recent[sound_name] = voice
+            except pygame.error as e:
                 print(f"Error playing sound {sound_name}: {e}")
+        self.pending = {}
     
-    def play_spatial_sound(self, sound_name, source_pos, listener_pos, max_distance=300):
-        """Play a sound with volume based on distance from listener."""
-        if sound_name in self.sounds:
-            # Calculate distance
-            dx = source_pos[0] - listener_pos[0]
-            dy = source_pos[1] - listener_pos[1]
-            distance = (dx**2 + dy**2)**0.5
-            
-            # Calculate volume based on distance
-            if distance >= max_distance:
-                volume = 0.0
-            else:
-                volume = 1.0 - (distance / max_distance)
-            
-            # Calculate stereo panning (-1.0 to 1.0)
-            if abs(dx) > 0.1:  # Avoid division by zero
-                pan = max(-1.0, min(1.0, dx / (max_distance / 2)))
-            else:
-                pan = 0.0
-            
-            # Play sound with calculated volume
-            self.sounds[sound_name].set_volume(volume)
-            
-            # Note: Pygame doesn't support true stereo panning natively
-            # In a real game, you'd use a more advanced audio library
-            # This is a simplified version
-            self.sounds[sound_name].play()
+    def update(self, listener_pos):
+        """Follow the listener and moving sources; call once per frame."""
+        self.listener_pos = listener_pos
+        self.channels.update(listener_pos)
+    
+    def reset(self):
+        """Stop every sound and drop queued plays, keeping the loaded sounds (such as between levels)."""
+        self.channels.stop()
+        self.pending = {}
+        self.recent = {}
+        self.listener_pos = None
+    
+    def stats(self):
+        """Return the voice counters of the channel pool."""
+        return {
+            "in_use": self.channels.voices_in_use(),
+            "played": self.channels.played,
+            "stolen": self.channels.stolen,
+            "dropped": self.channels.dropped,
+            "coalesced": self.coalesced,
+        }
     
     def update_ambient_sounds(self, player_pos):
         """Update ambient sounds based on time and player position."""
@@ -0,0 +1,92 @@
+import os
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+from game.sound_manager import SoundManager, ChannelPool, Voice
+
+class SoundTestCase(unittest.TestCase):
+    def setUp(self):
+        self.manager = SoundManager()
+        self.addCleanup(self.manager.reset)
+
+        # Silence long enough to still be playing when each test checks
+        sample_rate = self.manager.audio_config.output_format()[0]
+        self.long_sound = self.manager.audio_config.make_sound(np.zeros(sample_rate * 2))
+
+    def voice(self, category, priority, name="long"):
+        return Voice(self.long_sound, name, category, priority, 1.0)
+
+class ChannelPoolTest(SoundTestCase):
+    def setUp(self):
+        super().setUp()
+        self.pool = ChannelPool({"a": 2, "b": 1})
+        self.addCleanup(self.pool.stop)
+
+    def test_categories_have_their_own_channels(self):
+        first = self.pool.play(self.voice("a", 1))
+        second = self.pool.play(self.voice("a", 1))
+        other = self.pool.play(self.voice("b", 1))
+        self.assertIn(first, self.pool.channels["a"])
+        self.assertIn(second, self.pool.channels["a"])
+        self.assertIsNot(first, second)
+        self.assertEqual(self.pool.channels["b"], [other])
+        self.assertEqual(self.pool.voices_in_use(), 3)
+
+    def test_full_category_takes_the_least_important_channel(self):
+        low = self.voice("a", 1)
+        high = self.voice("a", 5)
+        self.pool.play(low)
+        self.pool.play(high)
+        urgent = self.voice("a", 3)
+        self.assertIs(self.pool.play(urgent), low.channel)
+        self.assertIs(self.pool.voices[low.channel], urgent)
+        self.assertEqual(self.pool.stolen, 1)
+
+    def test_full_category_drops_a_less_important_sound(self):
+        self.pool.play(self.voice("b", 5))
+        self.assertIsNone(self.pool.play(self.voice("b", 4)))
+        self.assertEqual(self.pool.dropped, 1)
+        self.assertEqual(self.pool.played, 1)
+
+class CoalescingTest(SoundTestCase):
+    def setUp(self):
+        super().setUp()
+        self.manager.set_sound("long", self.long_sound)
+
+    def test_plays_in_one_frame_are_merged(self):
+        first = self.manager.play_spatial_sound("long", (0, 0), (0, 0))
+        second = self.manager.play_spatial_sound("long", (100, 0), (0, 0))
+        self.assertIs(first, second)
+        self.manager.flush()
+        self.assertEqual(self.manager.stats()["played"], 1)
+        self.assertEqual(self.manager.stats()["coalesced"], 1)
+        self.assertEqual(first.position, (50, 0))
+
+    def test_play_just_after_a_flush_joins_the_playing_voice(self):
+        first = self.manager.play_sound("long", 0.5)
+        self.manager.flush()
+        second = self.manager.play_sound("long", 0.8)
+        self.assertIs(first, second)
+        self.assertEqual(first.volume, 0.8)
+        self.assertEqual(self.manager.pending, {})
+
+    def test_play_is_not_merged_into_a_stolen_channel(self):
+        # "long" plays on a "ui" channel, which higher priority sounds then take over
+        first = self.manager.play_sound("long", priority=0)
+        self.manager.flush()
+        for name in ("high1", "high2"):
+            self.manager.set_sound(name, self.long_sound)
+            self.manager.play_sound(name, category="ui", priority=9)
+            self.manager.flush()
+        self.assertIsNot(self.manager.channels.voices.get(first.channel), first)
+
+        second = self.manager.play_sound("long", priority=0)
+        self.assertIsNot(second, first)
+        self.assertEqual(self.manager.pending, {"long": second})
+        self.assertEqual(self.manager.stats()["coalesced"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
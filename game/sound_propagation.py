@@ -0,0 +1,81 @@
+import pygame
+import numpy as np
+from .occupancy import stitch_grids, grid_distances, UNREACHED
+from .constants import *
+
+class SoundEvent:
+    def __init__(self, kind, position, loudness, grid_origin, field):
+        """A sound made somewhere in the world and how loud it is per grid cell."""
+        self.kind = kind
+        self.position = position
+        self.loudness = loudness
+        self.grid_origin = grid_origin
+        self.field = field
+        self.age = 0
+
+        # World area the sound can reach
+        self.bounds = pygame.Rect(grid_origin[0], grid_origin[1],
+                                  field.shape[1] * GRID_CELL_SIZE, field.shape[0] * GRID_CELL_SIZE)
+
+    def loudness_at(self, world_x, world_y):
+        """Return how loud this sound is at a world position (0 if out of reach)."""
+        cell_x = int(world_x - self.grid_origin[0]) // GRID_CELL_SIZE
+        cell_y = int(world_y - self.grid_origin[1]) // GRID_CELL_SIZE
+        if 0 <= cell_y < self.field.shape[0] and 0 <= cell_x < self.field.shape[1]:
+            return float(self.field[cell_y, cell_x])
+        return 0.0
+
+class SoundPropagation:
+    def __init__(self, world):
+        """Record sound events and let enemies look up how loud they hear them."""
+        self.world = world
+        self.fresh = []  # Events made since the enemies last listened
+        self.recent = []  # Events from the last SOUND_MEMORY ticks
+
+    def emit(self, kind, position, loudness=None):
+        """Record a sound and compute how it spreads around obstacles.
+
+        The sound travels along free grid cells, so walls make it go around
+        and arrive quieter. Its loudness falls off linearly to zero at
+        loudness * SOUND_MAX_RANGE world pixels of travel.
+        """
+        if loudness is None:
+            loudness = SOUND_LOUDNESS[kind]
+        reach = loudness * SOUND_MAX_RANGE
+
+        materials, grid_origin = stitch_grids(self.world.chunks, self.world.chunk_size,
+                                              position[0] - reach, position[1] - reach,
+                                              position[0] + reach, position[1] + reach)
+        start = (int(position[0] - grid_origin[0]) // GRID_CELL_SIZE,
+                 int(position[1] - grid_origin[1]) // GRID_CELL_SIZE)
+        steps = grid_distances(materials == 0, start, int(reach // GRID_CELL_SIZE) + 1)
+
+        travelled = np.where(steps == UNREACHED, reach, steps * float(GRID_CELL_SIZE))
+        field = (loudness * np.clip(1.0 - travelled / reach, 0.0, 1.0)).astype(np.float32)
+
+        event = SoundEvent(kind, position, loudness, grid_origin, field)
+        self.fresh.append(event)
+        self.recent.append(event)
+        return event
+
+    def hear(self, world_x, world_y):
+        """Return (loudness, event) for the loudest fresh sound at a position."""
+        loudest = 0.0
+        heard = None
+        for event in self.fresh:
+            loudness = event.loudness_at(world_x, world_y)
+            if loudness > loudest:
+                loudest = loudness
+                heard = event
+        return loudest, heard
+
+    def heard_recently(self, world_x, world_y):
+        """Check if any sound from the last SOUND_MEMORY ticks reached a position."""
+        return any(event.loudness_at(world_x, world_y) > 0 for event in self.recent)
+
+    def end_tick(self):
+        """Forget the fresh events and age the recent ones."""
+        self.fresh = []
+        for event in self.recent:
+            event.age += 1
+        self.recent = [event for event in self.recent if event.age <= SOUND_MEMORY]
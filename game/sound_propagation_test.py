@@ -0,0 +1,56 @@
+import os
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from game.sound_propagation import SoundPropagation
+from game.test_support import GridWorld
+from game.constants import *
+
+class SoundPropagationTest(unittest.TestCase):
+    def setUp(self):
+        self.world = GridWorld()
+        self.sounds = SoundPropagation(self.world)
+
+    def test_fades_with_distance(self):
+        self.sounds.emit("echo", (525, 525), 0.5)
+        near, event = self.sounds.hear(625, 525)
+        far, _ = self.sounds.hear(825, 525)
+        self.assertEqual(event.kind, "echo")
+        self.assertGreater(near, far)
+        self.assertGreater(far, 0)
+        self.assertEqual(self.sounds.hear(525 + 0.5 * SOUND_MAX_RANGE + 100, 525)[0], 0)
+
+    def test_wall_makes_sound_go_around(self):
+        open_loudness = self.sounds.emit("echo", (525, 525), 1.0).loudness_at(725, 525)
+        self.sounds.end_tick()
+
+        # Wall between the source and the listener, open at both ends
+        self.world.chunks[(0, 0)].grid[6:16, 12] = SURFACE_CODES["stone"]
+        around = SoundPropagation(self.world).emit("echo", (525, 525), 1.0).loudness_at(725, 525)
+        self.assertGreater(around, 0)
+        self.assertLess(around, open_loudness)
+
+    def test_enclosed_listener_hears_nothing(self):
+        grid = self.world.chunks[(0, 0)].grid
+        grid[8:13, 14] = grid[8:13, 18] = grid[8, 14:19] = grid[12, 14:19] = SURFACE_CODES["stone"]
+        self.sounds.emit("echo", (525, 525), 1.0)
+        self.assertEqual(self.sounds.hear(825, 525)[0], 0)
+
+    def test_loudest_sound_is_heard(self):
+        self.sounds.emit("footstep", (525, 525), 0.2)
+        self.sounds.emit("echo", (525, 525), 0.8)
+        self.assertEqual(self.sounds.hear(600, 525)[1].kind, "echo")
+
+    def test_fresh_sounds_last_a_tick_and_recent_ones_are_remembered(self):
+        self.sounds.emit("echo", (525, 525), 0.5)
+        self.sounds.end_tick()
+        self.assertEqual(self.sounds.hear(600, 525)[0], 0)
+        self.assertTrue(self.sounds.heard_recently(600, 525))
+        for _ in range(SOUND_MEMORY):
+            self.sounds.end_tick()
+        self.assertFalse(self.sounds.heard_recently(600, 525))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+class Timer:
+    def __init__(self, due, callback, args):
+        """A callback waiting for the tick it is due at."""
+        self.due = due
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        """Stop the callback from being called (it is dropped when its slot comes up)."""
+        self.cancelled = True
+
+class TimerWheel:
+    def __init__(self, slots=64, levels=3):
+        """Hierarchical timing wheel of callbacks due at future ticks.
+
+        Level 0 has one slot per tick, level 1 one slot per slots ticks, and
+        so on. Timers sit in the coarsest level they fit in and move down a
+        level each time the finer wheel comes round, so a tick only touches
+        the timers in one slot instead of every timer that is waiting.
+        Timers further away than all the levels wait in an overflow list.
+        """
+        self.slots = slots
+        self.levels = levels
+        self.wheels = [[[] for _ in range(slots)] for _ in range(levels)]
+        self.overflow = []
+        self.tick = 0
+
+    def schedule(self, delay, callback, *args):
+        """Call callback(*args) delay ticks from now (at least one) and return its Timer."""
+        timer = Timer(self.tick + max(1, int(delay)), callback, args)
+        self._place(timer)
+        return timer
+
+    def advance(self):
+        """Move on one tick and call the timers that are due."""
+        self.tick += 1
+        if self.tick % self.slots == 0:
+            self._cascade(1)
+
+        slot = self.tick % self.slots
+        due = self.wheels[0][slot]
+        self.wheels[0][slot] = []
+        for timer in due:
+            if not timer.cancelled:
+                timer.callback(*timer.args)
+
+    def _place(self, timer):
+        delay = timer.due - self.tick
+        span = 1
+        for level in range(self.levels):
+            if delay < span * self.slots:
+                self.wheels[level][(timer.due // span) % self.slots].append(timer)
+                return
+            span *= self.slots
+        self.overflow.append(timer)
+
+    def _cascade(self, level):
+        """Spread the timers of the level's current slot over the finer levels."""
+        if level == self.levels:
+            timers = self.overflow
+            self.overflow = []
+        else:
+            index = (self.tick // self.slots ** level) % self.slots
+            if index == 0:
+                self._cascade(level + 1)
+            timers = self.wheels[level][index]
+            self.wheels[level][index] = []
+
+        for timer in timers:
+            if not timer.cancelled:
+                self._place(timer)
@@ -0,0 +1,70 @@
+import unittest
+
+from game.timer_wheel import TimerWheel
+from game.sim_clock import SimClock
+
+class TimerWheelTest(unittest.TestCase):
+    def run_ticks(self, wheel, ticks):
+        for _ in range(ticks):
+            wheel.advance()
+
+    def test_fires_on_the_due_tick(self):
+        wheel = TimerWheel(slots=8, levels=2)
+        fired = []
+        for delay in (1, 5, 8, 13, 64, 100, 500):
+            wheel.schedule(delay, lambda delay=delay: fired.append((delay, wheel.tick)))
+        self.run_ticks(wheel, 600)
+        self.assertEqual(fired, [(delay, delay) for delay in (1, 5, 8, 13, 64, 100, 500)])
+
+    def test_fires_in_order_when_scheduled_later(self):
+        wheel = TimerWheel(slots=8, levels=2)
+        self.run_ticks(wheel, 37)
+        fired = []
+        for delay in (70, 3, 9):
+            wheel.schedule(delay, fired.append, wheel.tick + delay)
+        self.run_ticks(wheel, 80)
+        self.assertEqual(fired, [40, 46, 107])
+
+    def test_cancelled_timer_never_fires(self):
+        wheel = TimerWheel()
+        fired = []
+        timer = wheel.schedule(10, fired.append, "late")
+        wheel.schedule(1000, fired.append, "overflow").cancel()
+        timer.cancel()
+        self.run_ticks(wheel, 1100)
+        self.assertEqual(fired, [])
+
+    def test_delay_is_at_least_one_tick(self):
+        wheel = TimerWheel()
+        fired = []
+        wheel.schedule(0, fired.append, wheel.tick)
+        self.assertEqual(fired, [])
+        wheel.advance()
+        self.assertEqual(fired, [0])
+
+class SimClockTest(unittest.TestCase):
+    def test_time_moves_only_on_tick(self):
+        clock = SimClock(step=10)
+        self.assertEqual(clock.now(), 0)
+        clock.tick()
+        clock.tick()
+        self.assertEqual(clock.now(), 20)
+
+    def test_advance_covers_milliseconds(self):
+        clock = SimClock(step=1000 / 60)
+        clock.advance(1000)
+        self.assertEqual(clock.frame, 60)
+        self.assertEqual(clock.now(), 1000)
+
+    def test_scheduled_callback_runs_from_tick(self):
+        clock = SimClock()
+        fired = []
+        clock.schedule(3, fired.append, "done")
+        clock.tick()
+        clock.tick()
+        self.assertEqual(fired, [])
+        clock.tick()
+        self.assertEqual(fired, ["done"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,7 +5,7 @@ import os
 from .constants import *
 
 class Warden:
-    def __init__(self, x, y, player):
+    def __init__(self, x, y, player, sim_clock=None):
         """Initialize the Warden enemy AI."""
         self.x = x
         self.y = y
@@ -19,6 +19,7 @@ class Warden:
         self.investigation_timer = 0
         self.investigation_duration = 180  # frames (3 seconds)
         self.last_heard_position = None
+        self.sim_clock = sim_clock  # Game time, if not using real time
         
         # Generate patrol points
         self._generate_patrol_points()
@@ -37,7 +38,7 @@ class Warden:
             self._patrol()
             
             # Check if player made a sound recently
-            if pygame.time.get_ticks() - self.player.last_sound_time < 1000:
+            if self._now() - self.player.last_sound_time < 1000:
                 self.state = "INVESTIGATING"
                 self.last_heard_position = (self.player.x, self.player.y)
                 self.investigation_timer = 0
@@ -54,11 +55,17 @@ class Warden:
             self._hunt()
             
             # If player hasn't made sound in a while and is far enough, go back to patrolling
-            if pygame.time.get_ticks() - self.player.last_sound_time > 5000:
+            if self._now() - self.player.last_sound_time > 5000:
                 distance = math.sqrt((self.x - self.player.x)**2 + (self.y - self.player.y)**2)
                 if distance > self.detection_radius * 1.5:
                     self.state = "PATROLLING"
     
+    def _now(self):
+        """Current time in milliseconds, from the game clock when there is one."""
+        if self.sim_clock:
+            return self.sim_clock.now()
+        return pygame.time.get_ticks()
+    
     def _patrol(self):
         """Move between patrol points."""
         target_x, target_y = self.patrol_points[self.current_patrol_point]
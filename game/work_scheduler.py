@@ -0,0 +1,131 @@
+import heapq
+import time
+
+class Job:
+    def __init__(self, priority, key, callback, args, queued_at):
+        """Deferred work waiting for a frame with time to spare."""
+        self.priority = priority
+        self.key = key
+        self.callback = callback
+        self.args = args
+        self.queued_at = queued_at
+        self.done = False
+
+class WorkScheduler:
+    def __init__(self, budget=4.0):
+        """Queue of deferrable work drained a few milliseconds per frame.
+
+        Jobs run lowest priority number first, then in the order they were
+        submitted. run() stops taking jobs once the frame's budget is used up,
+        so a burst of work is spread over several frames instead of landing
+        on the one that caused it. Work that can't wait is run straight away
+        with run_now(), which also takes it off the queue if it was there,
+        and work that is no longer wanted is dropped with cancel().
+        """
+        self.budget = budget  # milliseconds per frame
+        self.queue = []
+        self.pending = {}  # key -> queued Job
+        self.count = 0
+
+        # Totals for report()
+        self.jobs_run = 0
+        self.jobs_preempted = 0
+        self.jobs_cancelled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.busiest_frame = 0.0
+
+    def submit(self, priority, key, callback, *args):
+        """Queue callback(*args) under a key, unless a job with the key is already queued.
+
+        Submitting a queued key again with a more urgent priority moves the
+        job up the queue. Returns the queued Job.
+        """
+        job = self.pending.get(key)
+        if job is not None:
+            if priority >= job.priority:
+                return job
+            job.done = True  # Leave the old heap entry behind
+            callback, args, queued_at = job.callback, job.args, job.queued_at
+        else:
+            queued_at = time.perf_counter()
+
+        job = Job(priority, key, callback, args, queued_at)
+        self.pending[key] = job
+        heapq.heappush(self.queue, (priority, self.count, job))
+        self.count += 1
+        return job
+
+    def is_queued(self, key):
+        """Check if a job with the key is waiting to run."""
+        return key in self.pending
+
+    def run_now(self, key, callback, *args):
+        """Run work that is needed this frame, dropping its queued job if there is one."""
+        job = self.pending.pop(key, None)
+        if job is not None:
+            job.done = True
+            self.jobs_preempted += 1
+            self._waited(job)
+        return callback(*args)
+
+    def cancel(self, predicate):
+        """Drop the queued jobs whose key predicate(key) is true; return how many were dropped."""
+        dropped = [key for key in self.pending if predicate(key)]
+        for key in dropped:
+            self.pending.pop(key).done = True
+        self.jobs_cancelled += len(dropped)
+
+        # Clear out the heap once it is mostly dropped jobs
+        if len(self.queue) > 2 * len(self.pending) + 64:
+            self.queue = [entry for entry in self.queue if not entry[2].done]
+            heapq.heapify(self.queue)
+        return len(dropped)
+
+    def run(self, budget=None, started=None):
+        """Run queued jobs until the budget (in milliseconds) is used up; return how many ran.
+
+        The budget counts from started, a time.perf_counter() value such as
+        the start of the frame, or else from now. At least one job runs even
+        if the budget is already used up, so the queue always moves.
+        """
+        budget = self.budget if budget is None else budget
+        start = time.perf_counter()
+        deadline = (start if started is None else started) + budget / 1000
+        ran = 0
+        while self.queue:
+            job = heapq.heappop(self.queue)[2]
+            if job.done:
+                continue
+            del self.pending[job.key]
+            job.done = True
+            self.jobs_run += 1
+            self._waited(job)
+            job.callback(*job.args)
+            ran += 1
+            if time.perf_counter() >= deadline:
+                break
+        self.busiest_frame = max(self.busiest_frame, (time.perf_counter() - start) * 1000)
+        return ran
+
+    def _waited(self, job):
+        wait = (time.perf_counter() - job.queued_at) * 1000
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def backlog(self):
+        """Return how many jobs are waiting."""
+        return len(self.pending)
+
+    def report(self):
+        """Return the backlog and how long jobs waited, in milliseconds."""
+        finished = self.jobs_run + self.jobs_preempted
+        return {
+            "backlog": self.backlog(),
+            "jobs_run": self.jobs_run,
+            "jobs_preempted": self.jobs_preempted,
+            "jobs_cancelled": self.jobs_cancelled,
+            "mean_wait": self.total_wait / finished if finished else 0.0,
+            "max_wait": self.max_wait,
+            "busiest_frame": self.busiest_frame,
+        }
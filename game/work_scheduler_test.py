@@ -0,0 +1,69 @@
+import time
+import unittest
+
+from game.work_scheduler import WorkScheduler
+
+class WorkSchedulerTest(unittest.TestCase):
+    def test_runs_lowest_priority_first_then_in_order(self):
+        scheduler = WorkScheduler()
+        ran = []
+        for priority, name in ((2, "c"), (0, "a"), (2, "d"), (1, "b")):
+            scheduler.submit(priority, name, ran.append, name)
+        scheduler.run(float("inf"))
+        self.assertEqual(ran, ["a", "b", "c", "d"])
+
+    def test_resubmitting_moves_a_job_up_only(self):
+        scheduler = WorkScheduler()
+        ran = []
+        scheduler.submit(1, "a", ran.append, "a")
+        scheduler.submit(2, "b", ran.append, "b")
+        scheduler.submit(0, "b", ran.append, "ignored")
+        scheduler.submit(5, "a", ran.append, "ignored")
+        scheduler.run(float("inf"))
+        self.assertEqual(ran, ["b", "a"])
+        self.assertEqual(scheduler.backlog(), 0)
+
+    def test_stops_once_the_budget_is_used_up(self):
+        scheduler = WorkScheduler()
+        ran = []
+        for i in range(10):
+            scheduler.submit(i, i, lambda i=i: (time.sleep(0.002), ran.append(i)))
+        self.assertEqual(scheduler.run(5), 3)
+        self.assertEqual(ran, [0, 1, 2])
+        self.assertEqual(scheduler.backlog(), 7)
+
+    def test_budget_counts_from_when_the_frame_started(self):
+        scheduler = WorkScheduler()
+        ran = []
+        for i in range(3):
+            scheduler.submit(i, i, ran.append, i)
+
+        # The frame has already used its budget, but the queue still moves
+        self.assertEqual(scheduler.run(1, time.perf_counter() - 0.01), 1)
+        self.assertEqual(ran, [0])
+
+    def test_run_now_takes_the_job_off_the_queue(self):
+        scheduler = WorkScheduler()
+        ran = []
+        scheduler.submit(0, "a", ran.append, "queued")
+        self.assertEqual(scheduler.run_now("a", lambda: ran.append("now") or 42), 42)
+        self.assertFalse(scheduler.is_queued("a"))
+        self.assertEqual(scheduler.run(float("inf")), 0)
+        self.assertEqual(ran, ["now"])
+        self.assertEqual(scheduler.report()["jobs_preempted"], 1)
+
+    def test_cancel_drops_matching_jobs(self):
+        scheduler = WorkScheduler()
+        ran = []
+        for i in range(200):
+            scheduler.submit(i, ("chunk", i), ran.append, i)
+        self.assertEqual(scheduler.cancel(lambda key: key[1] % 10), 180)
+        self.assertEqual(scheduler.backlog(), 20)
+        self.assertLess(len(scheduler.queue), 200)
+
+        scheduler.run(float("inf"))
+        self.assertEqual(ran, list(range(0, 200, 10)))
+        self.assertEqual(scheduler.report()["jobs_cancelled"], 180)
+
+if __name__ == "__main__":
+    unittest.main()
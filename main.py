@@ -5,9 +5,12 @@ from game.engine_new import GameEngine
 from game.start_screen import StartScreen
 from game.story import StoryScreen
 from game.level_system import LevelSystem, LevelTransitionScreen
+from game.audio_config import AudioConfig
+from game.services import GameServices
 
 def main():
-    # Initialize pygame
+    # Initialize pygame, with the mixer set up for low latency
+    AudioConfig().pre_init()
     pygame.init()
     pygame.mixer.init()
     
@@ -15,6 +18,10 @@ def main():
     screen = pygame.display.set_mode((800, 600))
     pygame.display.set_caption("Echoes of the Forgotten")
     
+    # Display, audio, assets (from the pack built by pack_assets.py, if there
+    # is one) and fonts, shared by every level
+    services = GameServices(screen)
+    
     # Initialize level system
     level_system = LevelSystem()
     
@@ -32,6 +39,11 @@ def main():
         # Handle start screen
         action = start_screen.handle_events(events)
         if action == "START":
+            # Start building the level while the story and transition play
+            level_data = level_system.get_current_level_data()
+            warden_speed = start_screen.warden_speed * level_data["warden_speed_modifier"]
+            level = level_system.prepare_level(services, warden_speed)
+            
             # Show story screen first
             story_screen = StoryScreen(screen)
             story_done = False
@@ -50,8 +62,7 @@ def main():
             
             # Show level transition screen
             if running:
-                level_data = level_system.get_current_level_data()
-                transition_screen = LevelTransitionScreen(screen, level_data)
+                transition_screen = LevelTransitionScreen(screen, level_data, level)
                 transition_done = False
                 
                 while not transition_done and running:
@@ -68,8 +79,7 @@ def main():
             
             # Start the game with configured warden speed and level data
             if running:
-                warden_speed = start_screen.warden_speed * level_data["warden_speed_modifier"]
-                game = GameEngine(warden_speed, level_data)
+                game = GameEngine(warden_speed, level_data, services=services, level=level)
                 game_result = game.run()
                 
                 if game_result == "VICTORY":
@@ -100,6 +110,8 @@ def main():
         clock.tick(60)
     
     # Clean up
+    level_system.shutdown()
+    services.shutdown()
     pygame.quit()
     sys.exit()
 
@@ -0,0 +1,49 @@
+import os
+import sys
+import pygame
+from game.asset_pack import DEFAULT_PACK, write_pack
+from game.audio_config import AudioConfig
+from game.sound_manager import SoundManager, SOUND_FILES
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "game", "assets")
+
+def pack_assets(path=DEFAULT_PACK):
+    """Pack the game's sounds and images into one asset pack at path."""
+    assets = {}
+
+    # Sounds as the game would play them (decoded from their files, or the
+    # placeholders made for missing ones), as raw samples in the mixer's format
+    config = AudioConfig()
+    config.pre_init()
+    pygame.mixer.init()
+    frequency, bits, channels = config.output_format()
+    manager = SoundManager(config)
+    for sound_name, file_name in SOUND_FILES.items():
+        assets["audio/" + file_name] = (manager.sounds[sound_name].get_raw(), {
+            "format": "pcm",
+            "frequency": frequency,
+            "bits": bits,
+            "channels": channels,
+        })
+
+    # Images as they are, to be decoded when first used
+    images_dir = os.path.join(ASSETS_DIR, "images")
+    for file_name in sorted(os.listdir(images_dir)):
+        with open(os.path.join(images_dir, file_name), "rb") as f:
+            assets["images/" + file_name] = (f.read(), {"format": os.path.splitext(file_name)[1][1:].lower()})
+
+    write_pack(path, assets)
+    return assets
+
+def main():
+    # Run headless so packing works without a window or sound card
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PACK
+    assets = pack_assets(path)
+    print(f"Packed {len(assets)} assets into {path} ({os.path.getsize(path) / 1024:.0f} KiB)")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()